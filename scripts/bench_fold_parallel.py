@@ -0,0 +1,79 @@
+"""train.py テンプレートの fold 並列学習の速さを合成データで比べる.
+
+使い方:
+    python scripts/bench_fold_parallel.py --rows 200000 --cols 50 --workers 1 2 5
+    python scripts/bench_fold_parallel.py --cols 500 --template standard fast
+
+init で生成される train.py を一時ディレクトリに置き、FOLD_WORKERS を変えて実行時間を測る。
+特徴量・fold モデルのキャッシュは実行ごとに消し、毎回すべての fold を学習させる。
+並列数によらず submission.csv が同一であることも確認する。
+pandas / numpy / scikit-learn / lightgbm が必要。
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from signate_deploy.commands.init import TRAIN_TEMPLATES
+
+
+def make_data(data_dir: Path, rows: int, cols: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, cols)).astype(np.float32)
+    logit = X[:, : min(cols, 5)].sum(axis=1) + rng.normal(size=rows)
+    features = pd.DataFrame(X, columns=[f"f{i}" for i in range(cols)])
+    features.insert(0, "id", np.arange(rows))
+    features.assign(target=(logit > 0).astype(int)).to_csv(data_dir / "train.csv", index=False)
+    features.to_csv(data_dir / "test.csv", index=False)
+
+
+# train.py が comp/ に作るキャッシュ. 残っていると2回目以降の実行が学習せずに終わる
+CACHE_DIRS = [".feature-cache", ".model-cache"]
+
+
+def run(root: Path, workers: int) -> tuple[float, bytes]:
+    for name in CACHE_DIRS:
+        shutil.rmtree(root / "comp" / name, ignore_errors=True)
+    (root / "comp" / "submission.csv").unlink(missing_ok=True)
+    env = dict(os.environ, FOLD_WORKERS=str(workers), PYTHONWARNINGS="ignore")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "comp/train.py"], cwd=root, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start, (root / "comp" / "submission.csv").read_bytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cols", type=int, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 5])
+    parser.add_argument("--template", nargs="+", choices=list(TRAIN_TEMPLATES), default=["standard"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "comp" / "data").mkdir(parents=True)
+        make_data(root / "comp" / "data", args.rows, args.cols)
+
+        print(f"{args.rows} rows x {args.cols} cols, {os.cpu_count()} cores")
+        baseline = None
+        for template in args.template:
+            (root / "comp" / "train.py").write_text(TRAIN_TEMPLATES[template].format(competition_dir="comp", fold_workers=1))
+            reference = None
+            for workers in args.workers:
+                elapsed, submission = run(root, workers)
+                baseline = baseline or elapsed
+                reference = reference or submission
+                same = "same" if submission == reference else "DIFFERENT"
+                print(f"  {template} workers={workers}: {elapsed:6.2f}s  x{baseline / elapsed:.2f}  submission {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""テスト予測と提出ファイル書き出しのピークメモリを、テストデータの行数を変えて比べる.
+
+使い方:
+    python scripts/bench_predict_memory.py --rows 250000 500000 1000000 2000000 --cols 50
+
+- full:    テスト全体を1つの配列にして predict し、DataFrame を作って to_csv する（従来のテンプレート）
+- batched: signate_deploy.frame.predict_in_batches で一定行数ずつ予測して float32 配列に詰め、
+           write_csv_blocks で書き出す（テストデータもバッチごとに生成する）
+
+それぞれ別プロセスで実行し、学習済みモデルを用意した後からのピーク RSS の増分を表示する。
+numpy / pandas / lightgbm が必要。
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from signate_deploy.frame import predict_in_batches, write_csv_blocks
+
+BLOCK_ROWS = 65_536
+
+
+class SyntheticRows:
+    """len() とスライスで合成データの行を返す（ブロック単位で決定的に生成する）."""
+
+    def __init__(self, n_rows: int, n_cols: int):
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+
+    def __len__(self):
+        return self.n_rows
+
+    def __getitem__(self, idx: slice) -> np.ndarray:
+        start, stop, _ = idx.indices(self.n_rows)
+        return np.random.default_rng(start).normal(size=(stop - start, self.n_cols)).astype(np.float32)
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(mode: str, rows: int, cols: int, out: Path) -> None:
+    import lightgbm as lgb
+
+    X_train = SyntheticRows(20_000, cols)[0:20_000]
+    y_train = (X_train[:, 0] > 0).astype(int)
+    booster = lgb.train({"objective": "binary", "verbosity": -1}, lgb.Dataset(X_train, y_train), num_boost_round=50)
+    del X_train, y_train
+    baseline = _peak_rss_mb()
+
+    test = SyntheticRows(rows, cols)
+    ids = np.arange(rows)
+    start = time.perf_counter()
+    if mode == "full":
+        X_test = np.vstack([test[i:i + BLOCK_ROWS] for i in range(0, rows, BLOCK_ROWS)])
+        preds = booster.predict(X_test)
+        pd.DataFrame({"id": ids, "pred": preds}).to_csv(out, index=False, header=False)
+    else:
+        preds = predict_in_batches(booster.predict, test, BLOCK_ROWS)
+        write_csv_blocks(out, {"id": ids, "pred": preds}, BLOCK_ROWS)
+    print(f"{_peak_rss_mb() - baseline:.0f} {time.perf_counter() - start:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[250_000, 500_000, 1_000_000, 2_000_000])
+    parser.add_argument("--cols", type=int, default=50)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "ROWS"), help=argparse.SUPPRESS)
+    parser.add_argument("--out", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], int(args.child[1]), args.cols, args.out)
+        return
+
+    print(f"{'rows':>10} {'full MB':>9} {'batched MB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            peaks = []
+            for mode in ["full", "batched"]:
+                out = Path(tmp) / f"{mode}.csv"
+                result = subprocess.run(
+                    [sys.executable, __file__, "--child", mode, str(rows), "--cols", str(args.cols), "--out", str(out)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+                peaks.append(result.stdout.split()[0])
+            print(f"{rows:>10} {peaks[0]:>9} {peaks[1]:>11}")
+
+
+if __name__ == "__main__":
+    main()
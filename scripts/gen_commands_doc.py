@@ -31,7 +31,9 @@ def option_row(param: click.Option) -> str:
 
 def generate_commands_section(cmd_group: click.Group) -> str:
     lines = []
-    for name, cmd in sorted(cmd_group.commands.items()):
+    ctx = click.Context(cmd_group)
+    for name in cmd_group.list_commands(ctx):
+        cmd = cmd_group.get_command(ctx, name)
         lines.append(f"### `signate-deploy {name}`")
         lines.append("")
         if cmd.help:
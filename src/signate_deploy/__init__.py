@@ -1,3 +1,3 @@
 """signate-deploy: GitHub Actions経由でSIGNATEコンペを自動化するCLIツール"""
 
-__version__ = "0.1.6"
+__version__ = "0.2.0"
@@ -0,0 +1,248 @@
+"""GitHub Actions のアーティファクト（zip）を HTTP Range で差分同期する.
+
+    result = sync_artifact(url, Path("my-comp/data"), workers=4)
+
+- zip は丸ごとダウンロードしない。末尾の central directory だけを Range で読み、
+  各メンバーのサイズと CRC32 をローカルのマニフェスト（data/.artifact-manifest.json）と比べる。
+- 変わったメンバーだけ、圧縮データを一定サイズのチャンクに分けて並列に Range 取得し、
+  展開して CRC32 を検証してから置き換える。
+- マニフェストの記録（サイズ・mtime）とローカルのファイルが一致しない場合は、
+  ローカルのファイルの CRC32 を計算し直して比べる（手で編集したファイルは取り直す）。
+
+アーティファクトにないローカルのファイルは消さない。
+"""
+
+import io
+import os
+import socket
+import struct
+import time
+import urllib.error
+import urllib.request
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from http.client import HTTPException
+from pathlib import Path
+
+from signate_deploy.downloader import (
+    _CONTENT_RANGE_RE,
+    CHUNK_SIZE,
+    DEFAULT_RETRIES,
+    DownloadError,
+    load_manifest,
+    save_manifest,
+)
+
+MANIFEST_FILENAME = ".artifact-manifest.json"
+# 1リクエストで取得する圧縮データの大きさ
+RANGE_CHUNK_SIZE = 8 << 20
+DEFAULT_WORKERS = 4
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+
+def _get_range(url: str, start: int, end: int, retries: int = DEFAULT_RETRIES, timeout: float = 60):
+    """url の start..end バイト目（end を含む）を取得し、(データ, 全体サイズ) を返す."""
+    for attempt in range(retries + 1):
+        req = urllib.request.Request(url, headers={"Range": f"bytes={start}-{end}"})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                if resp.status != 206:
+                    raise DownloadError(f"{url}: Range リクエストに対応していません（HTTP {resp.status}）")
+                m = _CONTENT_RANGE_RE.match(resp.headers.get("Content-Range") or "")
+                data = resp.read()
+            if len(data) == end - start + 1:
+                return data, int(m.group(3)) if m and m.group(3) != "*" else None
+            error = DownloadError(f"{url}: bytes {start}-{end} が途中で切れました（{len(data)} bytes）")
+        except urllib.error.HTTPError as e:
+            if e.code < 500 or attempt == retries:
+                raise DownloadError(f"{url}: HTTP {e.code}") from e
+            error = e
+        except (urllib.error.URLError, HTTPException, socket.timeout, ConnectionError) as e:
+            error = e
+        if attempt == retries:
+            raise DownloadError(f"{url}: {error}") from error
+        time.sleep(min(2 ** attempt * 0.5, 30))
+
+
+class RangeFile(io.RawIOBase):
+    """HTTP Range で読む読み取り専用のシーク可能なファイル（zipfile.ZipFile に渡す）."""
+
+    def __init__(self, url: str, timeout: float = 60):
+        self.url = url
+        self.timeout = timeout
+        self.pos = 0
+        _, self.size = _get_range(url, 0, 0, timeout=timeout)
+        if self.size is None:
+            raise DownloadError(f"{url}: サイズが分かりません（Content-Range がありません）")
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.pos, io.SEEK_END: self.size}[whence]
+        self.pos = max(base + offset, 0)
+        return self.pos
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self.size - self.pos)
+        if n <= 0:
+            return 0
+        data, _ = _get_range(self.url, self.pos, self.pos + n - 1, timeout=self.timeout)
+        buffer[:n] = data
+        self.pos += n
+        return n
+
+
+@dataclass
+class SyncResult:
+    updated: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+
+
+def file_crc32(path: Path, chunk_size: int = CHUNK_SIZE) -> int:
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _unchanged(info: zipfile.ZipInfo, target: Path, entry: dict | None) -> bool:
+    try:
+        stat = target.stat()
+    except FileNotFoundError:
+        return False
+    if stat.st_size != info.file_size:
+        return False
+    if entry and (entry.get("size"), entry.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns):
+        return entry.get("crc32") == info.CRC
+    return file_crc32(target) == info.CRC
+
+
+def _entry(info: zipfile.ZipInfo, target: Path) -> dict:
+    return {"size": info.file_size, "crc32": info.CRC, "mtime_ns": target.stat().st_mtime_ns}
+
+
+def _data_offset(url: str, info: zipfile.ZipInfo) -> int:
+    """ローカルファイルヘッダを読み、メンバーの圧縮データの開始位置を返す."""
+    header, _ = _get_range(url, info.header_offset, info.header_offset + _LOCAL_HEADER.size - 1)
+    fields = _LOCAL_HEADER.unpack(header)
+    if fields[0] != b"PK\x03\x04":
+        raise DownloadError(f"{info.filename}: ローカルファイルヘッダが壊れています")
+    return info.header_offset + _LOCAL_HEADER.size + fields[-2] + fields[-1]
+
+
+def _fetch_chunk(url: str, zpart: Path, start: int, position: int, length: int) -> None:
+    data, _ = _get_range(url, start, start + length - 1)
+    with open(zpart, "r+b") as f:
+        f.seek(position)
+        f.write(data)
+
+
+def _extract(info: zipfile.ZipInfo, zpart: Path, target: Path) -> None:
+    """zpart（メンバーの圧縮データ）を展開し、CRC32 を検証して target に置き換える."""
+    if info.compress_type == zipfile.ZIP_STORED:
+        decompress = None
+    elif info.compress_type == zipfile.ZIP_DEFLATED:
+        decompress = zlib.decompressobj(-15)
+    else:
+        raise DownloadError(f"{info.filename}: 未対応の圧縮形式です（{info.compress_type}）")
+    part = target.with_name(target.name + ".part")
+    crc, size = 0, 0
+    with open(zpart, "rb") as src, open(part, "wb") as dst:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+            if decompress is not None:
+                chunk = decompress.decompress(chunk)
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            dst.write(chunk)
+        if decompress is not None:
+            tail = decompress.flush()
+            crc = zlib.crc32(tail, crc)
+            size += len(tail)
+            dst.write(tail)
+    if (crc, size) != (info.CRC, info.file_size):
+        part.unlink()
+        raise DownloadError(f"{info.filename}: CRC32 またはサイズが一致しません")
+    os.replace(part, target)
+
+
+def sync_artifact(
+    url: str,
+    data_dir: Path,
+    workers: int = DEFAULT_WORKERS,
+    chunk_size: int = RANGE_CHUNK_SIZE,
+    echo=print,
+) -> SyncResult:
+    """アーティファクトの zip（url）のメンバーのうち、ローカルと異なるものだけを data_dir に書く."""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    root = data_dir.resolve()
+    manifest_path = data_dir / MANIFEST_FILENAME
+    manifest = load_manifest(manifest_path)
+    result = SyncResult()
+
+    with zipfile.ZipFile(RangeFile(url)) as zf:
+        infos = [info for info in zf.infolist() if not info.is_dir()]
+    todo = []
+    for info in infos:
+        target = (data_dir / info.filename).resolve()
+        if root not in target.parents:
+            raise ValueError(f"unsafe member path {info.filename!r}")
+        if _unchanged(info, target, manifest.get(info.filename)):
+            manifest[info.filename] = _entry(info, target)
+            result.skipped.append(info.filename)
+        else:
+            manifest.pop(info.filename, None)
+            todo.append((info, target))
+
+    zparts = []
+    pool = ThreadPoolExecutor(max_workers=max(workers, 1))
+    try:
+        offsets = list(pool.map(lambda item: _data_offset(url, item[0]), todo))
+        futures, remaining = {}, {}
+        for (info, target), offset in zip(todo, offsets):
+            target.parent.mkdir(parents=True, exist_ok=True)
+            zpart = target.with_name(target.name + ".zpart")
+            zparts.append(zpart)
+            with open(zpart, "wb") as f:
+                f.truncate(info.compress_size)
+            positions = range(0, info.compress_size, chunk_size)
+            remaining[info.filename] = len(positions)
+            for position in positions:
+                length = min(chunk_size, info.compress_size - position)
+                future = pool.submit(_fetch_chunk, url, zpart, offset + position, position, length)
+                futures[future] = (info, target, zpart)
+            if not positions:
+                futures[pool.submit(lambda: None)] = (info, target, zpart)
+                remaining[info.filename] = 1
+
+        # メンバーの全チャンクが揃ったものから、残りのダウンロードと並行して展開する
+        for future in as_completed(futures):
+            future.result()
+            info, target, zpart = futures[future]
+            remaining[info.filename] -= 1
+            if remaining[info.filename]:
+                continue
+            _extract(info, zpart, target)
+            zpart.unlink()
+            manifest[info.filename] = _entry(info, target)
+            result.updated.append(info.filename)
+            echo(f"Updated {info.filename} ({info.file_size:,} bytes)")
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        for zpart in zparts:
+            zpart.unlink(missing_ok=True)
+        save_manifest(manifest_path, manifest)
+
+    echo(f"{len(result.updated)} updated, {len(result.skipped)} unchanged")
+    return result
@@ -0,0 +1,198 @@
+"""signate CLI の呼び出しバックエンド.
+
+signate パッケージが同じ環境に入っていれば、そのエントリポイントを同一プロセス内で
+呼び出す（InProcessBackend）。別インタプリタの起動と signate パッケージの再 import を
+省けるほか、同じプロセス内で続けて呼ぶ場合は import 済みのクライアントと
+その HTTP 接続プールを使い回せる。
+エントリポイントが見つからない場合は従来どおり signate 実行ファイルを
+サブプロセスで起動する（SubprocessBackend）。
+
+エントリポイントが click コマンドでない（sys.argv を読む関数の）場合、同一プロセス内の呼び出しは
+1回ずつしか実行できない。複数スレッドから同時に呼ぶ場合（discover の並列取得）は
+get_backend(concurrent=True) でサブプロセスのバックエンドを使う。
+
+環境変数 SIGNATE_DEPLOY_BACKEND に inprocess / subprocess を指定すると
+バックエンドを固定できる（既定は auto）。
+"""
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from signate_deploy.signate_cli import find_signate_exe
+
+BACKEND_ENV = "SIGNATE_DEPLOY_BACKEND"
+
+# sys.argv の差し替えはプロセス全体に効くため、argv を読むエントリポイントの実行は直列化する
+_argv_lock = threading.Lock()
+
+
+class _StdoutRouter:
+    """スレッドごとに書き込み先を切り替える sys.stdout の代理.
+
+    キャプチャ中のスレッドの出力はそのスレッドのバッファへ、それ以外は元の stdout へ流す。
+    """
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    def _target(self):
+        return getattr(self.local, "buf", None) or self.default
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.default, name)
+
+
+_router_lock = threading.Lock()
+_router: _StdoutRouter | None = None
+_router_users = 0
+
+
+@contextlib.contextmanager
+def _capture_stdout():
+    """現在のスレッドの stdout だけを StringIO に取り込む."""
+    global _router, _router_users
+    with _router_lock:
+        if _router_users == 0:
+            _router = _StdoutRouter(sys.stdout)
+            sys.stdout = _router
+        _router_users += 1
+        router = _router
+    buf = io.StringIO()
+    router.local.buf = buf
+    try:
+        yield buf
+    finally:
+        router.local.buf = None
+        with _router_lock:
+            _router_users -= 1
+            if _router_users == 0:
+                sys.stdout = router.default
+                _router = None
+
+
+@dataclass
+class SignateResult:
+    """signate CLI 1回分の実行結果."""
+
+    returncode: int
+    stdout: str | None = None
+
+
+def _exit_code(e: SystemExit) -> int:
+    if e.code is None:
+        return 0
+    if isinstance(e.code, int):
+        return e.code
+    # sys.exit("message") 形式
+    print(e.code, file=sys.stderr)
+    return 1
+
+
+class SubprocessBackend:
+    """signate 実行ファイルをサブプロセスとして起動するバックエンド."""
+
+    name = "subprocess"
+    concurrent = True
+
+    def __init__(self, signate_exe: str):
+        self.signate_exe = signate_exe
+
+    def run(self, args: Sequence[str], capture: bool = False) -> SignateResult:
+        result = subprocess.run(
+            [self.signate_exe, *args],
+            capture_output=capture,
+            text=capture or None,
+        )
+        if capture and result.stderr:
+            sys.stderr.write(result.stderr)
+        return SignateResult(result.returncode, result.stdout if capture else None)
+
+
+class InProcessBackend:
+    """signate パッケージのエントリポイントを同一プロセス内で呼び出すバックエンド."""
+
+    name = "inprocess"
+
+    def __init__(self, entry: Callable):
+        self.entry = entry
+
+    @property
+    def concurrent(self) -> bool:
+        """複数スレッドから同時に呼び出せるなら True（click コマンドは sys.argv を使わない）."""
+        return hasattr(self.entry, "main")
+
+    @classmethod
+    def load(cls) -> "InProcessBackend | None":
+        """console_scripts の signate エントリポイントを読み込む. 無ければ None."""
+        from importlib.metadata import entry_points
+
+        eps = entry_points()
+        if hasattr(eps, "select"):
+            candidates = eps.select(group="console_scripts", name="signate")
+        else:  # Python 3.9
+            candidates = [ep for ep in eps.get("console_scripts", []) if ep.name == "signate"]
+        for ep in candidates:
+            try:
+                return cls(ep.load())
+            except Exception:
+                return None
+        return None
+
+    def _call(self, args: Sequence[str]) -> int:
+        try:
+            if hasattr(self.entry, "main"):
+                # click コマンドは引数を直接渡せるので sys.argv を触らない（並列実行可）
+                rv = self.entry.main(args=list(args), prog_name="signate")
+            else:
+                with _argv_lock:
+                    saved_argv = sys.argv
+                    sys.argv = ["signate", *args]
+                    try:
+                        rv = self.entry()
+                    finally:
+                        sys.argv = saved_argv
+        except SystemExit as e:
+            return _exit_code(e)
+        except Exception as e:
+            # サブプロセスで未処理の例外が起きた場合と同じく、エラーを表示して終了コード 1 にする
+            print(f"signate: {type(e).__name__}: {e}", file=sys.stderr)
+            return 1
+        return rv if isinstance(rv, int) else 0
+
+    def run(self, args: Sequence[str], capture: bool = False) -> SignateResult:
+        if not capture:
+            return SignateResult(self._call(args))
+        with _capture_stdout() as buf:
+            returncode = self._call(args)
+        return SignateResult(returncode, buf.getvalue())
+
+
+def get_backend(use_cache: bool = True, concurrent: bool = False) -> "InProcessBackend | SubprocessBackend | None":
+    """利用可能なバックエンドを返す. signate が見つからなければ None.
+
+    concurrent=True なら、同一プロセス内では呼び出しが直列化されるエントリポイントの代わりに
+    サブプロセスのバックエンドを返す（signate 実行ファイルが見つからなければ同一プロセス内で実行する）。
+    """
+    mode = os.environ.get(BACKEND_ENV, "auto")
+    inprocess = None
+    if mode in ("auto", "inprocess"):
+        inprocess = InProcessBackend.load()
+        if mode == "inprocess" or (inprocess is not None and (inprocess.concurrent or not concurrent)):
+            return inprocess
+    signate_exe = find_signate_exe(use_cache=use_cache)
+    if signate_exe is None:
+        return inprocess
+    return SubprocessBackend(signate_exe)
@@ -0,0 +1,39 @@
+"""ユーザーキャッシュディレクトリの解決と書き込み."""
+
+import os
+import sys
+from pathlib import Path
+
+APP_NAME = "signate-deploy"
+
+
+def user_cache_dir() -> Path:
+    """OSごとのユーザーキャッシュディレクトリを返す（作成はしない）.
+
+    環境変数 SIGNATE_DEPLOY_CACHE_DIR があればそれを優先する。
+    """
+    override = os.environ.get("SIGNATE_DEPLOY_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / APP_NAME / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / APP_NAME
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / APP_NAME
+
+
+def store_text(path: Path, text: str) -> bool:
+    """path に text をアトミックに書く（一時ファイルから os.replace）. 書けなければ False.
+
+    キャッシュは最適化にすぎないので、書けなくても呼び出し側は続行してよい。
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(text)
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
@@ -1,19 +1,56 @@
 """CLI entry point for signate-deploy."""
 
+import importlib
+
 import click
 
 from signate_deploy import __version__
-from signate_deploy.commands.init_repo import init_repo
-from signate_deploy.commands.init import init
-from signate_deploy.commands.submit import submit
-from signate_deploy.commands.download import download
-from signate_deploy.commands.setup_token import setup_token
-from signate_deploy.commands.competition_list import competition_list
-from signate_deploy.commands.task_list import task_list
-from signate_deploy.commands.file_list import file_list
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """サブコマンドのモジュールを実行時まで import しない click.Group.
+
+    ``--help`` や ``--version`` だけの呼び出しで init_repo のテンプレート文字列等を
+    読み込まないようにし、起動時間を短く保つ。
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict[str, str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # コマンド名 -> "module.path:attr"
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_subcommands:
+            return self._load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load(self, cmd_name):
+        module_name, attr = self.lazy_subcommands[cmd_name].rsplit(":", 1)
+        cmd = getattr(importlib.import_module(module_name), attr)
+        if not isinstance(cmd, click.Command):
+            raise ValueError(f"{module_name}:{attr} is not a click.Command")
+        return cmd
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "init-repo": "signate_deploy.commands.init_repo:init_repo",
+        "init": "signate_deploy.commands.init:init",
+        "submit": "signate_deploy.commands.submit:submit",
+        "download": "signate_deploy.commands.download:download",
+        "setup-token": "signate_deploy.commands.setup_token:setup_token",
+        "competition-list": "signate_deploy.commands.competition_list:competition_list",
+        "task-list": "signate_deploy.commands.task_list:task_list",
+        "file-list": "signate_deploy.commands.file_list:file_list",
+        "discover": "signate_deploy.commands.discover:discover",
+        "validate": "signate_deploy.commands.validate:validate",
+        "history": "signate_deploy.commands.history:history",
+    },
+)
 @click.version_option(version=__version__)
 def main():
     """GitHub Actions経由でSIGNATEコンペを自動化するCLIツール
@@ -21,13 +58,3 @@ def main():
     データDL → 学習 → 提出 の一気通貫パイプラインをセットアップします。
     """
     pass
-
-
-main.add_command(init_repo)
-main.add_command(init)
-main.add_command(submit)
-main.add_command(download)
-main.add_command(setup_token)
-main.add_command(competition_list)
-main.add_command(task_list)
-main.add_command(file_list)
@@ -1,27 +1,30 @@
 """signate-deploy competition-list: 参加可能なコンペティション一覧を表示する."""
 
-import subprocess
-import sys
-
 import click
 
-from signate_deploy.signate_cli import find_signate_exe
+from signate_deploy.listings import echo_listing, fetch_listing
 
 
 @click.command("competition-list")
-def competition_list():
+@click.option("--no-cache", is_flag=True, default=False, help="signate CLIの探索キャッシュを使わない")
+@click.option("--refresh", is_flag=True, default=False, help="一覧キャッシュを無視してSIGNATEから取得し直す")
+@click.option("--offline", is_flag=True, default=False, help="一覧キャッシュのみを参照する（通信しない）")
+@click.option("--json", "as_json", is_flag=True, default=False, help="JSON形式で出力する")
+def competition_list(no_cache, refresh, offline, as_json):
     """参加可能なコンペティション一覧を表示する.
 
     signate competition-list のラッパーコマンドです。
-    PATHが通っていなくてもsignate CLIを自動検出して実行します。
+    signateパッケージが入っていれば同一プロセス内で呼び出し、
+    無ければPATHが通っていなくてもsignate CLIを自動検出して実行します。
+    結果はローカルにキャッシュされます（1時間）。
 
     例:
       signate-deploy competition-list
+      signate-deploy competition-list --json
     """
-    signate_exe = find_signate_exe()
-    if signate_exe is None:
-        click.echo("Error: signate CLIが見つかりません。pip install signate を実行してください。", err=True)
+    listing = fetch_listing(
+        "competitions", refresh=refresh, offline=offline, use_cache=not no_cache
+    )
+    if listing is None:
         raise SystemExit(1)
-
-    result = subprocess.run([signate_exe, "competition-list"])
-    sys.exit(result.returncode)
+    echo_listing(listing, as_json)
@@ -0,0 +1,171 @@
+"""signate-deploy discover: コンペ → タスク → ファイルキーを一括で解決する."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import click
+
+from signate_deploy.listings import Listing, fetch_listing
+
+# signate 0.13.1 は task-list / file-list とも public_key 列にキーを出力する
+TASK_KEY_COLUMNS = ["public_key", "task_key", "key", "id"]
+FILE_KEY_COLUMNS = ["public_key", "file_key", "key", "id"]
+NAME_COLUMNS = ["task_name", "name", "title"]
+FILE_NAME_COLUMNS = ["file_name", "filename", "name"]
+
+
+def _column(rows: list[dict], candidates: list[str]) -> str | None:
+    """rows のヘッダから候補に一致する列名を探す（大文字小文字は無視）."""
+    if not rows:
+        return None
+    headers = {h.lower(): h for h in rows[0]}
+    for candidate in candidates:
+        if candidate in headers:
+            return headers[candidate]
+    return None
+
+
+def _file_keys(listing: Listing) -> dict[str, str]:
+    """ファイル一覧を signate-config.json の file_keys（NAME -> KEY）に変換する.
+
+    NAME はファイル名の拡張子を除いた部分（train.csv -> train）。重複したらファイル名のまま使う。
+    """
+    key_col = _column(listing.rows, FILE_KEY_COLUMNS)
+    name_col = _column(listing.rows, FILE_NAME_COLUMNS)
+    if key_col is None:
+        return {}
+    file_keys = {}
+    for row in listing.rows:
+        file_name = row.get(name_col, row[key_col]) if name_col else row[key_col]
+        name = Path(file_name).stem or file_name
+        if name in file_keys:
+            name = file_name
+        file_keys[name] = row[key_col]
+    return file_keys
+
+
+def resolve_competition(
+    competition_key: str,
+    workers: int = 8,
+    refresh: bool = False,
+    offline: bool = False,
+    use_cache: bool = True,
+) -> dict | None:
+    """コンペのタスク一覧を取得し、各タスクのファイル一覧をスレッドプールで並列に取得する.
+
+    タスク一覧の取得に失敗したら None を返す。ファイル一覧の取得に失敗したタスクは
+    "error": true を付けて返す。
+    """
+    tasks = fetch_listing("tasks", competition_key, refresh=refresh, offline=offline, use_cache=use_cache)
+    if tasks is None:
+        return None
+
+    key_col = _column(tasks.rows, TASK_KEY_COLUMNS)
+    name_col = _column(tasks.rows, NAME_COLUMNS)
+    task_keys = [row[key_col] for row in tasks.rows] if key_col else []
+
+    workers = max(1, workers)
+
+    def fetch_files(task_key):
+        return fetch_listing(
+            "files", task_key, refresh=refresh, offline=offline, use_cache=use_cache, concurrent=workers > 1
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        file_listings = list(executor.map(fetch_files, task_keys))
+
+    resolved = []
+    for row, task_key, files in zip(tasks.rows, task_keys, file_listings):
+        entry = {"task_key": task_key, "name": row.get(name_col, "") if name_col else ""}
+        if files is None:
+            entry["error"] = True
+            entry["file_keys"] = {}
+        else:
+            entry["file_keys"] = _file_keys(files)
+        resolved.append(entry)
+    return {"competition_key": competition_key, "tasks": resolved}
+
+
+def _echo_tree(tree: dict) -> None:
+    click.echo(tree["competition_key"])
+    tasks = tree["tasks"]
+    for i, task in enumerate(tasks):
+        last_task = i == len(tasks) - 1
+        label = f"{task['task_key']}  {task['name']}".rstrip()
+        click.echo(f"{'└──' if last_task else '├──'} {label}")
+        indent = "    " if last_task else "│   "
+        if task.get("error"):
+            click.echo(f"{indent}└── (ファイル一覧の取得に失敗)")
+            continue
+        items = list(task["file_keys"].items())
+        for j, (name, key) in enumerate(items):
+            click.echo(f"{indent}{'└──' if j == len(items) - 1 else '├──'} {name}: {key}")
+
+
+@click.command("discover")
+@click.argument("competition_key")
+@click.option("--workers", "-j", default=8, show_default=True, help="ファイル一覧を並列取得するスレッド数")
+@click.option("--write", "write_dir", metavar="COMPETITION_DIR", help="signate-config.json を書き出すディレクトリ")
+@click.option("--task-key", help="--write で使う task_key（タスクが複数ある場合は必須）")
+@click.option("--force", "-f", is_flag=True, default=False, help="既存の signate-config.json を上書きする")
+@click.option("--no-cache", is_flag=True, default=False, help="signate CLIの探索キャッシュを使わない")
+@click.option("--refresh", is_flag=True, default=False, help="一覧キャッシュを無視してSIGNATEから取得し直す")
+@click.option("--offline", is_flag=True, default=False, help="一覧キャッシュのみを参照する（通信しない）")
+@click.option("--json", "as_json", is_flag=True, default=False, help="JSON形式で出力する")
+def discover(competition_key, workers, write_dir, task_key, force, no_cache, refresh, offline, as_json):
+    """コンペのタスクとファイルキーを一括で取得する.
+
+    task-list と、各タスクの file-list を並列に実行し、
+    competition → task → file_key のツリーを表示します。
+    --write を付けると signate-config.json を直接書き出します。
+
+    例:
+      signate-deploy discover <competition_key>
+      signate-deploy discover <competition_key> --write my-comp
+      signate-deploy discover <competition_key> --write my-comp --task-key <task_key>
+    """
+    tree = resolve_competition(
+        competition_key, workers=workers, refresh=refresh, offline=offline, use_cache=not no_cache
+    )
+    if tree is None:
+        raise SystemExit(1)
+
+    if as_json:
+        click.echo(json.dumps(tree, indent=2, ensure_ascii=False))
+    else:
+        _echo_tree(tree)
+
+    failed = [t["task_key"] for t in tree["tasks"] if t.get("error")]
+
+    if write_dir:
+        tasks = tree["tasks"]
+        if task_key:
+            selected = [t for t in tasks if t["task_key"] == task_key]
+            if not selected:
+                click.echo(f"Error: task_key '{task_key}' はこのコンペにありません。", err=True)
+                raise SystemExit(1)
+        elif len(tasks) == 1:
+            selected = tasks
+        else:
+            click.echo(f"Error: タスクが{len(tasks)}件あります。--task-key で指定してください。", err=True)
+            raise SystemExit(1)
+        task = selected[0]
+        if task.get("error"):
+            click.echo(f"Error: task_key '{task['task_key']}' のファイル一覧を取得できませんでした。", err=True)
+            raise SystemExit(1)
+
+        config_path = Path(write_dir) / "signate-config.json"
+        if config_path.exists() and not force:
+            click.echo(f"Error: {config_path} は既に存在します（--force で上書き）。", err=True)
+            raise SystemExit(1)
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        config = {"task_key": task["task_key"], "file_keys": task["file_keys"]}
+        with open(config_path, "w") as f:
+            json.dump(config, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        click.echo(f"  Created: {config_path}", err=as_json)
+
+    if failed:
+        click.echo(f"Error: {len(failed)}件のタスクでファイル一覧の取得に失敗しました: {', '.join(failed)}", err=True)
+        raise SystemExit(1)
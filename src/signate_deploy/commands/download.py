@@ -5,17 +5,46 @@ from pathlib import Path
 
 import click
 
+from signate_deploy.artifact import sync_artifact
+from signate_deploy.commands.submit import wait_for_run
+from signate_deploy.data_download import DEFAULT_WORKERS, download_competition
+from signate_deploy.downloader import DownloadError
+from signate_deploy.github import GitHubClient, GitHubError, new_dispatch_id
+from signate_deploy.signate_cli import find_signate_exe
+
 
 @click.command("download")
 @click.argument("competition_dir")
-def download(competition_dir):
+@click.option("--local", is_flag=True, default=False, help="GitHub Actionsを使わずこのマシンにダウンロードする")
+@click.option("--workers", "-j", default=DEFAULT_WORKERS, show_default=True, help="--local / --fetch での同時ダウンロード数")
+@click.option("--force", "-f", is_flag=True, default=False, help="--local でダウンロード済みでも取得し直す（記録済みのSHA-256とは照合しない）")
+@click.option(
+    "--wait",
+    is_flag=True,
+    default=False,
+    help="起動した実行の完了まで待ってステップの進捗とログを表示し、結論を終了コードにする",
+)
+@click.option(
+    "--fetch",
+    is_flag=True,
+    default=False,
+    help="完了を待ち（--wait を含む）、データのアーティファクトのうち変わったファイルだけを COMPETITION_DIR/data に取得する",
+)
+def download(competition_dir, local, workers, force, wait, fetch):
     """GitHub Actions経由でSIGNATEからデータをダウンロードする.
 
     COMPETITION_DIR 内の signate-config.json を使い、
     GitHub Actions の signate-download.yml を起動します。
+    --local を付けると COMPETITION_DIR/data に直接ダウンロードし、
+    サイズとSHA-256を signate-manifest.json に記録します。
+    --fetch を付けると実行の完了後にアーティファクトを COMPETITION_DIR/data に同期します
+    （zip 全体は取得せず、CRC32 が変わったファイルだけを並列の Range リクエストで取得）。
 
     例:
       signate-deploy download my-comp
+      signate-deploy download my-comp --local
+      signate-deploy download my-comp --wait
+      signate-deploy download my-comp --fetch
     """
     config_path = Path(competition_dir) / "signate-config.json"
     if not config_path.exists():
@@ -23,23 +52,50 @@ def download(competition_dir):
         click.echo("signate-deploy init でディレクトリを作成してください。", err=True)
         raise SystemExit(1)
 
+    if local:
+        signate_exe = find_signate_exe()
+        if signate_exe is None:
+            click.echo("Error: signate CLIが見つかりません。pip install signate を実行してください。", err=True)
+            raise SystemExit(1)
+        download_competition(competition_dir, workers=workers, signate_exe=signate_exe, force=force)
+        return
+
     click.echo(f"Triggering download workflow for '{competition_dir}'...")
 
-    result = subprocess.run(
-        [
-            "gh", "workflow", "run", "signate-download.yml",
-            "-f", f"competition_dir={competition_dir}",
-        ],
-        capture_output=True,
-        text=True,
-    )
+    args = ["gh", "workflow", "run", "signate-download.yml", "-f", f"competition_dir={competition_dir}"]
+    dispatch_id = new_dispatch_id() if wait or fetch else None
+    if dispatch_id:
+        args += ["-f", f"dispatch_id={dispatch_id}"]
+    result = subprocess.run(args, capture_output=True, text=True)
 
     if result.returncode != 0:
         click.echo("Error: gh workflow run に失敗しました。", err=True)
         click.echo(result.stderr, err=True)
         raise SystemExit(1)
+    if dispatch_id:
+        client, run = wait_for_run("signate-download.yml", dispatch_id)
+        if fetch:
+            fetch_artifact(client, run, competition_dir, workers)
+        return
 
     click.echo("")
     click.echo("Workflow を起動しました。")
     click.echo("進捗確認: gh run list --limit 1")
     click.echo("Artifact取得: gh run download <run_id> --dir data/")
+
+
+def fetch_artifact(client: GitHubClient, run: dict, competition_dir: str, workers: int) -> None:
+    """run がアップロードしたデータのアーティファクトを COMPETITION_DIR/data に同期する."""
+    name = f"signate-data-{competition_dir}"
+    click.echo("")
+    click.echo(f"Fetching artifact {name}...")
+    try:
+        artifacts = client.get_json(f"actions/runs/{run['id']}/artifacts", {"name": name}).data.get("artifacts", [])
+        artifacts = [a for a in artifacts if not a.get("expired")]
+        if not artifacts:
+            raise GitHubError(f"実行 {run['id']} にアーティファクト {name} がありません")
+        url = client.redirect_location(f"actions/artifacts/{artifacts[0]['id']}/zip")
+        sync_artifact(url, Path(competition_dir) / "data", workers=workers, echo=click.echo)
+    except (GitHubError, DownloadError, ValueError) as e:
+        click.echo(f"Error: {e}", err=True)
+        raise SystemExit(1)
@@ -0,0 +1,47 @@
+"""signate-deploy history: 提出の台帳（submissions.jsonl）を表示する."""
+
+import json
+from pathlib import Path
+
+import click
+
+from signate_deploy.ledger import LEDGER_FILENAME, SORT_COLUMNS, Ledger, describe
+
+
+@click.command("history")
+@click.argument("competition_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--limit", "-n", type=click.IntRange(min=1), default=20, show_default=True, help="表示する件数")
+@click.option("--all", "show_all", is_flag=True, default=False, help="全件表示する")
+@click.option(
+    "--sort",
+    type=click.Choice(list(SORT_COLUMNS)),
+    default="time",
+    show_default=True,
+    help="time: 新しい順 / cv: CV スコアの高い順（スコアのない提出は除く）",
+)
+@click.option("--hash", "sha256_prefix", default=None, help="submission.csv の SHA-256（前方一致）で絞り込む")
+@click.option("--json", "as_json", is_flag=True, default=False, help="JSON Lines で出力する")
+def history(competition_dir, limit, show_all, sort, sha256_prefix, as_json):
+    """COMPETITION_DIR の提出履歴を表示する.
+
+    Actions の Submit ステップが提出ごとに COMPETITION_DIR/submissions.jsonl に
+    記録してコミットします（git pull で取り込んでください）。
+    検索はローカルの SQLite の索引（.submissions-index.sqlite）で行います。
+
+    例:
+      signate-deploy history my-comp
+      signate-deploy history my-comp --sort cv -n 5
+      signate-deploy history my-comp --hash 3fa2c1
+    """
+    ledger = Ledger(competition_dir)
+    if not ledger.path.exists():
+        click.echo(f"{competition_dir / LEDGER_FILENAME} がありません（まだ提出していないか、git pull が必要です）。")
+        return
+    entries = ledger.history(None if show_all else limit, sort, sha256_prefix)
+    if as_json:
+        for entry in entries:
+            click.echo(json.dumps(entry, ensure_ascii=False, sort_keys=True))
+        return
+    for entry in entries:
+        click.echo(describe(entry))
+    click.echo(f"({len(entries)} / {ledger.count()} 件)")
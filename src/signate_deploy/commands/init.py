@@ -5,6 +5,8 @@ from pathlib import Path
 
 import click
 
+from signate_deploy import __version__
+
 
 CONFIG_TEMPLATE = {
     "task_key": "",
@@ -12,23 +14,178 @@ CONFIG_TEMPLATE = {
 }
 
 TRAIN_TEMPLATE = """\
+import argparse
+import functools
+import glob
+import inspect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import StratifiedKFold
 from sklearn.metrics import roc_auc_score
 import lightgbm as lgb
 
+from signate_deploy.feature_cache import FeatureCache
+from signate_deploy.frame import downcast, peak_rss_mb, predict_in_batches, read_csv_lean, write_csv_blocks
+from signate_deploy.model_cache import FoldModelCache
+
 DATA_DIR = "{competition_dir}/data"
 TARGET = "target"  # ターゲット列名に変更してください
+N_SPLITS = 5
+# fold を並列に学習するプロセス数（環境変数 FOLD_WORKERS で上書き可）
+FOLD_WORKERS = int(os.environ.get("FOLD_WORKERS", "{fold_workers}"))
+
+
+def load_table(name):
+    # init-repo --convert で変換済みなら Parquet/Feather を読む（CSVより速く省メモリ）
+    for ext, reader in [(".parquet", pd.read_parquet), (".feather", pd.read_feather)]:
+        path = f"{{DATA_DIR}}/{{name}}{{ext}}"
+        if os.path.exists(path):
+            return downcast(reader(path))
+    # CSV はチャンクで読みながら数値をダウンキャストし、種類の少ない文字列を category にする
+    return read_csv_lean(f"{{DATA_DIR}}/{{name}}.csv")
+
+
+# 関数のソースかデータが変わらない限り、特徴量は前回の結果（Actions ではキャッシュから復元）を使う
+feature_cache = FeatureCache(
+    f"{{DATA_DIR}}/../.feature-cache",
+    DATA_DIR,
+    max_bytes=int(os.environ.get("FEATURE_CACHE_MAX_MB", "2048")) * 1024**2,
+)
+# 学習済みの fold モデルと予測. データ・特徴量・パラメータ・fold が同じなら学習し直さない
+model_cache = FoldModelCache(
+    f"{{DATA_DIR}}/../.model-cache",
+    DATA_DIR,
+    max_bytes=int(os.environ.get("MODEL_CACHE_MAX_MB", "1024")) * 1024**2,
+)
+
+
+@feature_cache
+def make_features():
+    train = load_table("train")
+    test = load_table("test")
+    # 特徴量エンジニアリングはここに書く（DataFrame / ndarray を返す）
+    return train, test
+
+
+_worker = {{}}
+
+
+def _init_worker(X, y, X_test, params):
+    # プロセスごとに1回だけデータを受け取り、ビン化した Dataset を作る
+    dataset = lgb.Dataset(X, y, free_raw_data=False, params={{"verbosity": -1}})
+    _worker.update(X=X, X_test=X_test, params=params, dataset=dataset, warm_start=True)
+
+
+def train_fold(fold, tr_idx, val_idx, key):
+    params = dict(_worker["params"])
+    num_boost_round = params.pop("n_estimators", 1000)
+    # 前回と同じ条件で学習済みなら、その予測を使う（メモだけ変えた再提出など）
+    cached = model_cache.get(key)
+    if cached is not None and cached.reusable(num_boost_round):
+        print(f"Fold {{fold + 1}}: cached model ({{key[:8]}})")
+        return fold, val_idx, cached.val_pred(), cached.test_pred()
+    # ラウンド数を増やしただけなら、前回のモデルから続きを学習する
+    init_model = None
+    if cached is not None and cached.continuable(num_boost_round) and _worker["warm_start"]:
+        init_model = str(cached.model_path)
+        print(f"Fold {{fold + 1}}: continue from round {{cached.trained_rounds}} ({{key[:8]}})")
+
+    # fold ごとの学習・検証データは添字で subset を取る（DataFrame をコピーしない）
+    dataset = _worker["dataset"]
+    booster = lgb.train(
+        params,
+        dataset.subset(tr_idx),
+        num_boost_round=num_boost_round - (cached.trained_rounds if init_model else 0),
+        valid_sets=[dataset.subset(val_idx)],
+        init_model=init_model,
+        callbacks=[lgb.early_stopping(50, verbose=False), lgb.log_evaluation(0)],
+    )
+    # 予測は一定行数ずつ行い、float32 の配列に詰める（検証データも val_idx の1バッチ分ずつ取り出す）
+    predict = functools.partial(booster.predict, num_iteration=booster.best_iteration)
+    val_pred = predict_in_batches(predict, _worker["X"], index=val_idx)
+    test_pred = predict_in_batches(predict, _worker["X_test"])
+    model_cache.put(key, booster, val_pred, test_pred, num_boost_round)
+    return fold, val_idx, val_pred, test_pred
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    # fold 分割ワークフロー（signate-submit-sharded.yml）では fold×seed ごとに別ジョブで学習し、最後に --merge で集計する
+    parser.add_argument("--fold", type=int, choices=range(N_SPLITS), help="この fold だけ学習し、予測を --out に保存する")
+    parser.add_argument("--seed", type=int, help="LightGBM の random_state（fold の分け方は変えない）")
+    parser.add_argument("--out", default=f"{{DATA_DIR}}/../shards", help="--fold の予測の保存先")
+    parser.add_argument("--merge", metavar="DIR", help="DIR 以下の fold ごとの予測を集計して submission.csv を書く")
+    return parser.parse_args()
+
+
+def save_shard(out_dir, fold, seed, val_idx, val_pred, y_val, test_pred, test_ids):
+    os.makedirs(out_dir, exist_ok=True)
+    path = f"{{out_dir}}/fold{{fold}}-seed{{seed}}.npz"
+    np.savez(
+        path, fold=fold, seed=seed, val_idx=val_idx, val_pred=val_pred, y_val=y_val,
+        test_pred=test_pred, test_id=np.asarray(test_ids),
+    )
+    return path
+
+
+def load_shards(shard_dir):
+    # fold×seed ごとの予測を集める. seed が複数なら OOF は seed 平均、テストは全体の平均
+    shards = {{}}
+    for path in glob.glob(f"{{shard_dir}}/**/fold*-seed*.npz", recursive=True):
+        shard = np.load(path)
+        shards[int(shard["fold"]), int(shard["seed"])] = shard
+    if not shards:
+        raise SystemExit(f"{{shard_dir}} に fold ごとの予測（fold*-seed*.npz）がありません")
+    seeds = sorted({{seed for _, seed in shards}})
+    missing = sorted({{(fold, seed) for fold in range(N_SPLITS) for seed in seeds}} - set(shards))
+    if missing:
+        raise SystemExit(f"{{shard_dir}} の fold ごとの予測が揃っていません（不足している (fold, seed): {{missing}}）")
+
+    # 読み込み順によらず (fold, seed) 順に足す（1ジョブで全 fold を学習した場合と同じ結果になる）
+    n_rows = sum(len(shards[fold, seeds[0]]["val_idx"]) for fold in range(N_SPLITS))
+    first = shards[0, seeds[0]]
+    y = np.empty(n_rows, dtype=first["y_val"].dtype)
+    oof_preds = np.zeros(n_rows, dtype=np.float32)
+    test_preds = np.zeros(len(first["test_id"]), dtype=np.float32)
+    for (fold, seed), shard in sorted(shards.items()):
+        val_idx, val_pred = shard["val_idx"], shard["val_pred"]
+        y[val_idx] = shard["y_val"]
+        oof_preds[val_idx] += val_pred / len(seeds)
+        test_preds += shard["test_pred"] / len(shards)
+        print(f"Fold {{fold + 1}} (seed {{seed}}): AUC = {{roc_auc_score(y[val_idx], val_pred):.5f}}")
+    return y, oof_preds, first["test_id"], test_preds
+
+
+def write_submission(y, oof_preds, test_ids, test_preds):
+    score = roc_auc_score(y, oof_preds)
+    print(f"Overall OOF AUC: {{score:.5f}}")
+    # 提出の台帳（submissions.jsonl）に記録する CV スコア
+    with open(f"{{DATA_DIR}}/../cv-score.json", "w") as f:
+        json.dump({{"metric": "auc", "score": float(score)}}, f)
+    # 提出ファイルは一定行数ずつ書き出す（全体の DataFrame を作らない）
+    n_rows = write_csv_blocks(f"{{DATA_DIR}}/../submission.csv", {{"id": test_ids, "pred": test_preds}})
+    print(f"Saved: submission.csv ({{n_rows}} rows)")
 
 
 def main():
-    train = pd.read_csv(f"{{DATA_DIR}}/train.csv")
-    test = pd.read_csv(f"{{DATA_DIR}}/test.csv")
+    args = parse_args()
+    if args.merge:
+        write_submission(*load_shards(args.merge))
+        return
 
-    features = [c for c in train.columns if c not in ["id", TARGET]]
-    X, y = train[features], train[TARGET]
-    X_test = test[features]
+    train, test = make_features()
+
+    y = train.pop(TARGET).to_numpy()
+    train.pop("id")
+    test_ids = test.pop("id")
+    X = train
+    X_test = test[X.columns]
+    del train, test
 
     params = {{
         "objective": "binary",
@@ -38,38 +195,361 @@ def main():
         "learning_rate": 0.05,
         "random_state": 42,
     }}
+    # matrix提出（submit DIR:CONFIG）では実験ごとのJSONでパラメータを上書きする
+    if os.environ.get("EXPERIMENT_CONFIG"):
+        with open(os.environ["EXPERIMENT_CONFIG"]) as f:
+            params.update(json.load(f))
+    if args.seed is not None:
+        params["random_state"] = args.seed
+
+    skf = StratifiedKFold(n_splits=N_SPLITS, shuffle=True, random_state=42)
+    # --fold 指定時はその fold だけ学習する
+    splits = [(fold, tr, val) for fold, (tr, val) in enumerate(skf.split(X, y)) if args.fold in (None, fold)]
+    folds, tr_idxs, val_idxs = zip(*splits)
+    # fold モデルのキャッシュキー. 特徴量・学習のコード、X / X_test の列と dtype、目的変数、
+    # fold の分け方が変わったら学習し直す（make_features の後で列を足したり落としたりした場合も含む）
+    code = feature_cache.key(make_features.__wrapped__), inspect.getsource(train_fold)
+    keys = [model_cache.key(fold, params, *code, X, X_test, y, tr, val) for fold, tr, val in splits]
+    workers = max(1, min(FOLD_WORKERS, len(folds)))
+    # 1プロセスあたりのスレッド数. n_jobs × workers がコア数を超えないようにする
+    params.setdefault("n_jobs", max(1, (os.cpu_count() or 1) // workers))
+    # テストの予測は fold ごとに1本の float32 配列へ足し込む
+    oof_preds = np.zeros(len(X), dtype=np.float32)
+    test_preds = np.zeros(len(X_test), dtype=np.float32)
+    with ExitStack() as stack:
+        if workers == 1:
+            _init_worker(X, y, X_test, params)
+            results = map(train_fold, folds, tr_idxs, val_idxs, keys)
+        else:
+            pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(X, y, X_test, params))
+            results = stack.enter_context(pool).map(train_fold, folds, tr_idxs, val_idxs, keys)
+        # 完了順によらず fold 順に、プールを閉じる前から1 fold ずつ集計する（並列数を変えても結果が同じになる）
+        for fold, val_idx, val_pred, test_pred in results:
+            oof_preds[val_idx] = val_pred
+            test_preds += test_pred / N_SPLITS
+            print(f"Fold {{fold + 1}}: AUC = {{roc_auc_score(y[val_idx], val_pred):.5f}}")
+            if args.fold is not None:
+                seed = params["random_state"]
+                print(f"Saved: {{save_shard(args.out, fold, seed, val_idx, val_pred, y[val_idx], test_pred, test_ids)}}")
+
+    if args.fold is None:
+        write_submission(y, oof_preds, test_ids, test_preds)
+    if peak_rss_mb() is not None:
+        print(f"Peak RSS: {{peak_rss_mb():.0f}} MB (fold workers: {{peak_rss_mb(children=True):.0f}} MB)")
+
+
+if __name__ == "__main__":
+    main()
+"""
+
+# --template fast: 全データのビン化を親プロセスで1回だけ行い、fold ワーカーにはビン化済みのバイナリを渡す
+_STANDARD_DATASET = """\
+def _init_worker(X, y, X_test, params):
+    # プロセスごとに1回だけデータを受け取り、ビン化した Dataset を作る
+    dataset = lgb.Dataset(X, y, free_raw_data=False, params={{"verbosity": -1}})
+    _worker.update(X=X, X_test=X_test, params=params, dataset=dataset, warm_start=True)
+"""
+
+_FAST_DATASET = """\
+def build_dataset(X, y, params):
+    # 全データのビン化はここで1回だけ行う. 生データは Dataset に持たせない
+    return lgb.Dataset(X, y, params=params, free_raw_data=True).construct()
+
+
+def _init_worker(X, X_test, params, binned, pandas_categorical=None):
+    # ワーカーはビン化済みのバイナリを読み込むだけで、再ビン化しない
+    if isinstance(binned, str):
+        dataset = lgb.Dataset(binned, params=params)
+        # バイナリには category 列のカテゴリ一覧が入らない. 無いと予測時に X_test 自身のカテゴリ番号を使ってしまう
+        dataset.pandas_categorical = pandas_categorical
+    else:
+        dataset = binned
+    # 生データを持たない Dataset からは init_model で続きを学習できない
+    _worker.update(X=X, X_test=X_test, params=params, dataset=dataset, warm_start=False)
+"""
+
+_STANDARD_POOL = """\
+    with ExitStack() as stack:
+        if workers == 1:
+            _init_worker(X, y, X_test, params)
+            results = map(train_fold, folds, tr_idxs, val_idxs, keys)
+        else:
+            pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(X, y, X_test, params))
+            results = stack.enter_context(pool).map(train_fold, folds, tr_idxs, val_idxs, keys)
+"""
+
+_FAST_POOL = """\
+    # 行/列方向の並列化の自動判定を fold ごとにやり直さない
+    params.setdefault("force_col_wise", True)
+    dataset = build_dataset(X, y, params)
+    with ExitStack() as stack:
+        if workers == 1:
+            _init_worker(X, X_test, params, dataset)
+            results = map(train_fold, folds, tr_idxs, val_idxs, keys)
+        else:
+            binary_path = os.path.join(stack.enter_context(tempfile.TemporaryDirectory()), "train.bin")
+            dataset.save_binary(binary_path)
+            initargs = (X, X_test, params, binary_path, dataset.pandas_categorical)
+            del dataset
+            pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs)
+            results = stack.enter_context(pool).map(train_fold, folds, tr_idxs, val_idxs, keys)
+"""
+
+FAST_TRAIN_TEMPLATE = (
+    TRAIN_TEMPLATE.replace("import os\n", "import os\nimport tempfile\n", 1)
+    .replace(_STANDARD_DATASET, _FAST_DATASET)
+    .replace(_STANDARD_POOL, _FAST_POOL)
+)
+
+# --template mmap: convert --format npy で作った列ごとの .npy を memmap で開き、全体を配列にせずに学習する
+MMAP_TRAIN_TEMPLATE = """\
+import argparse
+import functools
+import glob
+import inspect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 
-    skf = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-    oof_preds = np.zeros(len(X))
-    test_preds = np.zeros(len(X_test))
+import numpy as np
+from sklearn.model_selection import StratifiedKFold
+from sklearn.metrics import roc_auc_score
+import lightgbm as lgb
+
+from signate_deploy.frame import peak_rss_mb, predict_in_batches, write_csv_blocks
+from signate_deploy.model_cache import FoldModelCache
+from signate_deploy.npystore import NpyStore
+
+DATA_DIR = "{competition_dir}/data"
+TARGET = "target"  # ターゲット列名に変更してください
+N_SPLITS = 5
+# fold を並列に学習するプロセス数（環境変数 FOLD_WORKERS で上書き可）
+FOLD_WORKERS = int(os.environ.get("FOLD_WORKERS", "{fold_workers}"))
+BATCH_ROWS = 65536
+
+# 学習済みの fold モデルと予測. データ・特徴量・パラメータ・fold が同じなら学習し直さない
+model_cache = FoldModelCache(
+    f"{{DATA_DIR}}/../.model-cache",
+    DATA_DIR,
+    max_bytes=int(os.environ.get("MODEL_CACHE_MAX_MB", "1024")) * 1024**2,
+)
+
+
+def open_store(name):
+    path = f"{{DATA_DIR}}/{{name}}.npystore"
+    if not os.path.exists(path):
+        raise SystemExit(f"{{path}} がありません。python -m signate_deploy.convert {{DATA_DIR}} --format npy で作成してください")
+    return NpyStore(path)
+
+
+class StoreRows(lgb.Sequence):
+    # LightGBM は batch_size 行ずつ読みながらビン化する（全体を1つの配列にしない）.
+    # Sequence からのビン化は float64 しか受け付けない（変換はバッチ単位）
+    batch_size = BATCH_ROWS
+
+    def __init__(self, store, columns, index=None, dtype=np.float64):
+        self.store = store
+        self.columns = columns
+        self.index = index
+        self.dtype = dtype
+
+    def __getitem__(self, idx):
+        rows = idx if self.index is None else self.index[idx]
+        return self.store.rows(self.columns, rows, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.store) if self.index is None else len(self.index)
+
+
+_worker = {{}}
+
+
+def _init_worker(features, params):
+    # 各プロセスがストアを memmap で開く（データはページキャッシュを共有し、プロセス間で送らない）
+    train, test = open_store("train"), open_store("test")
+    dataset = lgb.Dataset(
+        StoreRows(train, features),
+        label=np.asarray(train.column(TARGET)),
+        feature_name=features,
+        categorical_feature=[c for c in features if c in train.categories],
+        params=params,
+        free_raw_data=True,
+    )
+    # 生データを持たない Dataset からは init_model で続きを学習できない
+    _worker.update(train=train, test=test, features=features, params=params, dataset=dataset, warm_start=False)
+
+
+def train_fold(fold, tr_idx, val_idx, key):
+    params = dict(_worker["params"])
+    num_boost_round = params.pop("n_estimators", 1000)
+    # 前回と同じ条件で学習済みなら、その予測を使う（メモだけ変えた再提出など）
+    cached = model_cache.get(key)
+    if cached is not None and cached.reusable(num_boost_round):
+        print(f"Fold {{fold + 1}}: cached model ({{key[:8]}})")
+        return fold, val_idx, cached.val_pred(), cached.test_pred()
+    # ラウンド数を増やしただけなら、前回のモデルから続きを学習する
+    init_model = None
+    if cached is not None and cached.continuable(num_boost_round) and _worker["warm_start"]:
+        init_model = str(cached.model_path)
+        print(f"Fold {{fold + 1}}: continue from round {{cached.trained_rounds}} ({{key[:8]}})")
+
+    # fold ごとの学習・検証データは添字で subset を取る
+    dataset = _worker["dataset"]
+    booster = lgb.train(
+        params,
+        dataset.subset(tr_idx),
+        num_boost_round=num_boost_round - (cached.trained_rounds if init_model else 0),
+        valid_sets=[dataset.subset(val_idx)],
+        init_model=init_model,
+        callbacks=[lgb.early_stopping(50, verbose=False), lgb.log_evaluation(0)],
+    )
+    # 予測は BATCH_ROWS 行ずつ行い、float32 の配列に詰める
+    features = _worker["features"]
+    predict = functools.partial(booster.predict, num_iteration=booster.best_iteration)
+    val_pred = predict_in_batches(predict, StoreRows(_worker["train"], features, val_idx, np.float32), BATCH_ROWS)
+    test_pred = predict_in_batches(predict, StoreRows(_worker["test"], features, dtype=np.float32), BATCH_ROWS)
+    model_cache.put(key, booster, val_pred, test_pred, num_boost_round)
+    return fold, val_idx, val_pred, test_pred
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    # fold 分割ワークフロー（signate-submit-sharded.yml）では fold×seed ごとに別ジョブで学習し、最後に --merge で集計する
+    parser.add_argument("--fold", type=int, choices=range(N_SPLITS), help="この fold だけ学習し、予測を --out に保存する")
+    parser.add_argument("--seed", type=int, help="LightGBM の random_state（fold の分け方は変えない）")
+    parser.add_argument("--out", default=f"{{DATA_DIR}}/../shards", help="--fold の予測の保存先")
+    parser.add_argument("--merge", metavar="DIR", help="DIR 以下の fold ごとの予測を集計して submission.csv を書く")
+    return parser.parse_args()
 
-    for fold, (tr_idx, val_idx) in enumerate(skf.split(X, y)):
-        model = lgb.LGBMClassifier(**params)
-        model.fit(
-            X.iloc[tr_idx], y.iloc[tr_idx],
-            eval_set=[(X.iloc[val_idx], y.iloc[val_idx])],
-            callbacks=[lgb.early_stopping(50), lgb.log_evaluation(0)],
-        )
-        oof_preds[val_idx] = model.predict_proba(X.iloc[val_idx])[:, 1]
-        test_preds += model.predict_proba(X_test)[:, 1] / 5
-        print(f"Fold {{fold + 1}}: AUC = {{roc_auc_score(y.iloc[val_idx], oof_preds[val_idx]):.5f}}")
 
-    print(f"Overall OOF AUC: {{roc_auc_score(y, oof_preds):.5f}}")
+def save_shard(out_dir, fold, seed, val_idx, val_pred, y_val, test_pred, test_ids):
+    os.makedirs(out_dir, exist_ok=True)
+    path = f"{{out_dir}}/fold{{fold}}-seed{{seed}}.npz"
+    np.savez(
+        path, fold=fold, seed=seed, val_idx=val_idx, val_pred=val_pred, y_val=y_val,
+        test_pred=test_pred, test_id=np.asarray(test_ids),
+    )
+    return path
 
-    submission = pd.DataFrame({{"id": test["id"], "pred": test_preds}})
-    submission.to_csv(f"{{DATA_DIR}}/../submission.csv", index=False, header=False)
-    print(f"Saved: submission.csv ({{len(submission)}} rows)")
+
+def load_shards(shard_dir):
+    # fold×seed ごとの予測を集める. seed が複数なら OOF は seed 平均、テストは全体の平均
+    shards = {{}}
+    for path in glob.glob(f"{{shard_dir}}/**/fold*-seed*.npz", recursive=True):
+        shard = np.load(path)
+        shards[int(shard["fold"]), int(shard["seed"])] = shard
+    if not shards:
+        raise SystemExit(f"{{shard_dir}} に fold ごとの予測（fold*-seed*.npz）がありません")
+    seeds = sorted({{seed for _, seed in shards}})
+    missing = sorted({{(fold, seed) for fold in range(N_SPLITS) for seed in seeds}} - set(shards))
+    if missing:
+        raise SystemExit(f"{{shard_dir}} の fold ごとの予測が揃っていません（不足している (fold, seed): {{missing}}）")
+
+    # 読み込み順によらず (fold, seed) 順に足す（1ジョブで全 fold を学習した場合と同じ結果になる）
+    n_rows = sum(len(shards[fold, seeds[0]]["val_idx"]) for fold in range(N_SPLITS))
+    first = shards[0, seeds[0]]
+    y = np.empty(n_rows, dtype=first["y_val"].dtype)
+    oof_preds = np.zeros(n_rows, dtype=np.float32)
+    test_preds = np.zeros(len(first["test_id"]), dtype=np.float32)
+    for (fold, seed), shard in sorted(shards.items()):
+        val_idx, val_pred = shard["val_idx"], shard["val_pred"]
+        y[val_idx] = shard["y_val"]
+        oof_preds[val_idx] += val_pred / len(seeds)
+        test_preds += shard["test_pred"] / len(shards)
+        print(f"Fold {{fold + 1}} (seed {{seed}}): AUC = {{roc_auc_score(y[val_idx], val_pred):.5f}}")
+    return y, oof_preds, first["test_id"], test_preds
+
+
+def write_submission(y, oof_preds, test_ids, test_preds):
+    score = roc_auc_score(y, oof_preds)
+    print(f"Overall OOF AUC: {{score:.5f}}")
+    # 提出の台帳（submissions.jsonl）に記録する CV スコア
+    with open(f"{{DATA_DIR}}/../cv-score.json", "w") as f:
+        json.dump({{"metric": "auc", "score": float(score)}}, f)
+    # 提出ファイルは BATCH_ROWS 行ずつ書き出す
+    n_rows = write_csv_blocks(f"{{DATA_DIR}}/../submission.csv", {{"id": test_ids, "pred": test_preds}}, BATCH_ROWS)
+    print(f"Saved: submission.csv ({{n_rows}} rows)")
+
+
+def main():
+    args = parse_args()
+    if args.merge:
+        write_submission(*load_shards(args.merge))
+        return
+
+    train, test = open_store("train"), open_store("test")
+    features = [c for c in train.columns if c not in ["id", TARGET]]
+    y = np.asarray(train.column(TARGET))
+    # 数値の id 列は memmap のまま使う. 文字列の id はカテゴリ番号で保存されているので元の値に戻す
+    test_ids = test.column("id")
+    if "id" in test.categories:
+        test_ids = np.asarray(test.categories["id"])[test_ids]
+
+    params = {{
+        "objective": "binary",
+        "metric": "auc",
+        "verbosity": -1,
+        "n_estimators": 1000,
+        "learning_rate": 0.05,
+        "random_state": 42,
+    }}
+    # matrix提出（submit DIR:CONFIG）では実験ごとのJSONでパラメータを上書きする
+    if os.environ.get("EXPERIMENT_CONFIG"):
+        with open(os.environ["EXPERIMENT_CONFIG"]) as f:
+            params.update(json.load(f))
+    if args.seed is not None:
+        params["random_state"] = args.seed
+
+    skf = StratifiedKFold(n_splits=N_SPLITS, shuffle=True, random_state=42)
+    # --fold 指定時はその fold だけ学習する
+    splits = [
+        (fold, tr, val) for fold, (tr, val) in enumerate(skf.split(np.zeros(len(y)), y)) if args.fold in (None, fold)
+    ]
+    folds, tr_idxs, val_idxs = zip(*splits)
+    # fold モデルのキャッシュキー. 特徴量・学習のコード、目的変数、fold の分け方が変わったら学習し直す
+    code = features, inspect.getsource(train_fold)
+    keys = [model_cache.key(fold, params, *code, y, tr, val) for fold, tr, val in splits]
+    workers = max(1, min(FOLD_WORKERS, len(folds)))
+    # 1プロセスあたりのスレッド数. n_jobs × workers がコア数を超えないようにする
+    params.setdefault("n_jobs", max(1, (os.cpu_count() or 1) // workers))
+    oof_preds = np.zeros(len(y), dtype=np.float32)
+    test_preds = np.zeros(len(test), dtype=np.float32)
+    with ExitStack() as stack:
+        if workers == 1:
+            _init_worker(features, params)
+            results = map(train_fold, folds, tr_idxs, val_idxs, keys)
+        else:
+            pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(features, params))
+            results = stack.enter_context(pool).map(train_fold, folds, tr_idxs, val_idxs, keys)
+        # 完了順によらず fold 順に、プールを閉じる前から1 fold ずつ集計する（並列数を変えても結果が同じになる）
+        for fold, val_idx, val_pred, test_pred in results:
+            oof_preds[val_idx] = val_pred
+            test_preds += test_pred / N_SPLITS
+            print(f"Fold {{fold + 1}}: AUC = {{roc_auc_score(y[val_idx], val_pred):.5f}}")
+            if args.fold is not None:
+                seed = params["random_state"]
+                print(f"Saved: {{save_shard(args.out, fold, seed, val_idx, val_pred, y[val_idx], test_pred, test_ids)}}")
+
+    if args.fold is None:
+        write_submission(y, oof_preds, test_ids, test_preds)
+    if peak_rss_mb() is not None:
+        print(f"Peak RSS: {{peak_rss_mb():.0f}} MB (fold workers: {{peak_rss_mb(children=True):.0f}} MB)")
 
 
 if __name__ == "__main__":
     main()
 """
 
-REQUIREMENTS_TEMPLATE = """\
+TRAIN_TEMPLATES = {"standard": TRAIN_TEMPLATE, "fast": FAST_TRAIN_TEMPLATE, "mmap": MMAP_TRAIN_TEMPLATE}
+
+REQUIREMENTS_TEMPLATE = f"""\
 pandas
 numpy
 scikit-learn
 lightgbm
+pyarrow
+signate-deploy=={__version__}
 """
 
 
@@ -82,7 +562,23 @@ lightgbm
     metavar="NAME:KEY",
     help="ファイルキー（例: --file-key train:abc123 --file-key test:def456）",
 )
-def init(competition_dir, task_key, file_key):
+@click.option(
+    "--fold-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="train.py で fold を並列に学習するプロセス数（LightGBM のスレッドはコア数をこれで割って配分）",
+)
+@click.option(
+    "--template",
+    "template_name",
+    type=click.Choice(list(TRAIN_TEMPLATES)),
+    default="standard",
+    show_default=True,
+    help="train.py の雛形（fast: ビン化を1回だけ行い fold ワーカーで共有する / "
+    "mmap: convert --format npy の列ストアを memmap で読む）",
+)
+def init(competition_dir, task_key, file_key, fold_workers, template_name):
     """コンペ用ディレクトリを雛形から生成する.
 
     COMPETITION_DIR はローカルのディレクトリ名です。
@@ -90,6 +586,8 @@ def init(competition_dir, task_key, file_key):
     例:
       signate-deploy init my-comp --task-key abc123
       signate-deploy init my-comp --task-key abc123 --file-key train:key1 --file-key test:key2
+      signate-deploy init my-comp --task-key abc123 --fold-workers 4
+      signate-deploy init my-comp --task-key abc123 --template fast --fold-workers 4
     """
     dir_path = Path(competition_dir)
     if dir_path.exists():
@@ -120,7 +618,7 @@ def init(competition_dir, task_key, file_key):
 
     # train.py
     train_path = dir_path / "train.py"
-    train_path.write_text(TRAIN_TEMPLATE.format(competition_dir=competition_dir))
+    train_path.write_text(TRAIN_TEMPLATES[template_name].format(competition_dir=competition_dir, fold_workers=fold_workers))
     click.echo(f"  Created: {train_path}")
 
     # requirements.txt
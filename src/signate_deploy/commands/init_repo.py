@@ -4,24 +4,73 @@ from pathlib import Path
 
 import click
 
+from signate_deploy import __version__
+
 
 REFRESH_TOKEN_SCRIPT = """\
-\"\"\"SIGNATE APIトークンをメール/パスワードで自動取得してsignate.jsonに保存する.\"\"\"
+\"\"\"SIGNATE APIトークンをメール/パスワードで自動取得してsignate.jsonに保存する.
+
+保存済みのトークン（JWT）の有効期限が十分残っていれば再取得しない。
+HTTP 429/5xx は指数バックオフで再試行する。
+\"\"\"
 
+import base64
+import json
 import os
 import sys
+import time
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-CLOUD_URL = "https://api.cloud.signate.jp/api"
+CLOUD_URL = os.environ.get("SIGNATE_CLOUD_URL", "https://api.cloud.signate.jp/api")
 JWT_COOKIE_KEY = "cloud_user"
 CSRF_COOKIE_KEY = "_user_csrf_cloud"
+TOKEN_PATH = Path.home() / ".signate" / "signate.json"
+
+# 有効期限までこの秒数を切っていたら再取得する
+EXPIRY_MARGIN = int(os.environ.get("SIGNATE_TOKEN_EXPIRY_MARGIN", "600"))
+
+
+def token_expiry(jwt: str) -> float | None:
+    \"\"\"JWT の exp クレーム（UNIX時刻）を返す. 読めなければ None.\"\"\"
+    try:
+        payload = jwt.strip().split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
 
 
-def refresh_token(email: str, password: str) -> None:
+def cached_token_is_valid(token_path: Path = TOKEN_PATH) -> bool:
+    try:
+        jwt = token_path.read_text()
+    except OSError:
+        return False
+    exp = token_expiry(jwt)
+    return exp is not None and exp - EXPIRY_MARGIN > time.time()
+
+
+def make_session() -> requests.Session:
+    \"\"\"リトライ付きの接続プールを持つセッションを作る.\"\"\"
+    retry = Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],
+        raise_on_status=False,
+    )
     session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    session.mount("http://", HTTPAdapter(max_retries=retry))
     session.headers.update({"User-Agent": "python-requests/2.x"})
+    return session
+
+
+def refresh_token(email: str, password: str, session: requests.Session | None = None) -> None:
+    session = session or make_session()
 
     # 1. CSRFトークン取得
     session.get(f"{CLOUD_URL}/v1/token").raise_for_status()
@@ -43,13 +92,15 @@ def refresh_token(email: str, password: str) -> None:
 
     # 4. JWT取得・保存
     jwt = next(c.value for c in session.cookies if c.name == JWT_COOKIE_KEY)
-    token_path = Path.home() / ".signate" / "signate.json"
-    token_path.parent.mkdir(parents=True, exist_ok=True)
-    token_path.write_text(jwt)
+    TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+    TOKEN_PATH.write_text(jwt)
     print("SIGNATE token refreshed successfully.")
 
 
 if __name__ == "__main__":
+    if "--force" not in sys.argv[1:] and cached_token_is_valid():
+        print("SIGNATE token is still valid. Skip refreshing.")
+        sys.exit(0)
     email = os.environ.get("SIGNATE_EMAIL")
     password = os.environ.get("SIGNATE_PASSWORD")
     if not email or not password:
@@ -60,6 +111,7 @@ if __name__ == "__main__":
 
 SUBMIT_WORKFLOW = """\
 name: SIGNATE Train & Submit
+run-name: "SIGNATE Train & Submit ${{ inputs.competition_dir }} ${{ inputs.dispatch_id }}"
 
 on:
   workflow_dispatch:
@@ -72,64 +124,86 @@ on:
         description: "Submission memo"
         required: false
         default: "GitHub Actions submission"
+      download_workers:
+        description: "Number of parallel file downloads"
+        required: false
+        default: "__DOWNLOAD_WORKERS__"
+      dispatch_id:
+        description: "Set by signate-deploy --wait to find this run"
+        required: false
+        default: ""
+      on_duplicate:
+        description: "If submission.csv was already submitted (same SHA-256 in submissions.jsonl): skip or warn"
+        required: false
+        default: "skip"
 
 jobs:
   submit:
     runs-on: ubuntu-latest
+    permissions:
+      # contents: write は提出の台帳（submissions.jsonl）をコミットするため
+      contents: write
+      actions: read
     steps:
       - uses: actions/checkout@v4
 
       - uses: actions/setup-python@v5
+        id: setup-python
         with:
           python-version: "3.12"
 
-      - name: Install dependencies
-        run: |
-          pip install signate requests
-          if [ -f "${{ inputs.competition_dir }}/requirements.txt" ]; then
-            pip install -r "${{ inputs.competition_dir }}/requirements.txt"
-          else
-            pip install pandas numpy scikit-learn lightgbm
-          fi
-
+__INSTALL_STEPS__
+__TOKEN_CACHE_STEP__
       - name: Refresh SIGNATE token
         env:
           SIGNATE_EMAIL: ${{ secrets.SIGNATE_EMAIL }}
           SIGNATE_PASSWORD: ${{ secrets.SIGNATE_PASSWORD }}
         run: python scripts/refresh_signate_token.py
 
-      - name: Download data
+__DATA_CACHE_STEP__
+      - name: Find data artifact from download workflow
+        id: data-artifact
+__DATA_CACHE_IF__
+        env:
+          GH_TOKEN: ${{ github.token }}
         run: |
-          python - <<'EOF'
-          import json, subprocess, os
-          config = json.load(open("${{ inputs.competition_dir }}/signate-config.json"))
-          task_key = config["task_key"]
-          os.makedirs("${{ inputs.competition_dir }}/data", exist_ok=True)
-          os.chdir("${{ inputs.competition_dir }}/data")
-          for file_key in config.get("file_keys", {}).values():
-              subprocess.run(
-                  ["signate", "download", "--task_key", task_key, "--file_key", file_key],
-                  check=True,
-              )
-          EOF
+          run_id=$(gh api "repos/${{ github.repository }}/actions/artifacts?name=signate-data-${{ inputs.competition_dir }}&per_page=10" \\
+            --jq '[.artifacts[] | select(.expired | not)][0].workflow_run.id // empty' || true)
+          echo "run_id=$run_id" >> "$GITHUB_OUTPUT"
 
+      - name: Restore data artifact
+        if: steps.data-artifact.outputs.run_id != ''
+        uses: actions/download-artifact@v4
+        with:
+          name: signate-data-${{ inputs.competition_dir }}
+          path: ${{ inputs.competition_dir }}/data
+          run-id: ${{ steps.data-artifact.outputs.run_id }}
+          github-token: ${{ github.token }}
+
+      - name: Download data
+__DATA_CACHE_IF__
+        run: >-
+          python -m signate_deploy.data_download "${{ inputs.competition_dir }}"
+          --workers "${{ inputs.download_workers }}"
+
+__CONVERT_STEP__
+__FEATURE_CACHE_STEP__
+__MODEL_CACHE_STEP__
       - name: Train and predict
         env:
           WANDB_API_KEY: ${{ secrets.WANDB_API_KEY }}
         run: python "${{ inputs.competition_dir }}/train.py"
 
+      - name: Validate submission
+        run: signate-deploy validate "${{ inputs.competition_dir }}"
+
       - name: Submit
-        run: |
-          python - <<'EOF'
-          import json, subprocess
-          config = json.load(open("${{ inputs.competition_dir }}/signate-config.json"))
-          subprocess.run([
-              "signate", "submit",
-              "${{ inputs.competition_dir }}/submission.csv",
-              "--task_key", config["task_key"],
-              "--memo", "${{ inputs.memo }}",
-          ], check=True)
-          EOF
+        id: submit
+        env:
+          MEMO: ${{ inputs.memo }}
+        run: >-
+          python -m signate_deploy.ledger "${{ inputs.competition_dir }}"
+          --memo "$MEMO" --on-duplicate "${{ inputs.on_duplicate }}"
 
       - name: Upload submission as artifact
         uses: actions/upload-artifact@v4
@@ -137,10 +211,13 @@ jobs:
           name: submission-${{ github.run_number }}
           path: ${{ inputs.competition_dir }}/submission.csv
           retention-days: 90
+
+__LEDGER_COMMIT_STEP__
 """
 
 DOWNLOAD_WORKFLOW = """\
 name: SIGNATE Download Data
+run-name: "SIGNATE Download Data ${{ inputs.competition_dir }} ${{ inputs.dispatch_id }}"
 
 on:
   workflow_dispatch:
@@ -149,6 +226,14 @@ on:
         description: "Competition directory name"
         required: true
         type: string
+      download_workers:
+        description: "Number of parallel file downloads"
+        required: false
+        default: "__DOWNLOAD_WORKERS__"
+      dispatch_id:
+        description: "Set by signate-deploy --wait to find this run"
+        required: false
+        default: ""
 
 jobs:
   download:
@@ -161,30 +246,23 @@ jobs:
           python-version: "3.12"
 
       - name: Install signate
-        run: pip install signate requests
+        run: pip install __TOOL_PACKAGES__
 
+__TOKEN_CACHE_STEP__
       - name: Refresh SIGNATE token
         env:
           SIGNATE_EMAIL: ${{ secrets.SIGNATE_EMAIL }}
           SIGNATE_PASSWORD: ${{ secrets.SIGNATE_PASSWORD }}
         run: python scripts/refresh_signate_token.py
 
+__DATA_CACHE_STEP__
       - name: Download data
-        run: |
-          python - <<'EOF'
-          import json, subprocess, os
-          config = json.load(open("${{ inputs.competition_dir }}/signate-config.json"))
-          task_key = config["task_key"]
-          os.makedirs("${{ inputs.competition_dir }}/data", exist_ok=True)
-          os.chdir("${{ inputs.competition_dir }}/data")
-          for name, file_key in config.get("file_keys", {}).items():
-              print(f"Downloading {name}...")
-              subprocess.run(
-                  ["signate", "download", "--task_key", task_key, "--file_key", file_key],
-                  check=True,
-              )
-          EOF
+__DATA_CACHE_IF__
+        run: >-
+          python -m signate_deploy.data_download "${{ inputs.competition_dir }}"
+          --workers "${{ inputs.download_workers }}"
 
+__CONVERT_STEP__
       - name: Upload data as artifact
         uses: actions/upload-artifact@v4
         with:
@@ -193,6 +271,563 @@ jobs:
           retention-days: 90
 """
 
+SUBMIT_MATRIX_WORKFLOW = """\
+name: SIGNATE Train & Submit (matrix)
+run-name: "SIGNATE Train & Submit (matrix) ${{ inputs.dispatch_id }}"
+
+on:
+  workflow_dispatch:
+    inputs:
+      experiments:
+        description: 'JSON list of {"competition_dir", "config", "memo"}'
+        required: true
+        type: string
+      competition_dirs:
+        description: "JSON list of competition directories (data is downloaded once per directory)"
+        required: true
+        type: string
+      max_parallel:
+        description: "Max concurrent train & submit jobs"
+        required: false
+        default: "__MAX_PARALLEL__"
+      download_workers:
+        description: "Number of parallel file downloads"
+        required: false
+        default: "__DOWNLOAD_WORKERS__"
+      dispatch_id:
+        description: "Set by signate-deploy --wait to find this run"
+        required: false
+        default: ""
+      on_duplicate:
+        description: "If submission.csv was already submitted (same SHA-256 in submissions.jsonl): skip or warn"
+        required: false
+        default: "skip"
+
+jobs:
+  data:
+    runs-on: ubuntu-latest
+    strategy:
+      matrix:
+        competition_dir: ${{ fromJSON(inputs.competition_dirs) }}
+    steps:
+      - uses: actions/checkout@v4
+
+      - uses: actions/setup-python@v5
+        with:
+          python-version: "3.12"
+
+      - name: Install signate
+        run: pip install __TOOL_PACKAGES__
+
+__TOKEN_CACHE_STEP__
+      - name: Refresh SIGNATE token
+        env:
+          SIGNATE_EMAIL: ${{ secrets.SIGNATE_EMAIL }}
+          SIGNATE_PASSWORD: ${{ secrets.SIGNATE_PASSWORD }}
+        run: python scripts/refresh_signate_token.py
+
+__DATA_CACHE_STEP__
+      - name: Download data
+__DATA_CACHE_IF__
+        run: >-
+          python -m signate_deploy.data_download "${{ matrix.competition_dir }}"
+          --workers "${{ inputs.download_workers }}"
+
+__CONVERT_STEP__
+      - name: Share data with submit jobs
+        uses: actions/upload-artifact@v4
+        with:
+          name: matrix-data-${{ matrix.competition_dir }}
+          path: ${{ matrix.competition_dir }}/data/
+          retention-days: 1
+
+  submit:
+    needs: data
+    runs-on: ubuntu-latest
+    permissions:
+      contents: write
+    strategy:
+      fail-fast: false
+      max-parallel: ${{ fromJSON(inputs.max_parallel) }}
+      matrix:
+        include: ${{ fromJSON(inputs.experiments) }}
+    steps:
+      - uses: actions/checkout@v4
+
+      - uses: actions/setup-python@v5
+        id: setup-python
+        with:
+          python-version: "3.12"
+
+__INSTALL_STEPS__
+__TOKEN_CACHE_STEP__
+      - name: Refresh SIGNATE token
+        env:
+          SIGNATE_EMAIL: ${{ secrets.SIGNATE_EMAIL }}
+          SIGNATE_PASSWORD: ${{ secrets.SIGNATE_PASSWORD }}
+        run: python scripts/refresh_signate_token.py
+
+      - name: Restore data
+        uses: actions/download-artifact@v4
+        with:
+          name: matrix-data-${{ matrix.competition_dir }}
+          path: ${{ matrix.competition_dir }}/data
+
+__FEATURE_CACHE_STEP__
+__MODEL_CACHE_STEP__
+      - name: Train and predict
+        env:
+          WANDB_API_KEY: ${{ secrets.WANDB_API_KEY }}
+          EXPERIMENT_CONFIG: ${{ matrix.config }}
+        run: python "${{ matrix.competition_dir }}/train.py"
+
+      - name: Validate submission
+        run: signate-deploy validate "${{ matrix.competition_dir }}"
+
+      - name: Submit
+        id: submit
+        env:
+          MEMO: ${{ matrix.memo }}
+        run: >-
+          python -m signate_deploy.ledger "${{ matrix.competition_dir }}"
+          --memo "$MEMO" --on-duplicate "${{ inputs.on_duplicate }}"
+
+      - name: Upload submission as artifact
+        uses: actions/upload-artifact@v4
+        with:
+          name: submission-${{ github.run_number }}-${{ strategy.job-index }}
+          path: ${{ matrix.competition_dir }}/submission.csv
+          retention-days: 90
+
+__LEDGER_COMMIT_STEP__
+"""
+
+# fold（×seed）ごとに別ランナーで学習し、最後のジョブで予測を集計して提出する
+SUBMIT_SHARDED_WORKFLOW = """\
+name: SIGNATE Train & Submit (fold-sharded)
+run-name: "SIGNATE Train & Submit (fold-sharded) ${{ inputs.competition_dir }} ${{ inputs.dispatch_id }}"
+
+on:
+  workflow_dispatch:
+    inputs:
+      competition_dir:
+        description: "Competition directory name"
+        required: true
+        type: string
+      memo:
+        description: "Submission memo"
+        required: false
+        default: "GitHub Actions submission"
+      folds:
+        description: "JSON list of folds to train (must cover N_SPLITS in train.py)"
+        required: false
+        default: "[0, 1, 2, 3, 4]"
+      seeds:
+        description: "JSON list of LightGBM seeds (each fold is trained once per seed)"
+        required: false
+        default: "[42]"
+      config:
+        description: "Experiment config JSON passed to train.py as EXPERIMENT_CONFIG"
+        required: false
+        default: ""
+      max_parallel:
+        description: "Max concurrent fold jobs"
+        required: false
+        default: "__MAX_PARALLEL__"
+      download_workers:
+        description: "Number of parallel file downloads"
+        required: false
+        default: "__DOWNLOAD_WORKERS__"
+      dispatch_id:
+        description: "Set by signate-deploy --wait to find this run"
+        required: false
+        default: ""
+      on_duplicate:
+        description: "If submission.csv was already submitted (same SHA-256 in submissions.jsonl): skip or warn"
+        required: false
+        default: "skip"
+
+jobs:
+  data:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+
+      - uses: actions/setup-python@v5
+        with:
+          python-version: "3.12"
+
+      - name: Install signate
+        run: pip install __TOOL_PACKAGES__
+
+__TOKEN_CACHE_STEP__
+      - name: Refresh SIGNATE token
+        env:
+          SIGNATE_EMAIL: ${{ secrets.SIGNATE_EMAIL }}
+          SIGNATE_PASSWORD: ${{ secrets.SIGNATE_PASSWORD }}
+        run: python scripts/refresh_signate_token.py
+
+__DATA_CACHE_STEP__
+      - name: Download data
+__DATA_CACHE_IF__
+        run: >-
+          python -m signate_deploy.data_download "${{ inputs.competition_dir }}"
+          --workers "${{ inputs.download_workers }}"
+
+__CONVERT_STEP__
+      - name: Share data with fold jobs
+        uses: actions/upload-artifact@v4
+        with:
+          name: shard-data
+          path: ${{ inputs.competition_dir }}/data/
+          retention-days: 1
+
+  train:
+    needs: data
+    runs-on: ubuntu-latest
+    strategy:
+      # 1つでも fold が欠けると集計できないので、残りのジョブも止める
+      fail-fast: true
+      max-parallel: ${{ fromJSON(inputs.max_parallel) }}
+      matrix:
+        fold: ${{ fromJSON(inputs.folds) }}
+        seed: ${{ fromJSON(inputs.seeds) }}
+    steps:
+      - uses: actions/checkout@v4
+
+      - uses: actions/setup-python@v5
+        id: setup-python
+        with:
+          python-version: "3.12"
+
+__INSTALL_STEPS__
+      - name: Restore data
+        uses: actions/download-artifact@v4
+        with:
+          name: shard-data
+          path: ${{ inputs.competition_dir }}/data
+
+__FEATURE_CACHE_STEP__
+__MODEL_CACHE_STEP__
+      - name: Train fold
+        env:
+          WANDB_API_KEY: ${{ secrets.WANDB_API_KEY }}
+          EXPERIMENT_CONFIG: ${{ inputs.config }}
+        run: >-
+          python "${{ inputs.competition_dir }}/train.py"
+          --fold "${{ matrix.fold }}" --seed "${{ matrix.seed }}" --out shards
+
+      - name: Upload fold predictions
+        uses: actions/upload-artifact@v4
+        with:
+          name: shard-fold${{ matrix.fold }}-seed${{ matrix.seed }}
+          path: shards/
+          retention-days: 1
+
+  merge:
+    needs: train
+    runs-on: ubuntu-latest
+    permissions:
+      contents: write
+    steps:
+      - uses: actions/checkout@v4
+
+      - uses: actions/setup-python@v5
+        id: setup-python
+        with:
+          python-version: "3.12"
+
+__INSTALL_STEPS__
+__TOKEN_CACHE_STEP__
+      - name: Refresh SIGNATE token
+        env:
+          SIGNATE_EMAIL: ${{ secrets.SIGNATE_EMAIL }}
+          SIGNATE_PASSWORD: ${{ secrets.SIGNATE_PASSWORD }}
+        run: python scripts/refresh_signate_token.py
+
+      - name: Download fold predictions
+        uses: actions/download-artifact@v4
+        with:
+          pattern: shard-fold*
+          path: shards
+          merge-multiple: true
+
+      # Validate submission が sample_submit / test と照合するのに使う
+      - name: Restore data
+        uses: actions/download-artifact@v4
+        with:
+          name: shard-data
+          path: ${{ inputs.competition_dir }}/data
+
+      - name: Merge folds and compute CV
+        run: python "${{ inputs.competition_dir }}/train.py" --merge shards
+
+      - name: Validate submission
+        run: signate-deploy validate "${{ inputs.competition_dir }}"
+
+      - name: Submit
+        id: submit
+        env:
+          MEMO: ${{ inputs.memo }}
+        run: >-
+          python -m signate_deploy.ledger "${{ inputs.competition_dir }}"
+          --memo "$MEMO" --on-duplicate "${{ inputs.on_duplicate }}"
+
+      - name: Upload submission as artifact
+        uses: actions/upload-artifact@v4
+        with:
+          name: submission-${{ github.run_number }}
+          path: ${{ inputs.competition_dir }}/submission.csv
+          retention-days: 90
+
+__LEDGER_COMMIT_STEP__
+"""
+
+# 提出したら台帳をコミットしてプッシュする. matrix の並列ジョブと競合したら取り込み直して再試行する
+# （.gitattributes の merge=union で追記どうしはマージされる）. 前のステップが書き換えた
+# signate-manifest.json などは --autostash で退避する. プッシュできなければ次回の重複検出が
+# 効かなくなるので、ジョブを失敗させる（提出ファイルのアップロードは済ませておく）
+LEDGER_COMMIT_STEP = """\
+      - name: Commit submission ledger
+        if: steps.submit.outputs.recorded == 'true'
+        env:
+          LEDGER: ${{ inputs.competition_dir }}/submissions.jsonl
+        run: |
+          git config user.name "github-actions[bot]"
+          git config user.email "41898282+github-actions[bot]@users.noreply.github.com"
+          git add "$LEDGER"
+          git commit --quiet -m "Record submission ${{ github.run_id }}"
+          for attempt in 1 2 3 4 5; do
+            git pull --rebase --autostash --quiet && git push --quiet && exit 0
+            sleep $((attempt * 5))
+          done
+          echo "::error::$LEDGER をプッシュできませんでした（提出は済んでいます）"
+          exit 1
+"""
+
+# signate-config.json（task_key / file_keys）が変わらない限りデータを再ダウンロードしない
+DATA_CACHE_STEP = """\
+      - name: Restore data cache
+        id: data-cache
+        uses: actions/cache@v4
+        with:
+          path: ${{ inputs.competition_dir }}/data
+          key: signate-data-${{ inputs.competition_dir }}-${{ hashFiles(format('{0}/signate-config.json', inputs.competition_dir)) }}
+
+"""
+
+# 前回の実行で取得したトークンを復元する（有効期限内なら refresh_signate_token.py が再取得を省く）
+TOKEN_CACHE_STEP = """\
+      - name: Restore SIGNATE token cache
+        uses: actions/cache@v4
+        with:
+          path: ~/.signate/signate.json
+          key: signate-token-${{ github.run_id }}-${{ github.run_attempt }}-${{ github.job }}-${{ strategy.job-index }}
+          restore-keys: |
+            signate-token-
+
+"""
+
+DATA_CACHE_IF = """\
+        if: steps.data-cache.outputs.cache-hit != 'true'
+"""
+
+# train.py・signate-config.json（= データ）が変わらない限り同じキャッシュを使う
+CACHE_INPUTS = [
+    "format('{0}/train.py', inputs.competition_dir)",
+    "format('{0}/signate-config.json', inputs.competition_dir)",
+]
+
+
+def _hash_files(patterns: list[str]) -> str:
+    return "${{ hashFiles(" + ", ".join(patterns) + ") }}"
+
+
+CACHE_INPUTS_HASH = _hash_files(CACHE_INPUTS)
+
+# train.py の FeatureCache の保存先を実行間で引き継ぐ（中身のサイズは FeatureCache が LRU で抑える）.
+# 入力が同じ実行はキーが一致して保存を省く. 変わったら restore-keys で前回分を復元して使える特徴量は使う
+FEATURE_CACHE_STEP = """\
+      - name: Restore feature cache
+        uses: actions/cache@v4
+        with:
+          path: ${{ inputs.competition_dir }}/.feature-cache
+          key: features-${{ inputs.competition_dir }}-__CACHE_INPUTS_HASH__
+          restore-keys: |
+            features-${{ inputs.competition_dir }}-
+
+""".replace("__CACHE_INPUTS_HASH__", CACHE_INPUTS_HASH)
+
+# train.py の fold モデルのキャッシュ（.model-cache）を実行間で引き継ぐ. 条件が同じ fold は学習し直さない.
+# matrix のジョブごと（実験・fold×seed）に学習するモデルが違うのでジョブをキーに含め、
+# 実験設定（EXPERIMENT_CONFIG）のあるワークフローではその内容もハッシュに含める
+MODEL_CACHE_STEP = """\
+      - name: Restore model cache
+        uses: actions/cache@v4
+        with:
+          path: ${{ inputs.competition_dir }}/.model-cache
+          key: models-${{ inputs.competition_dir }}-__MODEL_CACHE_JOB__-__MODEL_CACHE_INPUTS_HASH__
+          restore-keys: |
+            models-${{ inputs.competition_dir }}-__MODEL_CACHE_JOB__-
+            models-${{ inputs.competition_dir }}-
+
+"""
+
+# zip を展開し CSV を Parquet/Feather に変換する（データキャッシュがあれば変換済み）
+CONVERT_STEP = """\
+      - name: Convert data
+__DATA_CACHE_IF__
+        run: |
+          pip install pandas pyarrow
+          python -m signate_deploy.convert "${{ inputs.competition_dir }}/data" --format __CONVERT_FORMAT__
+
+"""
+
+CONVERT_FORMATS = ["none", "parquet", "feather", "npy"]
+
+# requirements.txt・Python バージョン・ワークフロー自体が変わったら依存関係を入れ直す
+DEPENDENCY_CACHE_KEY = (
+    "${{ runner.os }}-py${{ steps.setup-python.outputs.python-version }}-"
+    "${{ hashFiles(format('{0}/requirements.txt', inputs.competition_dir), "
+    "'.github/workflows/signate-submit*.yml') }}"
+)
+
+INSTALL_DEPENDENCIES_STEP = """\
+      - name: Install dependencies
+__VENV_CACHE_IF__
+        run: |
+          __PIP__ install __TOOL_PACKAGES__
+          if [ -f "${{ inputs.competition_dir }}/requirements.txt" ]; then
+            __PIP__ install -r "${{ inputs.competition_dir }}/requirements.txt"
+          else
+            __PIP__ install pandas numpy scikit-learn lightgbm
+          fi
+
+"""
+
+SETUP_UV_STEP = """\
+      - uses: astral-sh/setup-uv@v5
+        with:
+          enable-cache: __UV_CACHE__
+          cache-dependency-glob: "${{ inputs.competition_dir }}/requirements.txt"
+
+"""
+
+PIP_CACHE_STEP = """\
+      - name: Restore pip download cache
+        uses: actions/cache@v4
+        with:
+          path: ~/.cache/pip
+          key: pip-__DEPENDENCY_CACHE_KEY__
+          restore-keys: |
+            pip-${{ runner.os }}-py${{ steps.setup-python.outputs.python-version }}-
+
+"""
+
+VENV_CACHE_STEP = """\
+      - name: Restore virtualenv cache
+        id: venv-cache
+        uses: actions/cache@v4
+        with:
+          path: .venv
+          key: venv-__DEPENDENCY_CACHE_KEY__
+
+"""
+
+VENV_SETUP_STEP = """\
+      - name: Set up virtualenv
+        run: |
+          [ -d .venv ] || python -m venv .venv
+          echo "$PWD/.venv/bin" >> "$GITHUB_PATH"
+          echo "VIRTUAL_ENV=$PWD/.venv" >> "$GITHUB_ENV"
+
+"""
+
+VENV_CACHE_IF = """\
+        if: steps.venv-cache.outputs.cache-hit != 'true'
+"""
+
+INSTALLERS = ["pip", "uv"]
+
+
+def _install_steps(installer: str, dependency_cache: bool) -> str:
+    """依存関係インストール部分のステップを組み立てる."""
+    steps = ""
+    if installer == "uv":
+        steps += SETUP_UV_STEP.replace("__UV_CACHE__", "true" if dependency_cache else "false")
+    elif dependency_cache:
+        steps += PIP_CACHE_STEP
+    if dependency_cache:
+        steps += VENV_CACHE_STEP
+    if installer == "uv" or dependency_cache:
+        steps += VENV_SETUP_STEP
+    steps += INSTALL_DEPENDENCIES_STEP.replace(
+        "__VENV_CACHE_IF__\n", VENV_CACHE_IF if dependency_cache else ""
+    ).replace("__PIP__", "uv pip" if installer == "uv" else "pip")
+    return steps.replace("__DEPENDENCY_CACHE_KEY__", DEPENDENCY_CACHE_KEY)
+
+
+# ワークフローが呼ぶモジュール（data_download / ledger など）がこの CLI と揃うよう、生成時の版に固定する
+TOOL_PACKAGES = f"signate==0.13.1 requests==2.34.2 signate-deploy=={__version__}"
+
+DEFAULT_DOWNLOAD_WORKERS = 4
+DEFAULT_MAX_PARALLEL = 2
+
+
+def render_workflow(
+    template: str,
+    download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+    data_cache: bool = True,
+    installer: str = "pip",
+    dependency_cache: bool = True,
+    max_parallel: int = DEFAULT_MAX_PARALLEL,
+    token_cache: bool = False,
+    convert: str = "none",
+    feature_cache: bool = True,
+    model_cache: bool = True,
+) -> str:
+    """ワークフローテンプレートのプレースホルダを埋める.
+
+    コンペディレクトリを matrix で回すテンプレートでは、共通ステップ中の
+    inputs.competition_dir を matrix.competition_dir に読み替える。
+    """
+    dir_expr = "matrix.competition_dir" if "matrix.competition_dir" in template else "inputs.competition_dir"
+
+    def snippet(text: str) -> str:
+        return text.replace("inputs.competition_dir", dir_expr)
+
+    model_cache_inputs = CACHE_INPUTS
+    config_expr = next((expr for expr in ["matrix.config", "inputs.config"] if expr in template), None)
+    if config_expr:
+        # 実験設定がなければ（空文字）既にある入力を渡して hashFiles に空のパターンを渡さない
+        model_cache_inputs = CACHE_INPUTS + [f"{config_expr} || {CACHE_INPUTS[1]}"]
+    # fold 分割ワークフローは seed の数で job-index の割り当てが変わるので fold・seed で区別する
+    job = "fold${{ matrix.fold }}-seed${{ matrix.seed }}" if "matrix.fold" in template else "${{ strategy.job-index }}"
+    model_cache_step = MODEL_CACHE_STEP.replace("__MODEL_CACHE_JOB__", job).replace(
+        "__MODEL_CACHE_INPUTS_HASH__", _hash_files(model_cache_inputs)
+    )
+
+    convert_step = ""
+    data_cache_step = DATA_CACHE_STEP
+    if convert != "none":
+        convert_step = CONVERT_STEP.replace("__CONVERT_FORMAT__", convert)
+        # 変換前のキャッシュ（CSV のみ）を変換済みとして復元しないよう、形式をキーに含める
+        data_cache_step = data_cache_step.replace("key: signate-data-", f"key: signate-data-{convert}-")
+    return (
+        template.replace("__CONVERT_STEP__\n", snippet(convert_step))
+        .replace("__FEATURE_CACHE_STEP__\n", snippet(FEATURE_CACHE_STEP) if feature_cache else "")
+        .replace("__MODEL_CACHE_STEP__\n", snippet(model_cache_step) if model_cache else "")
+        .replace("__LEDGER_COMMIT_STEP__\n", snippet(LEDGER_COMMIT_STEP))
+        .replace("__INSTALL_STEPS__\n", snippet(_install_steps(installer, dependency_cache)))
+        .replace("__TOOL_PACKAGES__", TOOL_PACKAGES)
+        .replace("__DOWNLOAD_WORKERS__", str(download_workers))
+        .replace("__MAX_PARALLEL__", str(max_parallel))
+        .replace("__DATA_CACHE_STEP__\n", snippet(data_cache_step) if data_cache else "")
+        .replace("__DATA_CACHE_IF__\n", DATA_CACHE_IF if data_cache else "")
+        .replace("__TOKEN_CACHE_STEP__\n", TOKEN_CACHE_STEP if token_cache else "")
+    )
+
+
 GITIGNORE_ADDITIONS = """\
 # === signate-deploy ===
 # Data files
@@ -200,6 +835,12 @@ data/
 *.csv
 *.zip
 
+# Feature / fold model caches, CV score and submission ledger index (train.py / submit)
+.feature-cache/
+.model-cache/
+cv-score.json
+.submissions-index.sqlite
+
 # Credentials (NEVER commit these)
 .signate/
 signate.json
@@ -209,32 +850,133 @@ signate.json
 venv/
 """
 
+# 提出の台帳は追記のみなので、並列ジョブからの追記は両方残すマージでよい
+GITATTRIBUTES_ADDITIONS = """\
+# === signate-deploy ===
+submissions.jsonl merge=union
+"""
+
 
 @click.command("init-repo")
 @click.option("--force", "-f", is_flag=True, default=False, help="既存ファイルを上書きする")
-def init_repo(force):
+@click.option(
+    "--download-workers",
+    type=click.IntRange(min=1),
+    default=DEFAULT_DOWNLOAD_WORKERS,
+    show_default=True,
+    help="ワークフローでの同時ダウンロード数の既定値",
+)
+@click.option(
+    "--data-cache/--no-data-cache",
+    default=True,
+    show_default=True,
+    help="ダウンロードしたデータを actions/cache で再利用する",
+)
+@click.option(
+    "--installer",
+    type=click.Choice(INSTALLERS),
+    default="pip",
+    show_default=True,
+    help="依存関係のインストーラ（uv は高速）",
+)
+@click.option(
+    "--dependency-cache/--no-dependency-cache",
+    default=True,
+    show_default=True,
+    help="pip/uv のダウンロードと virtualenv をキャッシュする",
+)
+@click.option(
+    "--max-parallel",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_PARALLEL,
+    show_default=True,
+    help="matrix提出ワークフローで同時に走らせる学習・提出ジョブ数の既定値",
+)
+@click.option(
+    "--token-cache/--no-token-cache",
+    default=False,
+    show_default=True,
+    help="SIGNATEトークンを actions/cache で実行間に引き継ぐ（キャッシュを読めるワークフローからトークンが見える点に注意）",
+)
+@click.option(
+    "--convert",
+    type=click.Choice(CONVERT_FORMATS),
+    default="none",
+    show_default=True,
+    help="ダウンロード後に zip を展開し CSV を Parquet/Feather/列ごとの .npy（init --template mmap 用）に変換する",
+)
+@click.option(
+    "--feature-cache/--no-feature-cache",
+    default=True,
+    show_default=True,
+    help="train.py の特徴量キャッシュ（.feature-cache）を actions/cache で実行間に引き継ぐ",
+)
+@click.option(
+    "--model-cache/--no-model-cache",
+    default=True,
+    show_default=True,
+    help="train.py の fold モデルのキャッシュ（.model-cache）を actions/cache で実行間に引き継ぐ",
+)
+@click.option(
+    "--sharded/--no-sharded",
+    default=False,
+    show_default=True,
+    help="fold（×seed）ごとに別ジョブで学習して集計・提出するワークフローも生成する（submit --sharded で起動）",
+)
+def init_repo(
+    force,
+    download_workers,
+    data_cache,
+    installer,
+    dependency_cache,
+    max_parallel,
+    token_cache,
+    convert,
+    feature_cache,
+    model_cache,
+    sharded,
+):
     """リポジトリにGitHub Actionsワークフローと.gitignoreをセットアップする.
 
     カレントディレクトリに以下を生成します:
     - .github/workflows/signate-submit.yml
     - .github/workflows/signate-download.yml
+    - .github/workflows/signate-submit-matrix.yml
+    - .github/workflows/signate-submit-sharded.yml（--sharded 指定時）
     - scripts/refresh_signate_token.py
-    - .gitignore への追記
+    - .gitignore / .gitattributes への追記
     """
     created = []
 
     workflow_dir = Path(".github/workflows")
     workflow_dir.mkdir(parents=True, exist_ok=True)
 
-    for filename, content in [
+    workflows = [
         ("signate-submit.yml", SUBMIT_WORKFLOW),
         ("signate-download.yml", DOWNLOAD_WORKFLOW),
-    ]:
+        ("signate-submit-matrix.yml", SUBMIT_MATRIX_WORKFLOW),
+    ]
+    if sharded:
+        workflows.append(("signate-submit-sharded.yml", SUBMIT_SHARDED_WORKFLOW))
+    for filename, content in workflows:
         path = workflow_dir / filename
         if path.exists() and not force:
             click.echo(f"  Skip: {path} (既に存在。--force で上書き)")
         else:
-            path.write_text(content)
+            path.write_text(
+                render_workflow(
+                    content,
+                    download_workers=download_workers,
+                    data_cache=data_cache,
+                    installer=installer,
+                    dependency_cache=dependency_cache,
+                    max_parallel=max_parallel,
+                    token_cache=token_cache,
+                    convert=convert,
+                    feature_cache=feature_cache,
+                    model_cache=model_cache,
+                )
+            )
             created.append(str(path))
             click.echo(f"  Created: {path}")
 
@@ -249,23 +991,23 @@ def init_repo(force):
         created.append(str(refresh_script_path))
         click.echo(f"  Created: {refresh_script_path}")
 
-    # .gitignore
-    gitignore_path = Path(".gitignore")
+    # .gitignore / .gitattributes
     marker = "# === signate-deploy ==="
-    if gitignore_path.exists():
-        existing = gitignore_path.read_text()
-        if marker in existing and not force:
-            click.echo(f"  Skip: {gitignore_path} (signate-deployセクション追加済み)")
+    for path, additions in [(Path(".gitignore"), GITIGNORE_ADDITIONS), (Path(".gitattributes"), GITATTRIBUTES_ADDITIONS)]:
+        if path.exists():
+            existing = path.read_text()
+            if marker in existing and not force:
+                click.echo(f"  Skip: {path} (signate-deployセクション追加済み)")
+            else:
+                if marker not in existing:
+                    with open(path, "a") as f:
+                        f.write("\n" + additions)
+                    created.append(f"{path} (追記)")
+                    click.echo(f"  Updated: {path}")
         else:
-            if marker not in existing:
-                with open(gitignore_path, "a") as f:
-                    f.write("\n" + GITIGNORE_ADDITIONS)
-                created.append(f"{gitignore_path} (追記)")
-                click.echo(f"  Updated: {gitignore_path}")
-    else:
-        gitignore_path.write_text(GITIGNORE_ADDITIONS)
-        created.append(str(gitignore_path))
-        click.echo(f"  Created: {gitignore_path}")
+            path.write_text(additions)
+            created.append(str(path))
+            click.echo(f"  Created: {path}")
 
     click.echo("")
     if created:
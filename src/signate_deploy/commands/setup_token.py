@@ -10,9 +10,9 @@ import click
 from signate_deploy.signate_cli import find_signate_exe
 
 
-def _run_signate_token(email: str) -> bool:
+def _run_signate_token(email: str, use_cache: bool = True) -> bool:
     """signate token コマンドをインタラクティブに実行してトークンを取得する."""
-    signate_exe = find_signate_exe()
+    signate_exe = find_signate_exe(use_cache=use_cache)
     if signate_exe is None:
         click.echo("Error: signate CLIが見つかりません。pip install signate を実行してください。", err=True)
         return False
@@ -55,7 +55,8 @@ def _set_github_secret(secret_value: str) -> bool:
 @click.command("setup-token")
 @click.option("--email", required=True, prompt="SIGNATE email", help="SIGNATEのメールアドレス")
 @click.option("--set-secret", is_flag=True, default=False, help="GitHub Secretsに自動設定する")
-def setup_token(email, set_secret):
+@click.option("--no-cache", is_flag=True, default=False, help="signate CLIの探索キャッシュを使わない")
+def setup_token(email, set_secret, no_cache):
     """SIGNATEトークンを取得してBase64エンコードする.
 
     signate CLIがパスワードを対話的に入力を求めます。
@@ -75,7 +76,7 @@ def setup_token(email, set_secret):
 
     # トークン取得（パスワードはsignate CLIが対話的に入力を求める）
     click.echo("SIGNATEトークンを取得中...")
-    if not _run_signate_token(email):
+    if not _run_signate_token(email, use_cache=not no_cache):
         raise SystemExit(1)
     click.echo("  トークン取得成功")
 
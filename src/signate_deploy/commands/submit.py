@@ -1,48 +1,202 @@
 """signate-deploy submit: GitHub Actions経由でSIGNATEに提出する."""
 
+import json
 import subprocess
+from collections import Counter
 from pathlib import Path
 
 import click
 
+from signate_deploy.github import GitHubClient, GitHubError, client_from_env, new_dispatch_id, wait_for_dispatch
 
-@click.command("submit")
-@click.argument("competition_dir")
-@click.option("--memo", "-m", default="GitHub Actions submission", help="提出メモ")
-def submit(competition_dir, memo):
-    """GitHub Actions経由でSIGNATEに提出する.
 
-    COMPETITION_DIR 内の signate-config.json を使い、
-    GitHub Actions の signate-submit.yml を起動します。
+def _parse_experiment(spec: str) -> tuple[str, str]:
+    """'DIR' または 'DIR:CONFIG' を (competition_dir, config) に分解する."""
+    competition_dir, _, config = spec.partition(":")
+    return competition_dir, config
 
-    例:
-      signate-deploy submit my-comp
-      signate-deploy submit my-comp --memo "LightGBM baseline v1"
-    """
+
+def _check_experiment(competition_dir: str, config: str) -> None:
     config_path = Path(competition_dir) / "signate-config.json"
     if not config_path.exists():
         click.echo(f"Error: {config_path} が見つかりません。", err=True)
         click.echo("signate-deploy init でディレクトリを作成してください。", err=True)
         raise SystemExit(1)
+    if config and not Path(config).exists():
+        click.echo(f"Error: 実験設定ファイル {config} が見つかりません。", err=True)
+        raise SystemExit(1)
 
-    click.echo(f"Triggering submit workflow for '{competition_dir}'...")
-    click.echo(f"  Memo: {memo}")
 
+def _run_workflow(args: list[str]) -> None:
     result = subprocess.run(
-        [
-            "gh", "workflow", "run", "signate-submit.yml",
-            "-f", f"competition_dir={competition_dir}",
-            "-f", f"memo={memo}",
-        ],
+        ["gh", "workflow", "run", *args],
         capture_output=True,
         text=True,
     )
-
     if result.returncode != 0:
         click.echo("Error: gh workflow run に失敗しました。", err=True)
         click.echo(result.stderr, err=True)
         raise SystemExit(1)
 
+
+def wait_for_run(workflow: str, dispatch_id: str) -> tuple[GitHubClient, dict]:
+    """起動した実行の完了を待つ. 成功しなければ終了コード 1 で終了する."""
+    click.echo("")
+    click.echo("Waiting for the run to finish...")
+    try:
+        client = client_from_env()
+        run = wait_for_dispatch(client, workflow, dispatch_id, echo=click.echo)
+    except GitHubError as e:
+        click.echo(f"Error: {e}", err=True)
+        raise SystemExit(1)
+    if run.get("conclusion") != "success":
+        raise SystemExit(1)
+    return client, run
+
+
+@click.command("submit")
+@click.argument("experiments", nargs=-1, required=True, metavar="COMPETITION_DIR[:CONFIG]...")
+@click.option("--memo", "-m", default="GitHub Actions submission", help="提出メモ")
+@click.option(
+    "--max-parallel",
+    type=click.IntRange(min=1),
+    default=None,
+    help="複数提出時（--sharded では fold ジョブ）に同時に走らせるジョブ数（提出回数の上限ではない）",
+)
+@click.option(
+    "--daily-limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help="コンペごとの1日の提出回数の上限. 1回の起動でこれを超える提出をしようとしたら起動せずに終了する",
+)
+@click.option(
+    "--sharded",
+    is_flag=True,
+    default=False,
+    help="fold ごとに別ジョブで学習する signate-submit-sharded.yml で提出する（init-repo --sharded で生成）",
+)
+@click.option(
+    "--seed",
+    "seeds",
+    type=int,
+    multiple=True,
+    help="--sharded で各 fold を学習する LightGBM の seed（複数指定で fold×seed のジョブにする）",
+)
+@click.option(
+    "--wait",
+    is_flag=True,
+    default=False,
+    help="起動した実行の完了まで待ってステップの進捗とログを表示し、結論を終了コードにする",
+)
+@click.option(
+    "--allow-duplicate",
+    is_flag=True,
+    default=False,
+    help="submissions.jsonl に同じ内容（SHA-256）の提出があっても、警告だけして提出する（既定はスキップ）",
+)
+def submit(experiments, memo, max_parallel, sharded, seeds, wait, allow_duplicate, daily_limit):
+    """GitHub Actions経由でSIGNATEに提出する.
+
+    COMPETITION_DIR 内の signate-config.json を使い、
+    GitHub Actions の signate-submit.yml を起動します。
+
+    複数のディレクトリや DIR:CONFIG（CONFIG は train.py に環境変数
+    EXPERIMENT_CONFIG として渡すJSON）を指定すると、signate-submit-matrix.yml を
+    1回だけ起動し、データのダウンロードを共有したまま実験ごとのジョブで提出します。
+
+    --sharded を付けると signate-submit-sharded.yml を起動し、fold（×seed）ごとに
+    別のランナーで学習した予測を最後のジョブで集計して提出します。
+
+    --max-parallel は同時に走るジョブ数を抑えるだけです。提出回数の上限を守るには
+    --daily-limit を指定してください（1つのコンペへの提出数が上限を超えたら起動しません）。
+
+    提出は COMPETITION_DIR/submissions.jsonl（台帳）にコミットされ、
+    同じ内容の submission.csv は再提出せずにスキップします。
+
+    例:
+      signate-deploy submit my-comp
+      signate-deploy submit my-comp --memo "LightGBM baseline v1"
+      signate-deploy submit my-comp:exp/lr01.json my-comp:exp/lr005.json --max-parallel 1
+      signate-deploy submit my-comp:exp/a.json my-comp:exp/b.json --daily-limit 5
+      signate-deploy submit my-comp --sharded --seed 0 --seed 1
+      signate-deploy submit my-comp --wait
+    """
+    parsed = [_parse_experiment(spec) for spec in experiments]
+    for competition_dir, config in parsed:
+        _check_experiment(competition_dir, config)
+    if seeds and not sharded:
+        click.echo("Error: --seed は --sharded と一緒に指定してください。", err=True)
+        raise SystemExit(1)
+    if daily_limit is not None:
+        # 提出は実験ごとに1回（--sharded でも集計ジョブの1回だけ）
+        for competition_dir, count in Counter(d for d, _ in parsed).items():
+            if count > daily_limit:
+                click.echo(
+                    f"Error: '{competition_dir}' への提出が{count}件あり、--daily-limit {daily_limit} を超えています。",
+                    err=True,
+                )
+                raise SystemExit(1)
+
+    if sharded:
+        if len(parsed) != 1:
+            click.echo("Error: --sharded では COMPETITION_DIR[:CONFIG] を1つだけ指定してください。", err=True)
+            raise SystemExit(1)
+        competition_dir, config = parsed[0]
+        click.echo(f"Triggering fold-sharded submit workflow for '{competition_dir}'...")
+        click.echo(f"  Memo: {memo}")
+        args = [
+            "signate-submit-sharded.yml",
+            "-f", f"competition_dir={competition_dir}",
+            "-f", f"memo={memo}",
+        ]
+        if config:
+            args += ["-f", f"config={config}"]
+        if seeds:
+            click.echo(f"  Seeds: {', '.join(map(str, seeds))}")
+            args += ["-f", f"seeds={json.dumps(list(seeds))}"]
+        if max_parallel is not None:
+            args += ["-f", f"max_parallel={max_parallel}"]
+    elif len(parsed) == 1 and not parsed[0][1]:
+        competition_dir = parsed[0][0]
+        click.echo(f"Triggering submit workflow for '{competition_dir}'...")
+        click.echo(f"  Memo: {memo}")
+        args = [
+            "signate-submit.yml",
+            "-f", f"competition_dir={competition_dir}",
+            "-f", f"memo={memo}",
+        ]
+    else:
+        matrix = [
+            {
+                "competition_dir": competition_dir,
+                "config": config,
+                "memo": f"{memo} ({competition_dir}:{config})" if config else f"{memo} ({competition_dir})",
+            }
+            for competition_dir, config in parsed
+        ]
+        competition_dirs = sorted({e["competition_dir"] for e in matrix})
+        click.echo(f"Triggering matrix submit workflow for {len(matrix)} experiment(s)...")
+        for e in matrix:
+            click.echo(f"  - {e['memo']}")
+        args = [
+            "signate-submit-matrix.yml",
+            "-f", f"experiments={json.dumps(matrix, ensure_ascii=False)}",
+            "-f", f"competition_dirs={json.dumps(competition_dirs, ensure_ascii=False)}",
+        ]
+        if max_parallel is not None:
+            args += ["-f", f"max_parallel={max_parallel}"]
+
+    if allow_duplicate:
+        args += ["-f", "on_duplicate=warn"]
+    # --wait では run-name に入る dispatch_id で、起動した実行そのものを探す
+    dispatch_id = new_dispatch_id() if wait else None
+    if dispatch_id:
+        args += ["-f", f"dispatch_id={dispatch_id}"]
+    _run_workflow(args)
+    if dispatch_id:
+        wait_for_run(args[0], dispatch_id)
+        return
+
     click.echo("")
     click.echo("Workflow を起動しました。")
     click.echo("進捗確認: gh run list --limit 1")
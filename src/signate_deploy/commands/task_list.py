@@ -1,27 +1,29 @@
 """signate-deploy task-list: コンペティションのタスク一覧を表示する."""
 
-import subprocess
-import sys
-
 import click
 
-from signate_deploy.signate_cli import find_signate_exe
+from signate_deploy.listings import echo_listing, fetch_listing
 
 
 @click.command("task-list")
 @click.argument("competition_key")
-def task_list(competition_key):
+@click.option("--no-cache", is_flag=True, default=False, help="signate CLIの探索キャッシュを使わない")
+@click.option("--refresh", is_flag=True, default=False, help="一覧キャッシュを無視してSIGNATEから取得し直す")
+@click.option("--offline", is_flag=True, default=False, help="一覧キャッシュのみを参照する（通信しない）")
+@click.option("--json", "as_json", is_flag=True, default=False, help="JSON形式で出力する")
+def task_list(competition_key, no_cache, refresh, offline, as_json):
     """コンペティションのタスク一覧を表示する（task_keyを確認できる）.
 
     COMPETITION_KEY はコンペティションURLの competition= パラメータの値です。
+    結果はローカルにキャッシュされます（24時間）。
 
     例:
       signate-deploy task-list <competition_key>
+      signate-deploy task-list <competition_key> --json
     """
-    signate_exe = find_signate_exe()
-    if signate_exe is None:
-        click.echo("Error: signate CLIが見つかりません。pip install signate を実行してください。", err=True)
+    listing = fetch_listing(
+        "tasks", competition_key, refresh=refresh, offline=offline, use_cache=not no_cache
+    )
+    if listing is None:
         raise SystemExit(1)
-
-    result = subprocess.run([signate_exe, "task-list", "--competition_key", competition_key])
-    sys.exit(result.returncode)
+    echo_listing(listing, as_json)
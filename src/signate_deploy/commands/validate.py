@@ -0,0 +1,49 @@
+"""signate-deploy validate: 提出前に submission.csv の形式を検証する."""
+
+import time
+from pathlib import Path
+
+import click
+
+from signate_deploy.validate import ID_COLUMN, expected_format, validate_submission
+
+
+@click.command("validate")
+@click.argument("competition_dir")
+@click.option(
+    "--submission",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="検証するファイル（省略時は COMPETITION_DIR/submission.csv）",
+)
+@click.option("--id-column", default=ID_COLUMN, show_default=True, help="sample_submit がないとき test から読む id 列")
+def validate(competition_dir, submission, id_column):
+    """submission.csv を sample_submit / test と照合する.
+
+    列数・ヘッダ行の有無・行数・id の重複と過不足・予測の NaN / inf を調べ、
+    問題があれば終了コード 1 で終了します。Actions では Submit の前に実行されます。
+
+    例:
+      signate-deploy validate my-comp
+      signate-deploy validate my-comp --submission my-comp/submission_v2.csv
+    """
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        click.echo("Error: pandas が必要です。pip install pandas を実行してください。", err=True)
+        raise SystemExit(1)
+
+    start = time.perf_counter()
+    submission = submission or Path(competition_dir) / "submission.csv"
+    expected = expected_format(competition_dir, id_column)
+    result = validate_submission(submission, expected)
+    elapsed = time.perf_counter() - start
+
+    if expected.reference is None:
+        click.echo("Warning: sample_submit も test も見つからないため、id は照合しません。", err=True)
+    if not result.ok:
+        for error in result.errors:
+            click.echo(f"Error: {error}", err=True)
+        raise SystemExit(1)
+    against = f", {expected.reference} と一致" if expected.reference else ""
+    click.echo(f"OK: {submission} ({result.rows} rows{against}, {elapsed:.2f}s)")
@@ -0,0 +1,315 @@
+"""ダウンロード後のデータ変換（zip 展開・CSV → Parquet/Feather）.
+
+生成されるワークフローの "Convert data" ステップから
+``python -m signate_deploy.convert <data_dir> --format parquet`` として呼ばれる。
+
+- zip はメンバーごとにストリームで展開する（アーカイブ全体をメモリに載せない）。
+- CSV はチャンク単位で2回読む。1回目で列ごとの型と値域を調べ、
+  2回目でダウンキャストした型に揃えて Parquet / Feather(Arrow IPC) に追記していく。
+- --format npy では列ごとの .npy と meta.json からなる <name>.npystore/ を作る
+  （np.load(mmap_mode="r") で開く。読み方は signate_deploy.npystore）。
+  文字列列はカテゴリ番号(int32, 欠損は -1)で保存し、同じディレクトリの CSV 間でカテゴリを揃える。
+
+pandas と pyarrow が必要（pip install pandas pyarrow）。
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import click
+
+FORMATS = {"parquet": ".parquet", "feather": ".feather", "npy": ".npystore"}
+DEFAULT_CHUNKSIZE = 200_000
+COPY_BUFFER = 1 << 20
+
+_INT_TYPES = ["int8", "int16", "int32", "int64"]
+_UINT_TYPES = ["uint8", "uint16", "uint32", "uint64"]
+
+
+def extract_archives(data_dir: Path, echo=print) -> list[Path]:
+    """data_dir 直下の .zip をメンバーごとにストリーム展開し、展開したファイルを返す.
+
+    同じサイズのファイルが既にあるメンバーは展開しない。
+    """
+    extracted = []
+    root = data_dir.resolve()
+    for archive in sorted(data_dir.glob("*.zip")):
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                target = (data_dir / info.filename).resolve()
+                if root not in target.parents:
+                    raise ValueError(f"{archive.name}: unsafe member path {info.filename!r}")
+                if target.exists() and target.stat().st_size == info.file_size:
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(target.name + ".part")
+                with zf.open(info) as src, open(tmp, "wb") as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER)
+                os.replace(tmp, target)
+                extracted.append(target)
+        echo(f"Extracted {archive.name}")
+    return extracted
+
+
+def _smallest_int(lo, hi) -> str:
+    candidates = _UINT_TYPES if lo >= 0 else _INT_TYPES
+    import numpy as np
+
+    for dtype in candidates:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return "int64"
+
+
+@dataclass
+class CsvScan:
+    dtypes: dict[str, str]
+    rows: int = 0
+    # 文字列列のユニーク値（collect_categories=True のときだけ）
+    categories: dict[str, set] = field(default_factory=dict)
+
+
+def scan_csv(csv_path: Path, chunksize: int = DEFAULT_CHUNKSIZE, collect_categories: bool = False) -> CsvScan:
+    """CSV をチャンクで走査し、列ごとのダウンキャスト後の dtype と行数を調べる.
+
+    整数列は値域に収まる最小の (u)int 型、浮動小数点列は float32、
+    それ以外（文字列・型が混在する列）は object にする。
+    """
+    import pandas as pd
+
+    kinds: dict[str, str] = {}
+    bounds: dict[str, list] = {}
+    uniques: dict[str, set] = {}
+    non_object: set[str] = set()
+    rows = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        rows += len(chunk)
+        for col in chunk.columns:
+            series = chunk[col]
+            if pd.api.types.is_bool_dtype(series):
+                kind = "bool"
+            elif pd.api.types.is_integer_dtype(series):
+                kind = "int"
+            elif pd.api.types.is_float_dtype(series):
+                kind = "float"
+            else:
+                kind = "object"
+            previous = kinds.get(col)
+            if previous is None or previous == kind:
+                kinds[col] = kind
+            elif {previous, kind} == {"int", "float"}:
+                kinds[col] = "float"
+            else:
+                kinds[col] = "object"
+            if kind == "int":
+                lo, hi = int(series.min()), int(series.max())
+                if col in bounds:
+                    lo, hi = min(lo, bounds[col][0]), max(hi, bounds[col][1])
+                bounds[col] = [lo, hi]
+            if kind != "object":
+                non_object.add(col)
+            elif collect_categories:
+                uniques.setdefault(col, set()).update(series.dropna().unique())
+
+    if collect_categories:
+        # 途中のチャンクから文字列になった列は、前半の値を取りこぼしているので文字列として読み直す
+        mixed = [col for col, kind in kinds.items() if kind == "object" and col in non_object]
+        if mixed:
+            uniques.update({col: set() for col in mixed})
+            for chunk in pd.read_csv(csv_path, chunksize=chunksize, usecols=mixed, dtype=object):
+                for col in mixed:
+                    uniques[col].update(chunk[col].dropna().unique())
+
+    dtypes = {}
+    for col, kind in kinds.items():
+        if kind == "int":
+            dtypes[col] = _smallest_int(*bounds[col])
+        elif kind == "float":
+            dtypes[col] = "float32"
+        else:
+            dtypes[col] = kind
+    categories = {col: uniques[col] for col, dtype in dtypes.items() if dtype == "object" and col in uniques}
+    return CsvScan(dtypes, rows, categories)
+
+
+def infer_dtypes(csv_path: Path, chunksize: int = DEFAULT_CHUNKSIZE) -> dict[str, str]:
+    """CSV の列ごとのダウンキャスト後の dtype（scan_csv を参照）."""
+    return scan_csv(csv_path, chunksize=chunksize).dtypes
+
+
+def _arrow_schema(dtypes: dict[str, str]):
+    import pyarrow as pa
+
+    fields = []
+    for col, dtype in dtypes.items():
+        if dtype == "object":
+            fields.append(pa.field(col, pa.string()))
+        elif dtype == "bool":
+            fields.append(pa.field(col, pa.bool_()))
+        else:
+            fields.append(pa.field(col, pa.from_numpy_dtype(dtype)))
+    return pa.schema(fields)
+
+
+def convert_csv(
+    csv_path: Path,
+    fmt: str = "parquet",
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    dtypes: dict[str, str] | None = None,
+) -> Path:
+    """CSV をチャンクごとに読み、型を揃えて Parquet / Feather に追記していく."""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    dtypes = dtypes or infer_dtypes(csv_path, chunksize=chunksize)
+    schema = _arrow_schema(dtypes)
+    out_path = csv_path.with_suffix(FORMATS[fmt])
+    tmp = out_path.with_name(out_path.name + ".part")
+
+    read_dtypes = {col: ("object" if dtype == "object" else dtype) for col, dtype in dtypes.items()}
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(tmp, schema)
+        write = writer.write_table
+    else:
+        sink = pa.OSFile(str(tmp), "wb")
+        writer = pa.ipc.new_file(sink, schema)
+        write = writer.write_table
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize, dtype=read_dtypes):
+            write(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    finally:
+        writer.close()
+        if fmt != "parquet":
+            sink.close()
+    os.replace(tmp, out_path)
+    return out_path
+
+
+def convert_csv_npy(
+    csv_path: Path,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    scan: CsvScan | None = None,
+    categories: dict[str, list[str]] | None = None,
+) -> Path:
+    """CSV を列ごとの .npy（<name>.npystore/<列番号>.npy）と meta.json に変換する.
+
+    各列はあらかじめ行数分の .npy を確保し、チャンクごとに該当範囲へ書き込む。
+    categories を渡すと文字列列はそのカテゴリ順の番号で保存する（CSV 間で番号を揃えるため）。
+    """
+    import numpy as np
+    import pandas as pd
+
+    from signate_deploy.npystore import META_FILENAME
+
+    scan = scan or scan_csv(csv_path, chunksize=chunksize, collect_categories=True)
+    if categories is None:
+        categories = {col: sorted(values) for col, values in scan.categories.items()}
+    out_path = csv_path.with_suffix(FORMATS["npy"])
+    tmp = Path(tempfile.mkdtemp(dir=csv_path.parent, prefix=f".{csv_path.stem}-"))
+    try:
+        columns = []
+        arrays = {}
+        for i, (col, dtype) in enumerate(scan.dtypes.items()):
+            stored = "int32" if dtype == "object" else dtype
+            file_name = f"{i}.npy"
+            arrays[col] = np.lib.format.open_memmap(tmp / file_name, mode="w+", dtype=stored, shape=(scan.rows,))
+            entry = {"name": col, "file": file_name, "dtype": stored}
+            if dtype == "object":
+                entry["categories"] = categories.get(col, [])
+            columns.append(entry)
+
+        read_dtypes = {col: ("object" if dtype == "object" else dtype) for col, dtype in scan.dtypes.items()}
+        offset = 0
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize, dtype=read_dtypes):
+            end = offset + len(chunk)
+            for entry in columns:
+                col = entry["name"]
+                if "categories" in entry:
+                    # カテゴリに無い値・欠損は -1（LightGBM では欠損扱い）
+                    values = pd.Categorical(chunk[col], categories=entry["categories"]).codes
+                else:
+                    values = chunk[col].to_numpy()
+                arrays[col][offset:end] = values
+            offset = end
+        for array in arrays.values():
+            array.flush()
+        del arrays
+
+        meta = {"rows": scan.rows, "columns": columns}
+        (tmp / META_FILENAME).write_text(json.dumps(meta, ensure_ascii=False, indent=1) + "\n")
+        if out_path.exists():
+            shutil.rmtree(out_path)
+        os.replace(tmp, out_path)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return out_path
+
+
+def _output_mtime(out_path: Path) -> float | None:
+    from signate_deploy.npystore import META_FILENAME
+
+    marker = out_path / META_FILENAME if out_path.suffix == FORMATS["npy"] else out_path
+    return marker.stat().st_mtime if marker.exists() else None
+
+
+def convert_csvs(data_dir: Path, fmt: str = "parquet", chunksize: int = DEFAULT_CHUNKSIZE, echo=print) -> list[Path]:
+    """data_dir 以下の CSV を変換する. 変換済みで CSV より新しいものはスキップする."""
+    pending = []
+    for csv_path in sorted(data_dir.rglob("*.csv")):
+        mtime = _output_mtime(csv_path.with_suffix(FORMATS[fmt]))
+        if mtime is None or mtime < csv_path.stat().st_mtime:
+            pending.append(csv_path)
+
+    converted = []
+    if fmt == "npy":
+        # train/test で同じ文字列が同じ番号になるよう、全 CSV のカテゴリを合わせる.
+        # 変換済みの CSV も走査して、既存のストアと番号がずれないようにする
+        all_csvs = sorted(data_dir.rglob("*.csv")) if pending else []
+        scans = {path: scan_csv(path, chunksize=chunksize, collect_categories=True) for path in all_csvs}
+        merged: dict[str, set] = {}
+        for scan in scans.values():
+            for col, values in scan.categories.items():
+                merged.setdefault(col, set()).update(values)
+        categories = {col: sorted(values) for col, values in merged.items()}
+        for csv_path in all_csvs:
+            converted.append(convert_csv_npy(csv_path, chunksize=chunksize, scan=scans[csv_path], categories=categories))
+            echo(f"Converted {csv_path.name} -> {converted[-1].name}")
+        return converted
+
+    for csv_path in pending:
+        converted.append(convert_csv(csv_path, fmt=fmt, chunksize=chunksize))
+        echo(f"Converted {csv_path.name} -> {converted[-1].name}")
+    return converted
+
+
+@click.command()
+@click.argument("data_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--format", "fmt", type=click.Choice(list(FORMATS)), default="parquet", show_default=True, help="変換先の形式")
+@click.option("--chunksize", default=DEFAULT_CHUNKSIZE, show_default=True, help="CSVを読むチャンクの行数")
+@click.option("--no-extract", is_flag=True, default=False, help="zipを展開しない")
+def main(data_dir, fmt, chunksize, no_extract):
+    """DATA_DIR の zip を展開し、CSV を Parquet / Feather に変換する."""
+    try:
+        import pandas  # noqa: F401
+        import pyarrow  # noqa: F401
+    except ImportError:
+        click.echo("Error: pandas と pyarrow が必要です。pip install pandas pyarrow を実行してください。", err=True)
+        raise SystemExit(1)
+
+    if not no_extract:
+        extract_archives(data_dir, echo=click.echo)
+    convert_csvs(data_dir, fmt=fmt, chunksize=chunksize, echo=click.echo)
+
+
+if __name__ == "__main__":
+    main()
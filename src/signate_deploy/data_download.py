@@ -0,0 +1,270 @@
+"""signate-config.json の file_keys を並列にダウンロードする.
+
+生成されるワークフローの "Download data" ステップから
+``python -m signate_deploy.data_download <competition_dir> --workers N`` として、
+ローカルでは ``signate-deploy download <competition_dir> --local`` として呼ばれる。
+
+file_keys の値が http(s) の URL なら組み込みのダウンローダ（Range で再開・SHA-256 検証）で、
+それ以外は signate download で取得する。どちらも失敗したら指数バックオフで再試行する。取得したファイルのサイズと SHA-256 は
+signate-config.json と同じディレクトリの signate-manifest.json に記録し、
+次回以降はその値と照合する。
+"""
+
+import json
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+import click
+
+from signate_deploy.downloader import (
+    DEFAULT_RETRIES,
+    MANIFEST_FILENAME,
+    DownloadError,
+    fetch,
+    file_sha256,
+    load_manifest,
+    save_manifest,
+)
+
+DEFAULT_WORKERS = 4
+# signate download を再試行するまでの待ち時間の基準 [秒]（2倍ずつ延ばす）
+RETRY_BACKOFF = 0.5
+
+# ダウンロード済みデータに対応する signate-config.json の写し（data/ に置く）
+STAMP_FILENAME = "signate-config.json"
+
+
+class FileDownloadError(Exception):
+    """1ファイル分のダウンロード失敗."""
+
+    def __init__(self, name: str, file_key: str, returncode: int, output: str):
+        self.name = name
+        self.file_key = file_key
+        self.returncode = returncode
+        self.output = output
+        super().__init__(f"{name} ({file_key}): exit code {returncode}")
+
+
+def _is_url(file_key: str) -> bool:
+    return file_key.startswith(("http://", "https://"))
+
+
+def download_files(
+    task_key: str,
+    file_keys: dict[str, str],
+    dest: Path,
+    workers: int = DEFAULT_WORKERS,
+    signate_exe: str = "signate",
+    echo=print,
+    expected_sha256: dict[str, str] | None = None,
+    retries: int = DEFAULT_RETRIES,
+) -> dict[str, list[Path]]:
+    """file_keys の各ファイルを dest に並列ダウンロードし、NAME -> 取得したファイル一覧 を返す.
+
+    同時実行数は workers まで。1つでも失敗したら未着手のファイルは取り消し、
+    実行中のダウンロードも停止して、最初の失敗を FileDownloadError として送出する。
+    signate download はファイルごとの作業ディレクトリで実行し、できたファイルを dest に移す。
+    失敗したファイルはそれぞれ最大 retries 回まで再試行する。
+    """
+    dest.mkdir(parents=True, exist_ok=True)
+    expected_sha256 = expected_sha256 or {}
+    stop = threading.Event()
+    lock = threading.Lock()
+    running: set[subprocess.Popen] = set()
+
+    def fail(name, file_key, returncode, output):
+        # 同じワーカーが次のファイルに着手する前に止める
+        stop.set()
+        raise FileDownloadError(name, file_key, returncode, output)
+
+    def fetch_url(name: str, url: str) -> list[Path]:
+        file_name = unquote(Path(urlparse(url).path).name) or name
+        try:
+            result = fetch(url, dest / file_name, expected_sha256=expected_sha256.get(file_name), retries=retries)
+        except DownloadError as e:
+            fail(name, url, 1, str(e))
+        if result.resumed:
+            echo(f"Resumed {name}")
+        return [result.path]
+
+    def run_signate(file_key: str) -> tuple[int, str, list[Path]]:
+        with tempfile.TemporaryDirectory(dir=dest, prefix=".download-") as staging:
+            proc = subprocess.Popen(
+                [signate_exe, "download", "--task_key", task_key, "--file_key", file_key],
+                cwd=staging,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+            )
+            with lock:
+                running.add(proc)
+            try:
+                output, _ = proc.communicate()
+            finally:
+                with lock:
+                    running.discard(proc)
+            if proc.returncode != 0:
+                return proc.returncode, output or "", []
+            paths = []
+            for produced in sorted(Path(staging).iterdir()):
+                target = dest / produced.name
+                shutil.move(str(produced), str(target))
+                paths.append(target)
+            return 0, output or "", paths
+
+    def fetch_signate(name: str, file_key: str) -> list[Path]:
+        for attempt in range(retries + 1):
+            returncode, output, paths = run_signate(file_key)
+            if returncode == 0:
+                return paths
+            if stop.is_set():
+                return []
+            if attempt == retries:
+                fail(name, file_key, returncode, output)
+            echo(f"Retrying {name} ({attempt + 1}/{retries}, exit code {returncode})")
+            # 他のファイルが失敗して停止したら待たずに抜ける
+            if stop.wait(min(2 ** attempt * RETRY_BACKOFF, 30)):
+                return []
+        return []
+
+    def download(name: str, file_key: str) -> list[Path]:
+        if stop.is_set():
+            return []
+        if _is_url(file_key):
+            return fetch_url(name, file_key)
+        return fetch_signate(name, file_key)
+
+    results: dict[str, list[Path]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(download, name, key): name for name, key in file_keys.items()}
+        try:
+            for future in as_completed(futures):
+                name = futures[future]
+                results[name] = future.result()
+                if not stop.is_set():
+                    echo(f"Downloaded {name}")
+        except FileDownloadError:
+            stop.set()
+            for f in futures:
+                f.cancel()
+            with lock:
+                for proc in running:
+                    proc.kill()
+            raise
+    return results
+
+
+def is_up_to_date(config: dict, data_dir: Path) -> bool:
+    """data_dir のデータが config（task_key / file_keys）と同じ設定でダウンロード済みか."""
+    try:
+        stamp = json.loads((data_dir / STAMP_FILENAME).read_text())
+    except (OSError, ValueError):
+        return False
+    return (stamp.get("task_key"), stamp.get("file_keys")) == (config["task_key"], config.get("file_keys", {}))
+
+
+def write_stamp(config: dict, data_dir: Path) -> None:
+    stamp = {"task_key": config["task_key"], "file_keys": config.get("file_keys", {})}
+    (data_dir / STAMP_FILENAME).write_text(json.dumps(stamp, indent=2, ensure_ascii=False) + "\n")
+
+
+def update_manifest(
+    manifest_path: Path,
+    competition_dir: Path,
+    file_keys: dict[str, str],
+    downloaded: dict[str, list[Path]],
+) -> list[str]:
+    """ダウンロード結果をマニフェストに記録し、前回と SHA-256 が食い違ったファイル名を返す.
+
+    file_key が変わったファイルは新しいデータとして扱い、照合しない。
+    """
+    manifest = load_manifest(manifest_path)
+    mismatched = []
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    for name, paths in downloaded.items():
+        for path in paths:
+            sha256 = file_sha256(path)
+            previous = manifest.get(path.name, {})
+            if previous.get("file_key") == file_keys[name] and previous.get("sha256") not in (None, sha256):
+                mismatched.append(path.name)
+            manifest[path.name] = {
+                "name": name,
+                "file_key": file_keys[name],
+                "path": path.relative_to(competition_dir).as_posix(),
+                "size": path.stat().st_size,
+                "sha256": sha256,
+                "downloaded_at": now,
+            }
+    save_manifest(manifest_path, manifest)
+    return mismatched
+
+
+def download_competition(
+    competition_dir: str,
+    workers: int = DEFAULT_WORKERS,
+    signate_exe: str = "signate",
+    force: bool = False,
+) -> None:
+    """COMPETITION_DIR/signate-config.json のファイルを COMPETITION_DIR/data にダウンロードする.
+
+    失敗時はエラーを表示して SystemExit(1) を送出する。
+    """
+    comp_path = Path(competition_dir)
+    config = json.loads((comp_path / "signate-config.json").read_text())
+    data_dir = comp_path / "data"
+    if not force and is_up_to_date(config, data_dir):
+        click.echo(f"{data_dir} は最新です。ダウンロードをスキップします。")
+        return
+    file_keys = config.get("file_keys", {})
+    manifest_path = comp_path / MANIFEST_FILENAME
+    # URL で取得するファイルは前回の SHA-256 と照合しながらダウンロードする.
+    # force=True なら照合せずに取り直し、マニフェストの SHA-256 を新しい内容で更新する
+    pinned = {} if force else {
+        file_name: entry["sha256"]
+        for file_name, entry in load_manifest(manifest_path).items()
+        if entry.get("file_key") in file_keys.values() and _is_url(entry["file_key"])
+    }
+    click.echo(f"Downloading {len(file_keys)} file(s) with {workers} worker(s)...")
+    try:
+        downloaded = download_files(
+            config["task_key"],
+            file_keys,
+            data_dir,
+            workers=workers,
+            signate_exe=signate_exe,
+            echo=click.echo,
+            expected_sha256=pinned,
+        )
+    except FileDownloadError as e:
+        click.echo(f"Error: {e.name} のダウンロードに失敗しました (file_key={e.file_key}, exit code {e.returncode})", err=True)
+        if e.output:
+            click.echo(e.output.rstrip(), err=True)
+        raise SystemExit(1)
+
+    mismatched = update_manifest(manifest_path, comp_path, file_keys, downloaded)
+    for file_name in mismatched:
+        click.echo(f"Warning: {file_name} の SHA-256 が前回のダウンロードと異なります。", err=True)
+    write_stamp(config, data_dir)
+
+
+@click.command()
+@click.argument("competition_dir")
+@click.option("--workers", "-j", default=DEFAULT_WORKERS, show_default=True, help="同時ダウンロード数")
+@click.option("--signate-exe", default="signate", show_default=True, help="signate CLIの実行ファイル")
+@click.option("--force", "-f", is_flag=True, default=False, help="ダウンロード済みでも取得し直す（記録済みのSHA-256とは照合しない）")
+def main(competition_dir, workers, signate_exe, force):
+    """COMPETITION_DIR/signate-config.json のファイルを COMPETITION_DIR/data に並列ダウンロードする.
+
+    data/ が同じ設定でダウンロード済み（アーティファクトから復元した場合など）ならスキップする。
+    """
+    download_competition(competition_dir, workers=workers, signate_exe=signate_exe, force=force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""再開可能・チャンク単位・チェックサム検証付きのファイルダウンローダ.
+
+ダウンロード中のデータは <dest>.part に追記し、中断後は HTTP Range リクエストで続きから取得する。
+完了時にサイズ（Content-Length / Content-Range）と SHA-256 を検証してから dest に置き換える。
+"""
+
+import hashlib
+import json
+import os
+import re
+import socket
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from http.client import HTTPException
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 20
+DEFAULT_RETRIES = 3
+MANIFEST_FILENAME = "signate-manifest.json"
+
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+class DownloadError(Exception):
+    """ダウンロードの失敗（リトライ上限到達・サイズ不一致など）."""
+
+
+class ChecksumError(DownloadError):
+    """SHA-256 が期待値と一致しない."""
+
+
+@dataclass
+class DownloadResult:
+    path: Path
+    size: int
+    sha256: str
+    resumed: bool = False
+
+
+def file_sha256(path: Path, chunk_size: int = CHUNK_SIZE) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _hash_existing(path: Path, chunk_size: int):
+    h = hashlib.sha256()
+    if path.exists():
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                h.update(chunk)
+    return h
+
+
+def _total_size(resp, offset: int) -> int | None:
+    content_range = resp.headers.get("Content-Range")
+    if content_range:
+        m = _CONTENT_RANGE_RE.match(content_range)
+        if m and m.group(3) != "*":
+            return int(m.group(3))
+    length = resp.headers.get("Content-Length")
+    if length is not None:
+        return offset + int(length)
+    return None
+
+
+def _attempt(url, part, headers, chunk_size, timeout):
+    """1回分の取得. (ハッシュ, 全体サイズ, Range で再開したか) を返す."""
+    offset = part.stat().st_size if part.exists() else 0
+    req = urllib.request.Request(url, headers=dict(headers or {}))
+    if offset:
+        req.add_header("Range", f"bytes={offset}-")
+    try:
+        resp = urllib.request.urlopen(req, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 416 and offset:
+            # 既に全部取得済み（Range がファイル末尾を超えた）
+            return _hash_existing(part, chunk_size), offset, True
+        raise
+    with resp:
+        if offset and resp.status == 206:
+            resumed = True
+            h = _hash_existing(part, chunk_size)
+            mode = "ab"
+        else:
+            # Range 非対応のサーバは 200 で全体を返すので最初から書き直す
+            resumed = False
+            offset = 0
+            h = hashlib.sha256()
+            mode = "wb"
+        total = _total_size(resp, offset)
+        with open(part, mode) as f:
+            for chunk in iter(lambda: resp.read(chunk_size), b""):
+                f.write(chunk)
+                h.update(chunk)
+    return h, total, resumed
+
+
+def fetch(
+    url: str,
+    dest: Path,
+    expected_sha256: str | None = None,
+    headers: dict | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    retries: int = DEFAULT_RETRIES,
+    timeout: float = 60,
+) -> DownloadResult:
+    """url を dest にダウンロードする.
+
+    接続断・タイムアウト・5xx の場合は指数バックオフで最大 retries 回まで再試行し、
+    .part に書けた分の続きから再開する。
+    """
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    part = dest.with_name(dest.name + ".part")
+    resumed = False
+
+    for attempt in range(retries + 1):
+        try:
+            h, total, attempt_resumed = _attempt(url, part, headers, chunk_size, timeout)
+            resumed = resumed or attempt_resumed
+            size = part.stat().st_size
+            if total is not None and size != total:
+                raise DownloadError(f"{url}: size mismatch ({size} != {total})")
+            break
+        except urllib.error.HTTPError as e:
+            if e.code < 500 or attempt == retries:
+                raise DownloadError(f"{url}: HTTP {e.code}") from e
+        except (urllib.error.URLError, HTTPException, socket.timeout, ConnectionError) as e:
+            if attempt == retries:
+                raise DownloadError(f"{url}: {e}") from e
+        except DownloadError:
+            # 途中で切れた（サイズ不足）. 続きから取り直す
+            if attempt == retries:
+                raise
+        time.sleep(min(2 ** attempt * 0.5, 30))
+
+    sha256 = h.hexdigest()
+    if expected_sha256 and sha256 != expected_sha256:
+        part.unlink()
+        raise ChecksumError(f"{url}: sha256 mismatch ({sha256} != {expected_sha256})")
+    os.replace(part, dest)
+    return DownloadResult(dest, size, sha256, resumed)
+
+
+def load_manifest(path: Path) -> dict:
+    """マニフェスト（name -> {file_key, path, size, sha256, ...}）を読む. 無ければ空."""
+    try:
+        manifest = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("files", {}) if isinstance(manifest, dict) else {}
+
+
+def save_manifest(path: Path, files: dict) -> None:
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"files": files}, indent=2, ensure_ascii=False, sort_keys=True) + "\n")
+    os.replace(tmp, path)
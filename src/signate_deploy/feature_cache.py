@@ -0,0 +1,241 @@
+"""特徴量のキャッシュ（init で生成される train.py から使う）.
+
+    feature_cache = FeatureCache("my-comp/.feature-cache", "my-comp/data")
+
+    @feature_cache
+    def make_features(train, test):
+        ...
+        return train, test
+
+キーは「関数のソース」「data/ の内容（signate-manifest.json の SHA-256 と各ファイルの内容）」
+「引数の形（DataFrame なら列・dtype・行数）」のハッシュ。どれかが変わると再計算する。
+関数から呼んでいる別の関数の変更は検知しないので、その場合は関数側も書き換えるか
+キャッシュディレクトリを消すこと。
+
+DataFrame は Parquet、ndarray は .npy で保存する（タプル/リストで複数返してよい）。
+合計サイズが max_bytes を超えたら、最後に使われたのが古いエントリから消す。
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from signate_deploy.downloader import MANIFEST_FILENAME, file_sha256, load_manifest, save_manifest
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+META_FILENAME = "meta.json"
+# ダウンロード以外のファイルの内容のハッシュの控え（data_fingerprint）
+FINGERPRINTS_FILENAME = ".fingerprints.json"
+# キャッシュ形式を変えたら上げる（古いエントリを使わない）
+CACHE_VERSION = 1
+
+
+def _file_digests(data_dir: Path) -> dict[str, str]:
+    """data_dir 以下のファイル（相対パス）-> SHA-256.
+
+    ダウンロードしたファイルは signate-manifest.json（COMPETITION_DIR 直下）に記録された
+    SHA-256 を使う（サイズが記録と一致する場合）。それ以外（展開・変換したファイル、
+    data/signate-config.json など）は内容をハッシュし、(サイズ, mtime) が変わらない限り
+    data/.fingerprints.json に控えた値を使い回す。
+    ドット始まりのファイル（マニフェスト類・書きかけの一時ファイル）は含めない。
+    """
+    listed = {
+        entry["path"]: entry
+        for entry in load_manifest(data_dir.parent / MANIFEST_FILENAME).values()
+        if "path" in entry and "sha256" in entry
+    }
+    memo_path = data_dir / FINGERPRINTS_FILENAME
+    memo = load_manifest(memo_path)
+    digests, updated = {}, {}
+    for path in sorted(p for p in data_dir.rglob("*") if p.is_file()):
+        rel = path.relative_to(data_dir)
+        if any(part.startswith(".") for part in rel.parts):
+            continue
+        rel, stat = rel.as_posix(), path.stat()
+        entry = listed.get(path.relative_to(data_dir.parent).as_posix())
+        if entry and entry.get("size") == stat.st_size:
+            digests[rel] = entry["sha256"]
+            continue
+        known = memo.get(rel, {})
+        if (known.get("size"), known.get("mtime_ns")) != (stat.st_size, stat.st_mtime_ns):
+            known = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_sha256(path)}
+        updated[rel] = known
+        digests[rel] = known["sha256"]
+    if updated != memo:
+        try:
+            save_manifest(memo_path, updated)
+        except OSError:
+            # 書けなければ次回も内容をハッシュし直すだけ
+            pass
+    return digests
+
+
+def data_fingerprint(data_dir) -> str:
+    """data_dir の内容を表すハッシュ.
+
+    各ファイルの相対パスと内容の SHA-256 から作る（_file_digests）。actions/cache や
+    アーティファクトから復元すると mtime が変わるため、mtime そのものはキーに含めない。
+    """
+    h = hashlib.sha256()
+    for rel, sha256 in _file_digests(Path(data_dir)).items():
+        h.update(f"{rel}\0{sha256}\n".encode())
+    return h.hexdigest()
+
+
+def _describe(value) -> str:
+    if isinstance(value, pd.DataFrame):
+        return f"DataFrame{value.shape}{list(zip(value.columns.astype(str), value.dtypes.astype(str)))}"
+    if isinstance(value, pd.Series):
+        return f"Series({len(value)},{value.name!r},{value.dtype})"
+    if isinstance(value, np.ndarray):
+        return f"ndarray{value.shape}{value.dtype}"
+    return repr(value)
+
+
+def _save_item(value, path_stem: Path) -> dict:
+    if isinstance(value, pd.DataFrame):
+        value.to_parquet(path_stem.with_suffix(".parquet"))
+        return {"type": "dataframe", "file": path_stem.name + ".parquet"}
+    if isinstance(value, pd.Series):
+        value.to_frame().to_parquet(path_stem.with_suffix(".parquet"))
+        return {"type": "series", "file": path_stem.name + ".parquet"}
+    if isinstance(value, np.ndarray):
+        np.save(path_stem.with_suffix(".npy"), value, allow_pickle=False)
+        return {"type": "ndarray", "file": path_stem.name + ".npy"}
+    raise TypeError(f"cannot cache {type(value).__name__} (DataFrame / Series / ndarray only)")
+
+
+def _load_item(item: dict, entry_dir: Path):
+    path = entry_dir / item["file"]
+    if item["type"] == "dataframe":
+        return pd.read_parquet(path)
+    if item["type"] == "series":
+        return pd.read_parquet(path).iloc[:, 0]
+    return np.load(path, allow_pickle=False)
+
+
+def _dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+class DiskCache:
+    """キー -> エントリディレクトリ（meta.json 付き）のキャッシュ. 合計サイズを LRU で抑える."""
+
+    def __init__(self, cache_dir, data_dir, max_bytes: int = DEFAULT_MAX_BYTES, echo=print):
+        self.cache_dir = Path(cache_dir)
+        self.data_dir = Path(data_dir)
+        self.max_bytes = max_bytes
+        self.echo = echo
+        self._data_fingerprint = None
+
+    @property
+    def data_fingerprint(self) -> str:
+        if self._data_fingerprint is None:
+            self._data_fingerprint = data_fingerprint(self.data_dir)
+        return self._data_fingerprint
+
+    def _read_meta(self, key: str) -> dict:
+        """エントリの meta.json を読み、最終使用時刻を更新する. 無ければ KeyError."""
+        meta_path = self.cache_dir / key / META_FILENAME
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            raise KeyError(key) from None
+        # LRU 用に最終使用時刻を更新する
+        os.utime(meta_path)
+        return meta
+
+    def _write_entry(self, key: str, write) -> None:
+        """一時ディレクトリに write(dir) -> meta を書かせてから、エントリとして置き換える."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-"))
+        try:
+            meta = write(tmp)
+            (tmp / META_FILENAME).write_text(json.dumps(meta))
+            entry_dir = self.cache_dir / key
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir)
+            os.replace(tmp, entry_dir)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict(keep=key)
+
+    def evict(self, keep: str | None = None) -> list[str]:
+        """合計サイズが max_bytes 以下になるまで、最後の使用が古いエントリから消す."""
+        entries = []
+        for entry_dir in self.cache_dir.iterdir():
+            meta = entry_dir / META_FILENAME
+            if entry_dir.is_dir() and meta.exists():
+                entries.append((meta.stat().st_mtime, entry_dir.name, _dir_size(entry_dir)))
+        total = sum(size for _, _, size in entries)
+        evicted = []
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(self.cache_dir / name, ignore_errors=True)
+            total -= size
+            evicted.append(name)
+        return evicted
+
+
+class FeatureCache(DiskCache):
+    """関数の戻り値をディスクにキャッシュするデコレータ."""
+
+    def key(self, func, args=(), kwargs=None) -> str:
+        h = hashlib.sha256()
+        h.update(f"v{CACHE_VERSION}\n{func.__module__}.{func.__qualname__}\n".encode())
+        h.update(inspect.getsource(func).encode())
+        h.update(self.data_fingerprint.encode())
+        for arg in args:
+            h.update(_describe(arg).encode())
+        for name, value in sorted((kwargs or {}).items()):
+            h.update(f"{name}={_describe(value)}".encode())
+        return h.hexdigest()[:32]
+
+    def get(self, key: str):
+        """キャッシュを読む. 無ければ KeyError."""
+        meta = self._read_meta(key)
+        values = [_load_item(item, self.cache_dir / key) for item in meta["items"]]
+        if meta["kind"] == "single":
+            return values[0]
+        return tuple(values) if meta["kind"] == "tuple" else values
+
+    def put(self, key: str, value) -> None:
+        kind = "tuple" if isinstance(value, tuple) else "list" if isinstance(value, list) else "single"
+        values = list(value) if kind != "single" else [value]
+
+        def write(tmp: Path) -> dict:
+            items = [_save_item(v, tmp / str(i)) for i, v in enumerate(values)]
+            return {"kind": kind, "items": items, "created_at": time.time()}
+
+        self._write_entry(key, write)
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = self.key(func, args, kwargs)
+            try:
+                value = self.get(key)
+            except KeyError:
+                pass
+            else:
+                self.echo(f"Feature cache hit: {func.__name__} ({key[:8]})")
+                return value
+            value = func(*args, **kwargs)
+            self.put(key, value)
+            self.echo(f"Feature cache stored: {func.__name__} ({key[:8]})")
+            return value
+
+        return wrapper
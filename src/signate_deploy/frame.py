@@ -0,0 +1,144 @@
+"""省メモリなテーブルの読み書き（init で生成される train.py から使う）.
+
+- 先頭の一部の行から列の型を決め、CSV はチャンク単位で読みながらダウンキャストする。
+- 整数は値域に収まる最小の型、浮動小数点は float32、種類の少ない文字列列は category にする。
+- 予測と提出ファイルの書き出しは一定行数ずつ行い、全体の一時配列・DataFrame を作らない。
+
+pandas が必要。
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SAMPLE_ROWS = 100_000
+DEFAULT_CHUNKSIZE = 50_000
+DEFAULT_BATCH_ROWS = 65_536
+# ユニーク数 / 行数 がこれ以下の文字列列を category にする
+DEFAULT_CATEGORY_RATIO = 0.5
+
+
+def category_columns(df: pd.DataFrame, category_ratio: float = DEFAULT_CATEGORY_RATIO) -> list[str]:
+    """df の文字列列のうち、ユニーク値の割合が category_ratio 以下のものを返す."""
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            continue
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            columns.append(col)
+        elif len(series) and series.nunique(dropna=True) / len(series) <= category_ratio:
+            columns.append(col)
+    return columns
+
+
+def downcast(df: pd.DataFrame, categories: list[str] | None = None, category_ratio: float = DEFAULT_CATEGORY_RATIO) -> pd.DataFrame:
+    """数値列をダウンキャストし、categories の列（省略時は自動判定）を category にした新しい DataFrame を返す.
+
+    列をその場で置き換えると元の float64 のブロックが残り続けるため、列ごとに作り直す。
+    """
+    if categories is None:
+        categories = category_columns(df, category_ratio)
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            columns[col] = series
+        elif pd.api.types.is_integer_dtype(series):
+            columns[col] = pd.to_numeric(series, downcast="unsigned" if series.min() >= 0 else "integer")
+        elif pd.api.types.is_float_dtype(series):
+            columns[col] = series.astype("float32")
+        elif col in categories:
+            columns[col] = series.astype("category")
+        else:
+            columns[col] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def read_csv_lean(
+    path,
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    category_ratio: float = DEFAULT_CATEGORY_RATIO,
+    **read_csv_kwargs,
+) -> pd.DataFrame:
+    """CSV をチャンクで読み、チャンクごとにダウンキャストしてから結合する.
+
+    category にする列は先頭 sample_rows 行から決める。pd.read_csv で一度に読む場合と違い、
+    float64 / object のままの全体が同時にメモリに載ることはない。
+    """
+    sample = pd.read_csv(path, nrows=sample_rows, **read_csv_kwargs)
+    categories = category_columns(sample, category_ratio)
+    del sample
+
+    chunks = [
+        downcast(chunk, categories=categories)
+        for chunk in pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs)
+    ]
+    if not chunks:
+        return pd.read_csv(path, nrows=0, **read_csv_kwargs)
+    if len(chunks) == 1:
+        return chunks[0]
+
+    # チャンクごとにカテゴリが異なるので、category 列は全チャンクのカテゴリを合わせてから結合する
+    columns = list(chunks[0].columns)
+    merged = {
+        col: pd.api.types.union_categoricals([chunk.pop(col) for chunk in chunks])
+        for col in categories
+    }
+    df = pd.concat(chunks, ignore_index=True)
+    del chunks
+    for col in categories:
+        df.insert(columns.index(col), col, merged.pop(col))
+    return df
+
+
+def _slice(values, start: int, end: int):
+    return values.iloc[start:end] if hasattr(values, "iloc") else values[start:end]
+
+
+def _take(values, rows: np.ndarray):
+    return values.iloc[rows] if hasattr(values, "iloc") else values[rows]
+
+
+def predict_in_batches(
+    predict, X, batch_rows: int = DEFAULT_BATCH_ROWS, out: np.ndarray | None = None, index: np.ndarray | None = None
+) -> np.ndarray:
+    """predict(X の batch_rows 行分) を繰り返し、結果を1次元の float32 配列に詰めて返す.
+
+    X は DataFrame / ndarray のほか、len() とスライスで行を返すものなら何でもよい。
+    index を渡すと X のその行だけを（index の順に）予測する. 取り出すのは1バッチ分ずつで、
+    index の行全体のコピー（X.iloc[index]）は作らない。
+    """
+    n_rows = len(X) if index is None else len(index)
+    if out is None:
+        out = np.empty(n_rows, dtype=np.float32)
+    for start in range(0, n_rows, batch_rows):
+        end = min(start + batch_rows, n_rows)
+        batch = _slice(X, start, end) if index is None else _take(X, index[start:end])
+        out[start:end] = predict(batch)
+    return out
+
+
+def write_csv_blocks(path, columns: dict, batch_rows: int = DEFAULT_BATCH_ROWS, header: bool = False) -> int:
+    """列名 -> 値 の columns を batch_rows 行ずつ CSV に追記し、書いた行数を返す."""
+    n_rows = len(next(iter(columns.values())))
+    with open(path, "w", newline="") as f:
+        for start in range(0, max(n_rows, 1), batch_rows):
+            end = min(start + batch_rows, n_rows)
+            block = pd.DataFrame({name: np.asarray(_slice(values, start, end)) for name, values in columns.items()})
+            block.to_csv(f, index=False, header=header and start == 0)
+    return n_rows
+
+
+def peak_rss_mb(children: bool = False) -> float | None:
+    """このプロセス（children=True なら終了済みの子プロセス）の最大常駐メモリ [MB]. 取得できなければ None."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    maxrss = resource.getrusage(who).ru_maxrss
+    # Linux は KB、macOS は bytes
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
@@ -0,0 +1,260 @@
+"""GitHub Actions の実行を特定・監視する最小限の REST クライアント.
+
+submit / download の --wait から使う。
+
+- ワークフローは dispatch_id 入力を run-name に含めるので、起動した実行そのものを特定できる
+  （gh run list --limit 1 のように他人や別の実行を拾わない）。
+- ポーリングは ETag / If-None-Match の条件付きリクエストで行う。変化がなければ 304 が返り、
+  レート制限を消費しない。変化がない間は間隔を伸ばし、変化があれば縮める。
+- ステップの状態の変化はその都度表示し、ジョブのログは完了したジョブから順に表示する
+  （REST API でログを取得できるのはジョブの完了後）。
+
+トークンは GH_TOKEN / GITHUB_TOKEN、なければ ``gh auth token``。リポジトリは GITHUB_REPOSITORY、
+なければ ``gh repo view``。API の URL は GITHUB_API_URL で変えられる。
+"""
+
+import json
+import os
+import subprocess
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from dataclasses import dataclass
+
+DEFAULT_API_URL = "https://api.github.com"
+MIN_POLL_INTERVAL = 2.0
+MAX_POLL_INTERVAL = 30.0
+BACKOFF_FACTOR = 1.5
+# 起動した実行が一覧に現れるまで待つ秒数
+FIND_RUN_TIMEOUT = 120.0
+# レート制限に当たったときに待つ最長秒数
+MAX_RATE_LIMIT_WAIT = 300.0
+
+
+class GitHubError(Exception):
+    """GitHub API の呼び出しに失敗した."""
+
+
+def new_dispatch_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def _gh_output(args: list[str]) -> str | None:
+    try:
+        result = subprocess.run(["gh", *args], capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 and result.stdout.strip() else None
+
+
+def resolve_token() -> str | None:
+    return os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN") or _gh_output(["auth", "token"])
+
+
+def resolve_repo() -> str | None:
+    return os.environ.get("GITHUB_REPOSITORY") or _gh_output(
+        ["repo", "view", "--json", "nameWithOwner", "--jq", ".nameWithOwner"]
+    )
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+@dataclass
+class Response:
+    status: int
+    data: object
+    # 前回の取得から内容が変わったか（304 なら False）
+    changed: bool
+
+
+class GitHubClient:
+    def __init__(self, repo: str, token: str | None = None, api_url: str | None = None, sleep=None, timeout=30):
+        self.repo = repo
+        self.token = token
+        self.api_url = (api_url or os.environ.get("GITHUB_API_URL") or DEFAULT_API_URL).rstrip("/")
+        self.sleep = sleep or time.sleep
+        self.timeout = timeout
+        # URL -> (ETag, JSON)
+        self._etags: dict[str, tuple[str, object]] = {}
+        self._no_redirect = urllib.request.build_opener(_NoRedirect)
+
+    def _headers(self) -> dict:
+        headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def url(self, path: str, params: dict | None = None) -> str:
+        url = f"{self.api_url}/repos/{self.repo}/{path.lstrip('/')}"
+        return f"{url}?{urllib.parse.urlencode(params)}" if params else url
+
+    def _open(self, req, opener=None):
+        """リクエストを送る. レート制限（403/429）なら待ってから送り直す."""
+        while True:
+            try:
+                return (opener or urllib.request.build_opener()).open(req, timeout=self.timeout)
+            except urllib.error.HTTPError as e:
+                wait = _rate_limit_wait(e)
+                if wait is None:
+                    raise
+                self.sleep(wait)
+
+    def get_json(self, path: str, params: dict | None = None) -> Response:
+        """JSON を取得する. 同じ URL の2回目以降は If-None-Match を付ける."""
+        url = self.url(path, params)
+        req = urllib.request.Request(url, headers=self._headers())
+        cached = self._etags.get(url)
+        if cached:
+            req.add_header("If-None-Match", cached[0])
+        try:
+            with self._open(req) as resp:
+                data = json.loads(resp.read() or b"null")
+                etag = resp.headers.get("ETag")
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached:
+                return Response(304, cached[1], False)
+            raise GitHubError(f"GET {url}: HTTP {e.code}") from e
+        except urllib.error.URLError as e:
+            raise GitHubError(f"GET {url}: {e.reason}") from e
+        changed = cached is None or cached[1] != data
+        if etag:
+            self._etags[url] = (etag, data)
+        return Response(200, data, changed)
+
+    def redirect_location(self, path: str) -> str:
+        """リダイレクトで返るエンドポイント（ログ・アーティファクト）のリダイレクト先 URL を返す.
+
+        リダイレクト先（ストレージ）にはトークンを送らないよう、自動では追わない。
+        """
+        url = self.url(path)
+        req = urllib.request.Request(url, headers=self._headers())
+        try:
+            with self._open(req, self._no_redirect):
+                pass
+        except urllib.error.HTTPError as e:
+            location = e.headers.get("Location") if e.code in (301, 302, 303, 307, 308) else None
+            if location:
+                return location
+            raise GitHubError(f"GET {url}: HTTP {e.code}") from e
+        except urllib.error.URLError as e:
+            raise GitHubError(f"GET {url}: {e.reason}") from e
+        raise GitHubError(f"GET {url}: リダイレクトされませんでした")
+
+    def get_text(self, path: str) -> str:
+        """テキスト（ジョブのログ）を取得する."""
+        location = self.redirect_location(path)
+        try:
+            with self._open(urllib.request.Request(location)) as resp:
+                return resp.read().decode("utf-8", errors="replace")
+        except urllib.error.HTTPError as e:
+            raise GitHubError(f"GET {location}: HTTP {e.code}") from e
+
+
+def _rate_limit_wait(error: urllib.error.HTTPError) -> float | None:
+    """レート制限によるエラーなら待つ秒数、そうでなければ None."""
+    if error.code not in (403, 429):
+        return None
+    retry_after = error.headers.get("Retry-After")
+    if retry_after:
+        return min(float(retry_after), MAX_RATE_LIMIT_WAIT)
+    if error.headers.get("X-RateLimit-Remaining") == "0":
+        reset = float(error.headers.get("X-RateLimit-Reset") or 0)
+        return min(max(reset - time.time(), 1.0), MAX_RATE_LIMIT_WAIT)
+    return None
+
+
+class Backoff:
+    """変化がない間は間隔を BACKOFF_FACTOR 倍ずつ伸ばし、変化があれば最短に戻す."""
+
+    def __init__(self, minimum: float = MIN_POLL_INTERVAL, maximum: float = MAX_POLL_INTERVAL):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.interval = minimum
+
+    def next(self, changed: bool) -> float:
+        self.interval = self.minimum if changed else min(self.interval * BACKOFF_FACTOR, self.maximum)
+        return self.interval
+
+
+def find_dispatched_run(
+    client: GitHubClient, workflow: str, dispatch_id: str, timeout: float = FIND_RUN_TIMEOUT
+) -> dict:
+    """run-name に dispatch_id を含む workflow の実行を探す. 現れるまでポーリングする."""
+    backoff = Backoff(minimum=1.0, maximum=10.0)
+    waited = 0.0
+    while True:
+        resp = client.get_json(f"actions/workflows/{workflow}/runs", {"event": "workflow_dispatch", "per_page": 30})
+        for run in resp.data.get("workflow_runs", []):
+            if dispatch_id in (run.get("display_title") or ""):
+                return run
+        if waited >= timeout:
+            raise GitHubError(
+                f"{workflow} の実行（dispatch_id={dispatch_id}）が見つかりません。"
+                "ワークフローが古い場合は signate-deploy init-repo --force で作り直してください。"
+            )
+        interval = backoff.next(resp.changed)
+        client.sleep(interval)
+        waited += interval
+
+
+def _duration(step: dict) -> str:
+    try:
+        start = time.strptime(step["started_at"], "%Y-%m-%dT%H:%M:%SZ")
+        end = time.strptime(step["completed_at"], "%Y-%m-%dT%H:%M:%SZ")
+    except (KeyError, TypeError, ValueError):
+        return ""
+    seconds = int(time.mktime(end) - time.mktime(start))
+    return f" ({seconds // 60}m{seconds % 60:02d}s)"
+
+
+def watch_run(client: GitHubClient, run_id: int, echo=print, logs: bool = True) -> dict:
+    """実行が完了するまでポーリングし、ステップの変化とジョブのログを表示する. 完了した run を返す."""
+    seen_steps: dict[tuple, str] = {}
+    logged_jobs: set[int] = set()
+    backoff = Backoff()
+    while True:
+        run_resp = client.get_json(f"actions/runs/{run_id}")
+        jobs_resp = client.get_json(f"actions/runs/{run_id}/jobs", {"per_page": 100})
+        for job in jobs_resp.data.get("jobs", []):
+            for step in job.get("steps") or []:
+                state = step.get("conclusion") or step.get("status")
+                key = (job["id"], step["number"])
+                if seen_steps.get(key) == state or state == "queued":
+                    continue
+                seen_steps[key] = state
+                suffix = _duration(step) if step.get("status") == "completed" else ""
+                echo(f"  [{job['name']}] {step['name']}: {state}{suffix}")
+            if logs and job.get("status") == "completed" and job["id"] not in logged_jobs:
+                logged_jobs.add(job["id"])
+                try:
+                    text = client.get_text(f"actions/jobs/{job['id']}/logs")
+                except GitHubError as e:
+                    echo(f"  [{job['name']}] ログを取得できませんでした: {e}")
+                else:
+                    echo(f"----- {job['name']} ({job.get('conclusion')}) -----")
+                    echo(text.rstrip("\n"))
+        run = run_resp.data
+        if run.get("status") == "completed":
+            return run
+        client.sleep(backoff.next(run_resp.changed or jobs_resp.changed))
+
+
+def client_from_env() -> GitHubClient:
+    repo = resolve_repo()
+    if not repo:
+        raise GitHubError("リポジトリを特定できません（GITHUB_REPOSITORY を設定するか gh auth login してください）")
+    return GitHubClient(repo, resolve_token())
+
+
+def wait_for_dispatch(client: GitHubClient, workflow: str, dispatch_id: str, echo=print, logs: bool = True) -> dict:
+    """dispatch_id で起動した実行を探して完了まで待ち、完了した run を返す."""
+    run = find_dispatched_run(client, workflow, dispatch_id)
+    echo(f"Run: {run.get('html_url') or run['id']}")
+    run = watch_run(client, run["id"], echo=echo, logs=logs)
+    echo(f"Conclusion: {run.get('conclusion')}")
+    return run
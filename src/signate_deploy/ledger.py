@@ -0,0 +1,198 @@
+"""提出の台帳（COMPETITION_DIR/submissions.jsonl）.
+
+ワークフローの Submit ステップ（``python -m signate_deploy.ledger``）は、提出前に
+submission.csv の SHA-256 を台帳と照合し、同じ内容を提出済みならスキップ（または警告）する。
+提出したら内容のハッシュ・メモ・実行 ID・CV スコア・時刻を1行の JSON として追記し、
+ワークフローがリポジトリにコミットする。
+
+- 台帳は追記のみの JSON Lines なので、.gitattributes の ``merge=union`` で
+  matrix の並列ジョブからの追記も衝突せずにマージできる。
+- 検索はローカルの SQLite の索引（.submissions-index.sqlite, コミットしない）で行う。
+  索引は台帳の読み込み済みの位置を覚えていて、追記された行だけを取り込む
+  （途中が書き換わっていたら作り直す）。台帳が変わっていなければ台帳を読まない。
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import time
+from contextlib import closing
+from pathlib import Path
+
+import click
+
+from signate_deploy.downloader import file_sha256
+
+LEDGER_FILENAME = "submissions.jsonl"
+INDEX_FILENAME = ".submissions-index.sqlite"
+# train.py が書き出す CV スコア（{"metric": ..., "score": ...}）
+CV_SCORE_FILENAME = "cv-score.json"
+ON_DUPLICATE = ["skip", "warn"]
+SORT_COLUMNS = {"time": "submitted_at", "cv": "cv_score"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS submissions (
+    line INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    submitted_at TEXT NOT NULL,
+    cv_score REAL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS submissions_sha256 ON submissions (sha256);
+CREATE INDEX IF NOT EXISTS submissions_submitted_at ON submissions (submitted_at);
+CREATE INDEX IF NOT EXISTS submissions_cv_score ON submissions (cv_score);
+"""
+
+
+class Ledger:
+    def __init__(self, competition_dir: Path):
+        self.competition_dir = Path(competition_dir)
+        self.path = self.competition_dir / LEDGER_FILENAME
+        self.index_path = self.competition_dir / INDEX_FILENAME
+
+    def append(self, entry: dict) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, sort_keys=True) + "\n")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.index_path)
+        conn.executescript(_SCHEMA)
+        self._sync(conn)
+        return conn
+
+    def _sync(self, conn: sqlite3.Connection) -> None:
+        """台帳の追記分を索引に取り込む."""
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            stat = None
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}" if stat else ""
+        if meta.get("signature", "") == signature:
+            return
+
+        offset, lines = int(meta.get("offset", 0)), int(meta.get("lines", 0))
+        data = self.path.read_bytes() if stat else b""
+        h = hashlib.sha256(data[:offset])
+        if len(data) < offset or h.hexdigest() != meta.get("prefix_sha256"):
+            # 途中が書き換わった（マージ・手での編集）. 最初から作り直す
+            conn.execute("DELETE FROM submissions")
+            offset, lines, h = 0, 0, hashlib.sha256()
+        # 書きかけの最後の行は次回に回す
+        new = data[offset:data.rfind(b"\n") + 1] if data.rfind(b"\n") >= offset else b""
+        rows = []
+        for raw in new.splitlines():
+            lines += 1
+            try:
+                entry = json.loads(raw)
+                rows.append((lines, entry["sha256"], entry["submitted_at"], entry.get("cv_score"), raw.decode()))
+            except (ValueError, KeyError, TypeError):
+                # 壊れた行（マージの衝突マーカーなど）は飛ばす
+                continue
+        conn.executemany("INSERT INTO submissions VALUES (?, ?, ?, ?, ?)", rows)
+        h.update(new)
+        meta = {"offset": offset + len(new), "lines": lines, "prefix_sha256": h.hexdigest(), "signature": signature}
+        conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [(k, str(v)) for k, v in meta.items()])
+        conn.commit()
+
+    def find(self, sha256: str) -> list[dict]:
+        """内容のハッシュが sha256 の提出を古い順に返す."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT entry FROM submissions WHERE sha256 = ? ORDER BY submitted_at", (sha256,)
+            ).fetchall()
+        return [json.loads(entry) for (entry,) in rows]
+
+    def history(self, limit: int | None = 20, sort: str = "time", sha256_prefix: str | None = None) -> list[dict]:
+        """提出を新しい順（sort="cv" なら CV スコアの高い順. スコアのないものは除く）に返す."""
+        column = SORT_COLUMNS[sort]
+        where, params = [f"{column} IS NOT NULL"], []
+        if sha256_prefix:
+            # 前方一致を索引の範囲検索にする（ハッシュは小文字の16進）
+            where.append("sha256 >= ? AND sha256 < ?")
+            params += [sha256_prefix.lower(), sha256_prefix.lower() + "g"]
+        query = f"SELECT entry FROM submissions WHERE {' AND '.join(where)} ORDER BY {column} DESC, line DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with closing(self._connect()) as conn:
+            return [json.loads(entry) for (entry,) in conn.execute(query, params)]
+
+    def count(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM submissions").fetchone()[0]
+
+
+def read_cv_score(competition_dir: Path) -> tuple[str | None, float | None]:
+    """train.py が書き出した (指標名, CV スコア). なければ (None, None)."""
+    try:
+        score = json.loads((Path(competition_dir) / CV_SCORE_FILENAME).read_text())
+        return score.get("metric"), float(score["score"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, None
+
+
+def make_entry(submission: Path, competition_dir: Path, memo: str = "", run_id: str = "") -> dict:
+    metric, cv_score = read_cv_score(competition_dir)
+    return {
+        "sha256": file_sha256(submission),
+        "file": Path(submission).name,
+        "memo": memo,
+        "run_id": run_id,
+        "metric": metric,
+        "cv_score": cv_score,
+        "submitted_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def describe(entry: dict) -> str:
+    cv = f"{entry['metric'] or 'cv'}={entry['cv_score']:.5f}" if entry.get("cv_score") is not None else "cv=-"
+    return f"{entry['submitted_at']}  {entry['sha256'][:12]}  {cv}  run {entry.get('run_id') or '-'}  {entry.get('memo') or ''}"
+
+
+def _set_output(name: str, value: str) -> None:
+    """GitHub Actions のステップ出力を設定する（Actions の外では何もしない）."""
+    path = os.environ.get("GITHUB_OUTPUT")
+    if path:
+        with open(path, "a") as f:
+            f.write(f"{name}={value}\n")
+
+
+@click.command()
+@click.argument("competition_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--memo", default="", help="提出メモ")
+@click.option("--run-id", default=lambda: os.environ.get("GITHUB_RUN_ID", ""), help="台帳に記録する実行 ID")
+@click.option(
+    "--on-duplicate",
+    type=click.Choice(ON_DUPLICATE),
+    default="skip",
+    show_default=True,
+    help="同じ内容を提出済みのとき、提出しない（skip）か警告して提出する（warn）か",
+)
+def main(competition_dir, memo, run_id, on_duplicate):
+    """台帳と照合してから COMPETITION_DIR/submission.csv を提出し、台帳に記録する."""
+    submission = competition_dir / "submission.csv"
+    ledger = Ledger(competition_dir)
+    entry = make_entry(submission, competition_dir, memo, run_id)
+    previous = ledger.find(entry["sha256"])
+    if previous:
+        click.echo(f"::warning::同じ内容の submission.csv を提出済みです: {describe(previous[-1])}")
+        if on_duplicate == "skip":
+            _set_output("recorded", "false")
+            click.echo("提出をスキップしました（submit --allow-duplicate で提出できます）。")
+            return
+
+    config = json.loads((competition_dir / "signate-config.json").read_text())
+    result = subprocess.run(["signate", "submit", str(submission), "--task_key", config["task_key"], "--memo", memo])
+    if result.returncode != 0:
+        raise SystemExit(result.returncode)
+    ledger.append(entry)
+    _set_output("recorded", "true")
+    click.echo(f"Recorded: {describe(entry)}")
+
+
+if __name__ == "__main__":
+    main()
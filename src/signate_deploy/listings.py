@@ -0,0 +1,200 @@
+"""コンペ/タスク/ファイル一覧の取得とローカルキャッシュ.
+
+competition-list / task-list / file-list の結果を、ユーザーキャッシュディレクトリの
+SQLite (metadata.sqlite3) にエントリごとの TTL 付きで保存する。
+表形式の出力はそのまま保存して再表示に使い、--json 用に行単位へパースした結果も保存する。
+"""
+
+import json
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import click
+
+from signate_deploy.backend import get_backend
+from signate_deploy.cache import user_cache_dir
+
+CACHE_FILENAME = "metadata.sqlite3"
+
+# 一覧の種類ごとの signate CLI 引数と既定 TTL [秒]
+KINDS = {
+    "competitions": {"args": lambda key: ["competition-list"], "ttl": 60 * 60},
+    "tasks": {"args": lambda key: ["task-list", "--competition_key", key], "ttl": 24 * 60 * 60},
+    "files": {"args": lambda key: ["file-list", "--task_key", key], "ttl": 24 * 60 * 60},
+}
+
+_SEPARATOR_RE = re.compile(r"^[\s\-+=|:]*$")
+_BORDER_CHARS = "|│┃"
+
+
+@dataclass
+class Listing:
+    """一覧1件分（例: あるコンペのタスク一覧）のキャッシュエントリ."""
+
+    kind: str
+    key: str
+    stdout: str
+    rows: list[dict] = field(default_factory=list)
+    fetched_at: float = 0.0
+    ttl: float = 0.0
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.fetched_at + self.ttl
+
+    def to_json(self) -> dict:
+        return {
+            "kind": self.kind,
+            "key": self.key,
+            "fetched_at": self.fetched_at,
+            "expired": self.expired,
+            "rows": self.rows,
+        }
+
+
+def parse_table(text: str) -> list[dict]:
+    """signate CLI の表形式出力を行ごとの dict に変換する.
+
+    罫線（---, +==+ 等）の行は読み飛ばし、列は | か2つ以上の空白で区切られているものとする。
+    最初のデータ行をヘッダとして扱う。
+    """
+    lines = [line for line in text.splitlines() if line.strip() and not _SEPARATOR_RE.match(line)]
+    if not lines:
+        return []
+
+    def split(line: str) -> list[str]:
+        stripped = line.strip()
+        if any(c in stripped for c in _BORDER_CHARS):
+            cells = re.split(f"[{_BORDER_CHARS}]", stripped.strip(_BORDER_CHARS))
+        else:
+            cells = re.split(r"\s{2,}", stripped)
+        return [c.strip() for c in cells]
+
+    headers = split(lines[0])
+    rows = []
+    for line in lines[1:]:
+        cells = split(line)
+        if len(cells) != len(headers):
+            continue
+        rows.append(dict(zip(headers, cells)))
+    return rows
+
+
+class MetadataCache:
+    """一覧キャッシュ（SQLite）. 読み書きに失敗したらキャッシュが無いものとして続行する."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or user_cache_dir() / CACHE_FILENAME
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS listings ("
+            " kind TEXT NOT NULL, key TEXT NOT NULL, fetched_at REAL NOT NULL,"
+            " ttl REAL NOT NULL, stdout TEXT NOT NULL, rows TEXT NOT NULL,"
+            " PRIMARY KEY (kind, key))"
+        )
+        return conn
+
+    def get(self, kind: str, key: str) -> Listing | None:
+        """エントリを返す（期限切れでも返す）. 無ければ None."""
+        try:
+            conn = self._connect()
+        except (sqlite3.Error, OSError):
+            return None
+        try:
+            row = conn.execute(
+                "SELECT fetched_at, ttl, stdout, rows FROM listings WHERE kind = ? AND key = ?",
+                (kind, key),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        fetched_at, ttl, stdout, rows = row
+        return Listing(kind, key, stdout, json.loads(rows), fetched_at, ttl)
+
+    def put(self, listing: Listing) -> None:
+        try:
+            conn = self._connect()
+        except (sqlite3.Error, OSError):
+            return
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        listing.kind,
+                        listing.key,
+                        listing.fetched_at,
+                        listing.ttl,
+                        listing.stdout,
+                        json.dumps(listing.rows, ensure_ascii=False),
+                    ),
+                )
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+
+
+def fetch_listing(
+    kind: str,
+    key: str = "",
+    refresh: bool = False,
+    offline: bool = False,
+    use_cache: bool = True,
+    cache: MetadataCache | None = None,
+    concurrent: bool = False,
+) -> Listing | None:
+    """一覧を取得する. 失敗時はエラーを表示して None を返す.
+
+    期限内のキャッシュがあればそれを返す。refresh=True なら常に signate から取得し直す。
+    offline=True ならキャッシュのみを参照し、期限切れでも返す。
+    複数スレッドから同時に呼ぶ場合は concurrent=True を渡す（get_backend を参照）。
+    """
+    cache = cache or MetadataCache()
+
+    if not refresh or offline:
+        cached = cache.get(kind, key)
+        if cached is not None and (offline or not cached.expired):
+            if cached.expired:
+                click.echo(f"Warning: {kind} '{key}' のキャッシュは期限切れです（オフライン）。", err=True)
+            return cached
+        if offline:
+            click.echo(f"Error: {kind} '{key}' はキャッシュにありません（--offline）。", err=True)
+            return None
+
+    backend = get_backend(use_cache=use_cache, concurrent=concurrent)
+    if backend is None:
+        click.echo("Error: signate CLIが見つかりません。pip install signate を実行してください。", err=True)
+        return None
+
+    spec = KINDS[kind]
+    result = backend.run(spec["args"](key), capture=True)
+    if result.returncode != 0:
+        click.echo(f"Error: signate {spec['args'](key)[0]} に失敗しました。", err=True)
+        return None
+
+    listing = Listing(kind, key, result.stdout, parse_table(result.stdout), time.time(), spec["ttl"])
+    # signate は HTTP/API エラーでも終了コード 0 で終わることがあるので、
+    # 2列以上の表として読めない出力（エラーメッセージ等）はキャッシュしない
+    if listing.rows and len(listing.rows[0]) > 1:
+        cache.put(listing)
+    else:
+        click.echo(f"Warning: signate {spec['args'](key)[0]} の出力を表として読めないため、キャッシュしません。", err=True)
+    return listing
+
+
+def echo_listing(listing: Listing, as_json: bool) -> None:
+    """一覧を表形式（signate CLI の出力そのまま）または JSON で表示する."""
+    if as_json:
+        click.echo(json.dumps(listing.to_json(), indent=2, ensure_ascii=False))
+    else:
+        click.echo(listing.stdout, nl=False)
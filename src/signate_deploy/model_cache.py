@@ -0,0 +1,119 @@
+"""fold ごとの学習済みモデルと予測のキャッシュ（init で生成される train.py から使う）.
+
+    model_cache = FoldModelCache("my-comp/.model-cache", "my-comp/data")
+    key = model_cache.key(fold, params, feature_key, y, tr_idx, val_idx)
+    cached = model_cache.get(key)
+    if cached is not None and cached.reusable(num_boost_round):
+        val_pred, test_pred = cached.val_pred(), cached.test_pred()
+    ...
+    model_cache.put(key, booster, val_pred, test_pred, num_boost_round)
+
+キーは「data/ の内容」「params（ラウンド数・スレッド数などを除く）」「fold」と
+呼び出し側が渡す値（特徴量のキャッシュキー、学習に使う DataFrame の列構成、
+目的変数や fold の添字の配列など）のハッシュ。
+ラウンド数をキーに含めないので、ラウンド数だけを増やした場合は前回のモデルから
+続きを学習できる（FoldModel.continuable / lgb.train(init_model=...)）。
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from signate_deploy.feature_cache import DiskCache
+
+# キャッシュ形式を変えたら上げる（古いエントリを使わない）
+CACHE_VERSION = 1
+MODEL_FILENAME = "model.txt"
+# 学習結果を変えない（または続きの学習で調整する）パラメータはキーに含めない
+VOLATILE_PARAMS = {
+    "n_estimators",
+    "num_boost_round",
+    "num_iterations",
+    "n_jobs",
+    "num_threads",
+    "verbosity",
+    "verbose",
+}
+
+
+def _digest(part) -> bytes:
+    if isinstance(part, np.ndarray):
+        return f"ndarray{part.shape}{part.dtype}:".encode() + hashlib.sha256(np.ascontiguousarray(part)).digest()
+    if hasattr(part, "columns") and hasattr(part, "dtypes"):
+        # DataFrame は形・列名・dtype をキーにする（列の追加・削除・型の変更で学習し直す）
+        return f"DataFrame{part.shape}{list(zip(map(str, part.columns), map(str, part.dtypes)))}".encode()
+    return repr(part).encode()
+
+
+class FoldModel:
+    """キャッシュ済みの fold の学習結果."""
+
+    def __init__(self, entry_dir: Path, meta: dict):
+        self.entry_dir = entry_dir
+        self.model_path = entry_dir / MODEL_FILENAME
+        # 要求したラウンド数と、実際に作られた木の数（早期終了すると少なくなる）
+        self.num_boost_round = meta["num_boost_round"]
+        self.trained_rounds = meta["trained_rounds"]
+        self.best_iteration = meta["best_iteration"]
+
+    @property
+    def stopped_early(self) -> bool:
+        return self.trained_rounds < self.num_boost_round
+
+    def reusable(self, num_boost_round: int) -> bool:
+        """num_boost_round で学習し直しても同じ結果になるなら True.
+
+        ラウンド数が同じか、早期終了していて num_boost_round がそのラウンド数以上のとき。
+        """
+        return num_boost_round == self.num_boost_round or (
+            self.stopped_early and num_boost_round >= self.trained_rounds
+        )
+
+    def continuable(self, num_boost_round: int) -> bool:
+        """早期終了せずに前回のラウンド数を使い切っていて、今回それより多く学習するなら True."""
+        return not self.stopped_early and num_boost_round > self.trained_rounds
+
+    def val_pred(self) -> np.ndarray:
+        return np.load(self.entry_dir / "val_pred.npy")
+
+    def test_pred(self) -> np.ndarray:
+        return np.load(self.entry_dir / "test_pred.npy")
+
+
+class FoldModelCache(DiskCache):
+    """LightGBM の fold モデルと OOF / テスト予測を保存する."""
+
+    def key(self, fold: int, params: dict, *parts) -> str:
+        h = hashlib.sha256()
+        h.update(f"v{CACHE_VERSION}\nfold={fold}\n".encode())
+        h.update(self.data_fingerprint.encode())
+        stable = {name: value for name, value in params.items() if name not in VOLATILE_PARAMS}
+        h.update(json.dumps(stable, sort_keys=True, default=repr).encode())
+        for part in parts:
+            h.update(_digest(part))
+        return h.hexdigest()[:32]
+
+    def get(self, key: str) -> FoldModel | None:
+        try:
+            meta = self._read_meta(key)
+        except KeyError:
+            return None
+        return FoldModel(self.cache_dir / key, meta)
+
+    def put(self, key: str, booster, val_pred: np.ndarray, test_pred: np.ndarray, num_boost_round: int) -> None:
+        def write(tmp: Path) -> dict:
+            # 続きを学習できるよう、早期終了後の木も含めて全て保存する
+            booster.save_model(str(tmp / MODEL_FILENAME), num_iteration=-1)
+            np.save(tmp / "val_pred.npy", val_pred, allow_pickle=False)
+            np.save(tmp / "test_pred.npy", test_pred, allow_pickle=False)
+            return {
+                "num_boost_round": num_boost_round,
+                "trained_rounds": booster.current_iteration(),
+                "best_iteration": booster.best_iteration,
+                "created_at": time.time(),
+            }
+
+        self._write_entry(key, write)
@@ -0,0 +1,61 @@
+"""列ごとの .npy ファイルからなるデータストアの読み込み.
+
+``python -m signate_deploy.convert <data_dir> --format npy`` が CSV ごとに作る
+``<name>.npystore/`` を開く。各列は np.load(mmap_mode="r") で開くので、
+実際に触れた範囲だけがメモリに読み込まれる。
+
+    store = NpyStore("my-comp/data/train.npystore")
+    store.columns            # 列名
+    store.column("target")   # 1列分の memmap
+    store.rows(["f0", "f1"], idx)  # 指定行・列の float32 配列 (len(idx), 2)
+
+文字列列はカテゴリ番号(int32, 欠損は -1)で保存されている。元の値は store.categories[列名]。
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+META_FILENAME = "meta.json"
+
+
+class NpyStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = json.loads((self.path / META_FILENAME).read_text())
+        self.n_rows = meta["rows"]
+        self._entries = {entry["name"]: entry for entry in meta["columns"]}
+        self.columns = list(self._entries)
+        self.dtypes = {name: entry["dtype"] for name, entry in self._entries.items()}
+        self.categories = {
+            name: entry["categories"] for name, entry in self._entries.items() if "categories" in entry
+        }
+        self._memmaps: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._memmaps:
+            self._memmaps[name] = np.load(self.path / self._entries[name]["file"], mmap_mode="r")
+        return self._memmaps[name]
+
+    def rows(self, columns: list[str], index=None, dtype=np.float32) -> np.ndarray:
+        """columns の index 行を (行数, 列数) の配列にして返す. index は int / slice / 添字配列.
+
+        int のときは 1 次元（1行分）。カテゴリ番号の -1 は NaN にする。
+        """
+        single = isinstance(index, (int, np.integer))
+        if index is None:
+            index = slice(None)
+        elif single:
+            index = [index]
+        first = self.column(columns[0])[index] if columns else np.empty(0)
+        out = np.empty((len(first), len(columns)), dtype=dtype)
+        for j, name in enumerate(columns):
+            values = first if j == 0 else self.column(name)[index]
+            out[:, j] = values
+            if name in self.categories:
+                out[values < 0, j] = np.nan
+        return out[0] if single else out
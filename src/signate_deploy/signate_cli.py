@@ -1,13 +1,22 @@
 """signate CLIの実行ファイルを探すユーティリティ."""
 
+import json
+import os
 import shutil
 import site
 import sys
 from pathlib import Path
 
+from signate_deploy.cache import store_text, user_cache_dir
 
-def find_signate_exe() -> str | None:
-    """signate CLIの実行ファイルを探す."""
+CACHE_FILENAME = "signate-exe.json"
+
+# (PATH, sys.executable) -> (実行ファイルのパス, mtime)
+_memo: dict[tuple[str, str], tuple[str, float | None]] = {}
+
+
+def _search_signate_exe() -> str | None:
+    """ファイルシステムを探索して signate CLI の実行ファイルを探す."""
     # 1. PATHが通っていれば即返す
     found = shutil.which("signate")
     if found:
@@ -34,3 +43,68 @@ def find_signate_exe() -> str | None:
                 return str(candidate)
 
     return None
+
+
+def _mtime(path: str) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _cache_path() -> Path:
+    return user_cache_dir() / CACHE_FILENAME
+
+
+def _load_cached(env_key: tuple[str, str]) -> str | None:
+    """ディスクキャッシュを読み、キー（PATH・sys.executable・mtime）が一致すればパスを返す."""
+    try:
+        entry = json.loads(_cache_path().read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict):
+        return None
+    if (entry.get("PATH"), entry.get("executable")) != env_key:
+        return None
+    exe = entry.get("signate_exe")
+    if not isinstance(exe, str) or _mtime(exe) != entry.get("mtime"):
+        return None
+    return exe
+
+
+def _store_cached(env_key: tuple[str, str], exe: str) -> None:
+    entry = {
+        "PATH": env_key[0],
+        "executable": env_key[1],
+        "signate_exe": exe,
+        "mtime": _mtime(exe),
+    }
+    store_text(_cache_path(), json.dumps(entry))
+
+
+def find_signate_exe(use_cache: bool = True) -> str | None:
+    """signate CLIの実行ファイルを探す.
+
+    結果はプロセス内とユーザーキャッシュディレクトリにキャッシュされる。
+    PATH・sys.executable・実行ファイルの mtime のいずれかが変わると再探索する。
+    use_cache=False でキャッシュを読まずに探索する（結果はキャッシュに保存する）。
+    見つからなかった結果はキャッシュしない。
+    """
+    env_key = (os.environ.get("PATH", ""), sys.executable)
+
+    if use_cache:
+        memo = _memo.get(env_key)
+        if memo is not None and _mtime(memo[0]) == memo[1]:
+            return memo[0]
+        exe = _load_cached(env_key)
+        if exe is not None:
+            _memo[env_key] = (exe, _mtime(exe))
+            return exe
+
+    exe = _search_signate_exe()
+    if exe is None:
+        _memo.pop(env_key, None)
+        return None
+    _memo[env_key] = (exe, _mtime(exe))
+    _store_cached(env_key, exe)
+    return exe
@@ -0,0 +1,194 @@
+"""提出前に submission.csv の形式を検証する.
+
+提出回数の上限がある SIGNATE に壊れたファイルを送らないよう、Submit の前に次を調べる。
+
+- 列数とヘッダ行の有無（sample_submit があればそれに合わせる。なければ ヘッダなし・2列）
+- 行数と id の集合（重複・過不足）
+- 予測列が数値で、NaN / inf を含まないこと
+
+id の正解は sample_submit（signate-config.json の file_keys の sample_submit）の1列目、
+なければ test の id 列（convert 済みなら Parquet / Feather）から取る。
+提出ファイルはチャンク単位で読み、チャンクごとにベクトル化した判定を行う。
+
+pandas が必要。
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from signate_deploy.downloader import MANIFEST_FILENAME, load_manifest
+
+ID_COLUMN = "id"
+SAMPLE_SUBMIT = "sample_submit"
+DEFAULT_CHUNKSIZE = 1_000_000
+# エラーメッセージに挙げる例の数
+MAX_EXAMPLES = 3
+
+
+@dataclass
+class ValidationResult:
+    path: Path
+    rows: int = 0
+    errors: list[str] = field(default_factory=list)
+    # id の正解の出どころ（なければ None）
+    reference: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+@dataclass
+class Expected:
+    """提出ファイルに期待する形式."""
+
+    ids: object = None
+    n_columns: int = 2
+    header: bool = False
+    reference: str | None = None
+
+
+def _examples(values) -> str:
+    shown = ", ".join(repr(v.item() if hasattr(v, "item") else v) for v in list(values[:MAX_EXAMPLES]))
+    return shown + (", ..." if len(values) > MAX_EXAMPLES else "")
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _first_row(path: Path) -> list[str]:
+    with open(path, newline="") as f:
+        return f.readline().rstrip("\r\n").split(",")
+
+
+def _has_header(fields: list[str]) -> bool:
+    """1行目の予測列が数値でなければヘッダ行とみなす."""
+    return any(not _is_number(value) for value in fields[1:])
+
+
+def find_data_file(competition_dir: Path, name: str) -> Path | None:
+    """file_keys の NAME でダウンロードしたファイルを探す（signate-manifest.json、なければ data/NAME.csv）."""
+    competition_dir = Path(competition_dir)
+    for entry in load_manifest(competition_dir / MANIFEST_FILENAME).values():
+        path = competition_dir / entry.get("path", "")
+        if entry.get("name") == name and path.suffix == ".csv" and path.exists():
+            return path
+    path = competition_dir / "data" / f"{name}.csv"
+    return path if path.exists() else None
+
+
+def expected_format(competition_dir: Path, id_column: str = ID_COLUMN) -> Expected:
+    """sample_submit（なければ test）から提出ファイルに期待する形式を調べる."""
+    import pandas as pd
+
+    competition_dir = Path(competition_dir)
+    sample = find_data_file(competition_dir, SAMPLE_SUBMIT)
+    if sample is not None:
+        fields = _first_row(sample)
+        header = _has_header(fields)
+        ids = pd.read_csv(sample, header=0 if header else None, usecols=[0], dtype=str).iloc[:, 0]
+        return Expected(_as_ids(ids), len(fields), header, sample.name)
+
+    data_dir = competition_dir / "data"
+    for ext, reader in [(".parquet", pd.read_parquet), (".feather", pd.read_feather)]:
+        path = data_dir / f"test{ext}"
+        if path.exists():
+            return Expected(reader(path, columns=[id_column])[id_column].to_numpy(), reference=path.name)
+    test = find_data_file(competition_dir, "test")
+    if test is not None:
+        return Expected(pd.read_csv(test, usecols=[id_column])[id_column].to_numpy(), reference=test.name)
+    return Expected()
+
+
+def _as_ids(ids):
+    """文字列で読んだ id を、全て整数なら整数の配列にする（先頭ゼロなどがあれば文字列のまま）."""
+    import pandas as pd
+
+    numeric = pd.to_numeric(ids, errors="coerce")
+    if numeric.notna().all() and (numeric.astype("int64").astype(str) == ids).all():
+        return numeric.astype("int64").to_numpy()
+    return ids.to_numpy()
+
+
+def validate_submission(path: Path, expected: Expected | None = None, chunksize: int = DEFAULT_CHUNKSIZE) -> ValidationResult:
+    """path の提出ファイルを expected と照合する."""
+    import numpy as np
+    import pandas as pd
+
+    expected = expected or Expected()
+    path = Path(path)
+    result = ValidationResult(path, reference=expected.reference)
+    errors = result.errors
+    if not path.exists() or path.stat().st_size == 0:
+        errors.append(f"{path} がないか空です")
+        return result
+
+    fields = _first_row(path)
+    if len(fields) != expected.n_columns:
+        errors.append(f"列数が {len(fields)} です（期待: {expected.n_columns}）")
+        return result
+    if _has_header(fields) != expected.header:
+        errors.append(f"ヘッダ行が{'あります' if not expected.header else 'ありません'}: {','.join(fields)!r}")
+        return result
+
+    integer_ids = expected.ids is not None and np.issubdtype(np.asarray(expected.ids).dtype, np.integer)
+    id_chunks = []
+    bad_ids, bad_preds = [], []
+    try:
+        reader = pd.read_csv(
+            path,
+            header=None,
+            skiprows=1 if expected.header else 0,
+            chunksize=chunksize,
+            dtype=None if integer_ids else {0: str},
+        )
+        for chunk in reader:
+            start = result.rows
+            result.rows += len(chunk)
+            ids = chunk.iloc[:, 0]
+            if integer_ids and not pd.api.types.is_integer_dtype(ids):
+                bad = ~ids.astype(str).str.fullmatch(r"-?\d+")
+                bad_ids.extend((start + np.flatnonzero(bad.to_numpy()) + 1 + expected.header).tolist())
+                ids = pd.to_numeric(ids, errors="coerce").dropna()
+            id_chunks.append(ids.to_numpy())
+            for col in range(1, chunk.shape[1]):
+                values = pd.to_numeric(chunk.iloc[:, col], errors="coerce").to_numpy(dtype=np.float64)
+                rows = np.flatnonzero(~np.isfinite(values))
+                if len(rows):
+                    bad_preds.extend((start + rows + 1 + expected.header).tolist())
+    except (pd.errors.ParserError, ValueError) as e:
+        errors.append(f"CSV として読めません: {e}")
+        return result
+
+    if bad_ids:
+        errors.append(f"整数でない id が {len(bad_ids)} 行あります（行: {_examples(bad_ids)}）")
+    if bad_preds:
+        errors.append(f"数値でない・NaN・inf の予測が {len(bad_preds)} 件あります（行: {_examples(bad_preds)}）")
+
+    ids = np.concatenate(id_chunks) if id_chunks else np.array([])
+    # 整数の id はソートして比べれば足りる（一致しなかったときだけ内訳を調べる）
+    if integer_ids and len(ids) == len(expected.ids) and np.array_equal(np.sort(ids), np.sort(expected.ids)):
+        return result
+
+    ids = pd.Series(ids)
+    duplicated = ids[ids.duplicated()].unique()
+    if len(duplicated):
+        errors.append(f"重複した id が {len(duplicated)} 個あります: {_examples(duplicated)}")
+    if expected.ids is None:
+        return result
+
+    reference = pd.Series(expected.ids)
+    if result.rows != len(reference):
+        errors.append(f"行数が {result.rows} です（期待: {len(reference)}、{expected.reference}）")
+    missing = reference[~reference.isin(ids)].to_numpy()
+    extra = ids[~ids.isin(reference)].to_numpy()
+    if len(missing):
+        errors.append(f"{expected.reference} の id が {len(missing)} 個足りません: {_examples(missing)}")
+    if len(extra):
+        errors.append(f"{expected.reference} にない id が {len(extra)} 個あります: {_examples(extra)}")
+    return result
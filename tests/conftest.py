@@ -0,0 +1,92 @@
+"""Shared test fixtures."""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """ユーザーキャッシュディレクトリをテストごとの一時ディレクトリに向ける."""
+    cache_dir = tmp_path / "user-cache"
+    monkeypatch.setenv("SIGNATE_DEPLOY_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture
+def fake_exe(tmp_path):
+    """tests/fake_signate.py をサブプロセスで起動する signate 実行ファイル."""
+    exe = tmp_path / "signate"
+    exe.write_text(
+        f"#!{sys.executable}\n"
+        "import runpy, sys\n"
+        f"sys.path.insert(0, {str(Path(__file__).parent)!r})\n"
+        "runpy.run_module('fake_signate', run_name='__main__')\n"
+    )
+    exe.chmod(0o755)
+    return str(exe)
+
+
+class FakeServer:
+    """テスト用のローカル HTTP サーバ.
+
+    routes に "パス" (GET) または "METHOD パス" をキーとして、
+    bytes / (status, bytes) / (status, bytes, headers) / それらを返す callable(handler) を登録する。
+    callable が自分でレスポンスを書き切った場合は FakeServer.HANDLED を返す。
+    受け取ったリクエストは requests に "パス" (GET) または "METHOD パス" として記録される。
+    """
+
+    HANDLED = object()
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                key = self.path if self.command == "GET" else f"{self.command} {self.path}"
+                length = int(self.headers.get("Content-Length") or 0)
+                self.body = self.rfile.read(length) if length else b""
+                server.requests.append(key)
+                route = server.routes.get(key)
+                if callable(route):
+                    route = route(self)
+                if route is FakeServer.HANDLED:
+                    return
+                if route is None:
+                    route = (404, b"not found")
+                if not isinstance(route, tuple):
+                    route = (200, route)
+                status, body, headers = (route + ({},))[:3]
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            do_GET = do_POST = do_HEAD = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def fake_server():
+    server = FakeServer()
+    yield server
+    server.close()
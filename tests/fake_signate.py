@@ -0,0 +1,96 @@
+"""オフラインテスト用の signate CLI スタンドイン.
+
+本物の signate CLI (0.13.1) と同じサブコマンド名・オプション名・列名を持ち、
+固定のデータを表形式で出力する。
+InProcessBackend にはこのモジュールの ``cli`` を渡し、SubprocessBackend には
+``python fake_signate.py`` を起動するラッパースクリプトを渡して使う。
+"""
+
+import os
+import urllib.error
+import urllib.request
+
+import click
+
+# download コマンドが取得しにいくローカル HTTP サーバ（テスト側で起動する）
+URL_ENV = "FAKE_SIGNATE_URL"
+
+COMPETITIONS = [
+    {"competition_key": "comp1", "name": "Demo Competition"},
+]
+TASKS = {
+    "comp1": [
+        {"public_key": "task1", "task_name": "Task One"},
+        {"public_key": "task2", "task_name": "Task Two"},
+    ],
+}
+FILES = {
+    "task1": [
+        {"public_key": "f_train", "file_name": "train.csv"},
+        {"public_key": "f_test", "file_name": "test.csv"},
+    ],
+    "task2": [
+        {"public_key": "f_sample", "file_name": "sample_submit.csv"},
+    ],
+}
+
+
+def _table(rows):
+    if not rows:
+        return
+    headers = list(rows[0])
+    click.echo("  ".join(headers))
+    for row in rows:
+        click.echo("  ".join(str(row[h]) for h in headers))
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command("competition-list")
+def competition_list():
+    _table(COMPETITIONS)
+
+
+@cli.command("task-list")
+@click.option("--competition_key", required=True)
+def task_list(competition_key):
+    if competition_key not in TASKS:
+        click.echo(f"competition not found: {competition_key}", err=True)
+        raise SystemExit(1)
+    _table(TASKS[competition_key])
+
+
+@cli.command("file-list")
+@click.option("--task_key", required=True)
+def file_list(task_key):
+    if task_key not in FILES:
+        click.echo(f"task not found: {task_key}", err=True)
+        raise SystemExit(1)
+    _table(FILES[task_key])
+
+
+@cli.command("download")
+@click.option("--task_key", required=True)
+@click.option("--file_key", required=True)
+def download(task_key, file_key):
+    file_name = next(
+        (f["file_name"] for files in FILES.values() for f in files if f["public_key"] == file_key),
+        file_key,
+    )
+    url = f"{os.environ[URL_ENV]}/{task_key}/{file_key}"
+    try:
+        with urllib.request.urlopen(url) as resp:
+            data = resp.read()
+    except urllib.error.HTTPError as e:
+        click.echo(f"download failed: {e.code}", err=True)
+        raise SystemExit(1)
+    with open(file_name, "wb") as f:
+        f.write(data)
+    click.echo(f"{file_name} was downloaded.")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,113 @@
+"""Tests for signate_deploy.artifact against a local server that honours Range requests."""
+
+import io
+import json
+import re
+import zipfile
+
+import pytest
+
+from signate_deploy.artifact import MANIFEST_FILENAME, sync_artifact
+from signate_deploy.downloader import DownloadError
+
+BLOB = "/blob/artifact.zip"
+
+
+def _zip(files: dict, compression=zipfile.ZIP_DEFLATED) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+def _serve(server, blob: bytes, ranges: list):
+    """blob を Range リクエストで返す. 受け取った Range を (start, end) として ranges に記録する."""
+
+    def route(handler):
+        m = re.fullmatch(r"bytes=(\d+)-(\d+)", handler.headers.get("Range") or "")
+        if not m:
+            return blob
+        start, end = int(m.group(1)), min(int(m.group(2)), len(blob) - 1)
+        ranges.append((start, end))
+        return (206, blob[start:end + 1], {"Content-Range": f"bytes {start}-{end}/{len(blob)}"})
+
+    server.routes[BLOB] = route
+    return f"{server.url}{BLOB}"
+
+
+def _member_data_ranges(ranges, blob):
+    """central directory より前（メンバーのデータ）に掛かる Range（0-0 のサイズ確認を除く）."""
+    start_dir = zipfile.ZipFile(io.BytesIO(blob)).start_dir
+    return [r for r in ranges if r != (0, 0) and r[0] < start_dir]
+
+
+FILES = {
+    "train.csv": b"id,x,y\n" + b"".join(b"%d,%d,%d\n" % (i, i * 7 % 13, i % 2) for i in range(5000)),
+    "test.csv": b"id,x\n1,2\n",
+    "sub/sample_submit.csv": b"1,0\n",
+    "empty.txt": b"",
+}
+
+
+def test_sync_writes_everything_then_nothing(fake_server, tmp_path):
+    blob = _zip(FILES)
+    ranges = []
+    url = _serve(fake_server, blob, ranges)
+    data_dir = tmp_path / "data"
+
+    result = sync_artifact(url, data_dir, workers=3, chunk_size=1024, echo=lambda _: None)
+    assert sorted(result.updated) == sorted(FILES)
+    for name, data in FILES.items():
+        assert (data_dir / name).read_bytes() == data
+    assert not list(data_dir.rglob("*.zpart")) and not list(data_dir.rglob("*.part"))
+    # train.csv は複数のチャンクに分けて取得される
+    assert len(_member_data_ranges(ranges, blob)) > len(FILES)
+
+    mtimes = {name: (data_dir / name).stat().st_mtime_ns for name in FILES}
+    ranges.clear()
+    result = sync_artifact(url, data_dir, echo=lambda _: None)
+    assert result.updated == [] and sorted(result.skipped) == sorted(FILES)
+    assert _member_data_ranges(ranges, blob) == []
+    assert {name: (data_dir / name).stat().st_mtime_ns for name in FILES} == mtimes
+
+
+def test_sync_fetches_only_changed_members(fake_server, tmp_path):
+    data_dir = tmp_path / "data"
+    ranges = []
+    sync_artifact(_serve(fake_server, _zip(FILES), ranges), data_dir, echo=lambda _: None)
+    before = (data_dir / "train.csv").stat().st_mtime_ns
+
+    changed = dict(FILES, **{"test.csv": b"id,x\n1,3\n", "new.csv": b"a\n"})
+    result = sync_artifact(_serve(fake_server, _zip(changed), ranges), data_dir, echo=lambda _: None)
+    assert sorted(result.updated) == ["new.csv", "test.csv"]
+    assert (data_dir / "test.csv").read_bytes() == b"id,x\n1,3\n"
+    assert (data_dir / "train.csv").stat().st_mtime_ns == before
+    manifest = json.loads((data_dir / MANIFEST_FILENAME).read_text())["files"]
+    assert set(manifest) == set(changed)
+
+
+def test_sync_refetches_locally_edited_file(fake_server, tmp_path):
+    data_dir = tmp_path / "data"
+    url = _serve(fake_server, _zip(FILES, zipfile.ZIP_STORED), [])
+    sync_artifact(url, data_dir, echo=lambda _: None)
+
+    # サイズを変えずに書き換えても（mtime が変わるので）CRC32 で検出する
+    (data_dir / "test.csv").write_bytes(b"id,x\n9,9\n")
+    result = sync_artifact(url, data_dir, echo=lambda _: None)
+    assert result.updated == ["test.csv"]
+    assert (data_dir / "test.csv").read_bytes() == FILES["test.csv"]
+
+
+def test_sync_rejects_unsafe_member(fake_server, tmp_path):
+    url = _serve(fake_server, _zip({"../evil.txt": b"x"}), [])
+    with pytest.raises(ValueError, match="unsafe member path"):
+        sync_artifact(url, tmp_path / "data", echo=lambda _: None)
+    assert not (tmp_path / "evil.txt").exists()
+
+
+def test_sync_requires_range_support(fake_server, tmp_path):
+    fake_server.routes[BLOB] = _zip(FILES)
+    with pytest.raises(DownloadError, match="Range"):
+        sync_artifact(f"{fake_server.url}{BLOB}", tmp_path / "data", echo=lambda _: None)
+
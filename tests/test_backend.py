@@ -0,0 +1,121 @@
+"""Tests for the signate CLI backends (in-process / subprocess)."""
+
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+from signate_deploy import backend as backend_mod
+from signate_deploy.backend import InProcessBackend, SubprocessBackend, get_backend
+from signate_deploy.cli import main
+
+from tests import fake_signate
+
+
+@pytest.fixture(params=["inprocess", "subprocess"])
+def any_backend(request, fake_exe):
+    if request.param == "inprocess":
+        return InProcessBackend(fake_signate.cli)
+    return SubprocessBackend(fake_exe)
+
+
+def test_run_captures_output(any_backend):
+    result = any_backend.run(["task-list", "--competition_key", "comp1"], capture=True)
+    assert result.returncode == 0
+    assert "task1" in result.stdout
+    assert "task2" in result.stdout
+
+
+def test_run_propagates_exit_code(any_backend):
+    result = any_backend.run(["file-list", "--task_key", "missing"], capture=True)
+    assert result.returncode == 1
+
+
+def test_inprocess_restores_argv():
+    argv = list(sys.argv)
+    InProcessBackend(fake_signate.cli).run(["competition-list"], capture=True)
+    assert sys.argv == argv
+
+
+def test_get_backend_falls_back_to_subprocess(fake_exe, monkeypatch):
+    monkeypatch.setattr(InProcessBackend, "load", classmethod(lambda cls: None))
+    monkeypatch.setattr(backend_mod, "find_signate_exe", lambda use_cache=True: fake_exe)
+    backend = get_backend()
+    assert isinstance(backend, SubprocessBackend)
+
+
+def test_get_backend_prefers_inprocess(monkeypatch):
+    monkeypatch.setattr(InProcessBackend, "load", classmethod(lambda cls: cls(fake_signate.cli)))
+    assert isinstance(get_backend(), InProcessBackend)
+
+
+def test_get_backend_env_forces_subprocess(fake_exe, monkeypatch):
+    monkeypatch.setenv(backend_mod.BACKEND_ENV, "subprocess")
+    monkeypatch.setattr(InProcessBackend, "load", classmethod(lambda cls: cls(fake_signate.cli)))
+    monkeypatch.setattr(backend_mod, "find_signate_exe", lambda use_cache=True: fake_exe)
+    assert isinstance(get_backend(), SubprocessBackend)
+
+
+def _argv_entry():
+    # 本物の signate.cli:main と同じく sys.argv を読む関数
+    return fake_signate.cli.main(prog_name="signate")
+
+
+def test_inprocess_concurrent_only_for_click_entry():
+    assert InProcessBackend(fake_signate.cli).concurrent
+    assert not InProcessBackend(_argv_entry).concurrent
+
+
+def test_get_backend_concurrent_uses_subprocess_for_argv_entry(fake_exe, monkeypatch):
+    monkeypatch.setattr(InProcessBackend, "load", classmethod(lambda cls: cls(_argv_entry)))
+    monkeypatch.setattr(backend_mod, "find_signate_exe", lambda use_cache=True: fake_exe)
+    assert isinstance(get_backend(), InProcessBackend)
+    assert isinstance(get_backend(concurrent=True), SubprocessBackend)
+
+
+def test_get_backend_concurrent_keeps_click_entry_inprocess(monkeypatch):
+    monkeypatch.setattr(InProcessBackend, "load", classmethod(lambda cls: cls(fake_signate.cli)))
+    assert isinstance(get_backend(concurrent=True), InProcessBackend)
+
+
+def test_get_backend_concurrent_falls_back_to_inprocess(monkeypatch):
+    monkeypatch.setattr(InProcessBackend, "load", classmethod(lambda cls: cls(_argv_entry)))
+    monkeypatch.setattr(backend_mod, "find_signate_exe", lambda use_cache=True: None)
+    backend = get_backend(concurrent=True)
+    assert isinstance(backend, InProcessBackend)
+    assert backend.run(["task-list", "--competition_key", "comp1"], capture=True).returncode == 0
+
+
+def test_get_backend_none_when_signate_missing(monkeypatch):
+    monkeypatch.setattr(InProcessBackend, "load", classmethod(lambda cls: None))
+    monkeypatch.setattr(backend_mod, "find_signate_exe", lambda use_cache=True: None)
+    assert get_backend() is None
+
+
+def test_task_list_command_uses_backend():
+    with patch("signate_deploy.listings.get_backend",
+               return_value=InProcessBackend(fake_signate.cli)):
+        runner = CliRunner()
+        result = runner.invoke(main, ["task-list", "comp1"])
+    assert result.exit_code == 0
+    assert "task1" in result.output
+
+
+def test_inprocess_faster_than_subprocess(fake_exe):
+    n = 5
+    timings = {}
+    for backend in [InProcessBackend(fake_signate.cli), SubprocessBackend(fake_exe)]:
+        start = time.perf_counter()
+        for _ in range(n):
+            backend.run(["file-list", "--task_key", "task1"], capture=True)
+        timings[backend.name] = (time.perf_counter() - start) / n
+    assert timings["inprocess"] < timings["subprocess"]
+
+
+def test_inprocess_converts_exceptions_to_exit_code():
+    def broken():
+        raise RuntimeError("boom")
+
+    result = InProcessBackend(broken).run(["competition-list"], capture=True)
+    assert result.returncode == 1
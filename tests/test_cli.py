@@ -0,0 +1,65 @@
+"""Tests for the CLI entry point (lazy subcommand loading & startup time)."""
+
+import subprocess
+import sys
+
+from click.testing import CliRunner
+from signate_deploy.cli import main
+
+# signate_deploy 自身（click を除く）の import にかけてよい時間の上限 [us]
+STARTUP_BUDGET_US = 20_000
+
+
+def _importtime(code: str) -> dict[str, tuple[int, int]]:
+    """python -X importtime の出力を {module: (self_us, cumulative_us)} にパースする."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def test_version_does_not_import_subcommands():
+    times = _importtime("from signate_deploy.cli import main; main(['--version'], standalone_mode=False)")
+    assert "signate_deploy.cli" in times
+    assert not [m for m in times if m.startswith("signate_deploy.commands")]
+
+
+def test_startup_within_budget():
+    times = _importtime("import signate_deploy.cli")
+    own_us = sum(self_us for name, (self_us, _) in times.items() if name.startswith("signate_deploy"))
+    assert own_us < STARTUP_BUDGET_US, f"signate_deploy import took {own_us}us (budget {STARTUP_BUDGET_US}us)"
+
+
+def test_subcommand_loaded_on_invoke():
+    code = (
+        "import sys\n"
+        "from signate_deploy.cli import main\n"
+        "main(['submit', '--help'], standalone_mode=False)\n"
+        "print(sorted(m for m in sys.modules if m.startswith('signate_deploy.commands.')))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "['signate_deploy.commands.submit']"
+
+
+def test_help_lists_all_commands():
+    runner = CliRunner()
+    result = runner.invoke(main, ["--help"])
+    assert result.exit_code == 0
+    for name in ["init-repo", "init", "submit", "download", "setup-token",
+                 "competition-list", "task-list", "file-list"]:
+        assert name in result.output
+
+
+def test_unknown_command_fails():
+    runner = CliRunner()
+    result = runner.invoke(main, ["no-such-command"])
+    assert result.exit_code != 0
@@ -0,0 +1,124 @@
+"""Tests for signate_deploy.convert."""
+
+import zipfile
+
+import pytest
+from click.testing import CliRunner
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from signate_deploy.convert import convert_csvs, extract_archives, infer_dtypes, main  # noqa: E402
+
+
+def _write_csv(path):
+    pd.DataFrame({
+        "id": range(1000),
+        "small": [i % 100 for i in range(1000)],
+        "neg": [-(i % 200) for i in range(1000)],
+        "x": [i / 3 for i in range(1000)],
+        "name": [f"n{i % 7}" for i in range(1000)],
+    }).to_csv(path, index=False)
+
+
+def test_extract_archives_streams_members(tmp_path):
+    with zipfile.ZipFile(tmp_path / "data.zip", "w") as zf:
+        zf.writestr("train.csv", "a,b\n1,2\n")
+        zf.writestr("sub/test.csv", "a\n3\n")
+    extracted = extract_archives(tmp_path, echo=lambda *_: None)
+    assert sorted(p.name for p in extracted) == ["test.csv", "train.csv"]
+    assert (tmp_path / "sub" / "test.csv").read_text() == "a\n3\n"
+    # 展開済みのメンバーは再展開しない
+    assert extract_archives(tmp_path, echo=lambda *_: None) == []
+
+
+def test_extract_archives_rejects_unsafe_paths(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    with zipfile.ZipFile(data_dir / "evil.zip", "w") as zf:
+        zf.writestr("../evil.txt", "x")
+    with pytest.raises(ValueError):
+        extract_archives(data_dir, echo=lambda *_: None)
+    assert not (tmp_path / "evil.txt").exists()
+
+
+def test_infer_dtypes_downcasts_across_chunks(tmp_path):
+    csv_path = tmp_path / "train.csv"
+    _write_csv(csv_path)
+    dtypes = infer_dtypes(csv_path, chunksize=128)
+    assert dtypes == {"id": "uint16", "small": "uint8", "neg": "int16", "x": "float32", "name": "object"}
+
+
+def test_infer_dtypes_int_with_missing_becomes_float(tmp_path):
+    csv_path = tmp_path / "train.csv"
+    csv_path.write_text("a,b\n" + "1,x\n" * 10 + ",y\n" + "2,z\n")
+    assert infer_dtypes(csv_path, chunksize=4) == {"a": "float32", "b": "object"}
+
+
+@pytest.mark.parametrize("fmt, reader", [("parquet", "read_parquet"), ("feather", "read_feather")])
+def test_convert_csvs(tmp_path, fmt, reader):
+    csv_path = tmp_path / "train.csv"
+    _write_csv(csv_path)
+    converted = convert_csvs(tmp_path, fmt=fmt, chunksize=128, echo=lambda *_: None)
+    assert converted == [tmp_path / f"train.{fmt}"]
+
+    df = getattr(pd, reader)(converted[0])
+    expected = pd.read_csv(csv_path)
+    assert len(df) == 1000
+    assert str(df["small"].dtype) == "uint8"
+    assert str(df["x"].dtype) == "float32"
+    assert df["name"].tolist() == expected["name"].tolist()
+    assert df["id"].tolist() == expected["id"].tolist()
+    # 変換済みで CSV より新しければスキップ
+    assert convert_csvs(tmp_path, fmt=fmt, echo=lambda *_: None) == []
+
+
+def test_main_extracts_and_converts(tmp_path):
+    with zipfile.ZipFile(tmp_path / "data.zip", "w") as zf:
+        zf.writestr("train.csv", "a,b\n1,x\n2,y\n")
+    result = CliRunner().invoke(main, [str(tmp_path), "--format", "parquet"])
+    assert result.exit_code == 0, result.output
+    assert "Converted train.csv -> train.parquet" in result.output
+    assert pd.read_parquet(tmp_path / "train.parquet")["b"].tolist() == ["x", "y"]
+
+
+def test_convert_csvs_npy_store(tmp_path):
+    np = pytest.importorskip("numpy")
+    from signate_deploy.npystore import NpyStore
+
+    pd.DataFrame({
+        "id": range(10),
+        "c": list("abcabcabc") + [None],
+        "x": [i / 3 for i in range(10)],
+    }).to_csv(tmp_path / "train.csv", index=False)
+    pd.DataFrame({"id": range(3), "c": ["z", "a", "b"], "x": [0.5, 1.5, 2.5]}).to_csv(tmp_path / "test.csv", index=False)
+
+    converted = convert_csvs(tmp_path, fmt="npy", chunksize=4, echo=lambda *_: None)
+    assert sorted(p.name for p in converted) == ["test.npystore", "train.npystore"]
+
+    train = NpyStore(tmp_path / "train.npystore")
+    test = NpyStore(tmp_path / "test.npystore")
+    assert len(train) == 10
+    assert train.columns == ["id", "c", "x"]
+    assert train.dtypes == {"id": "uint8", "c": "int32", "x": "float32"}
+    assert isinstance(train.column("x"), np.memmap)
+    # train/test でカテゴリ番号が揃っている
+    assert train.categories["c"] == test.categories["c"] == ["a", "b", "c", "z"]
+    assert test.rows(["c"]).ravel().tolist() == [3.0, 0.0, 1.0]
+    rows = train.rows(["c", "x"], [0, 9])
+    assert rows[0].tolist() == [0.0, 0.0]
+    assert np.isnan(rows[1, 0]) and rows[1, 1] == pytest.approx(3.0)
+    assert train.rows(["id"], 2).tolist() == [2.0]
+
+    assert convert_csvs(tmp_path, fmt="npy", echo=lambda *_: None) == []
+
+
+def test_scan_csv_collects_categories_of_mixed_columns(tmp_path):
+    from signate_deploy.convert import scan_csv
+
+    csv_path = tmp_path / "train.csv"
+    csv_path.write_text("a\n" + "1\n" * 4 + "x\n")
+    scan = scan_csv(csv_path, chunksize=4, collect_categories=True)
+    assert scan.rows == 5
+    assert scan.dtypes == {"a": "object"}
+    assert scan.categories == {"a": {"1", "x"}}
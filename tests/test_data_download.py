@@ -0,0 +1,106 @@
+"""Tests for parallel data download helper used by generated workflows."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+from signate_deploy import data_download
+from signate_deploy.data_download import STAMP_FILENAME, FileDownloadError, download_files, main
+
+from tests import fake_signate
+
+
+@pytest.fixture
+def server(fake_server, monkeypatch):
+    monkeypatch.setenv(fake_signate.URL_ENV, fake_server.url)
+    monkeypatch.setattr(data_download, "RETRY_BACKOFF", 0)
+    fake_server.routes["/task1/f_train"] = b"id,target\n1,0\n"
+    fake_server.routes["/task1/f_test"] = b"id\n2\n"
+    return fake_server
+
+
+def test_download_files(server, fake_exe, tmp_path):
+    dest = tmp_path / "data"
+    download_files("task1", {"train": "f_train", "test": "f_test"}, dest, workers=2, signate_exe=fake_exe)
+    assert (dest / "train.csv").read_bytes() == b"id,target\n1,0\n"
+    assert (dest / "test.csv").read_bytes() == b"id\n2\n"
+
+
+def test_download_files_reports_failed_file(server, fake_exe, tmp_path):
+    with pytest.raises(FileDownloadError) as excinfo:
+        download_files(
+            "task1", {"train": "f_train", "missing": "f_missing"}, tmp_path / "data",
+            workers=2, signate_exe=fake_exe,
+        )
+    assert excinfo.value.name == "missing"
+    assert excinfo.value.file_key == "f_missing"
+    assert "404" in excinfo.value.output
+
+
+def test_download_files_fail_fast_skips_pending(server, fake_exe, tmp_path):
+    file_keys = {"missing": "f_missing", "train": "f_train", "test": "f_test"}
+    with pytest.raises(FileDownloadError):
+        download_files("task1", file_keys, tmp_path / "data", workers=1, signate_exe=fake_exe, retries=2)
+    assert server.requests == ["/task1/f_missing"] * 3
+
+
+def test_download_files_retries_signate_download(server, fake_exe, tmp_path):
+    attempts = []
+
+    def flaky(handler):
+        attempts.append(1)
+        return (503, b"unavailable") if len(attempts) < 3 else b"id,target\n1,0\n"
+
+    server.routes["/task1/f_train"] = flaky
+    messages = []
+    download_files("task1", {"train": "f_train"}, tmp_path / "data", signate_exe=fake_exe, echo=messages.append)
+    assert (tmp_path / "data" / "train.csv").read_bytes() == b"id,target\n1,0\n"
+    assert len(attempts) == 3
+    assert sum(m.startswith("Retrying train") for m in messages) == 2
+
+
+def test_main_reads_config(server, fake_exe, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "my-comp").mkdir()
+    (tmp_path / "my-comp" / "signate-config.json").write_text(
+        json.dumps({"task_key": "task1", "file_keys": {"train": "f_train"}})
+    )
+    runner = CliRunner()
+    result = runner.invoke(main, ["my-comp", "--workers", "2", "--signate-exe", fake_exe])
+    assert result.exit_code == 0
+    assert (tmp_path / "my-comp" / "data" / "train.csv").exists()
+
+
+def test_main_exits_nonzero_on_failure(server, fake_exe, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "my-comp").mkdir()
+    (tmp_path / "my-comp" / "signate-config.json").write_text(
+        json.dumps({"task_key": "task1", "file_keys": {"missing": "f_missing"}})
+    )
+    runner = CliRunner()
+    result = runner.invoke(main, ["my-comp", "--signate-exe", fake_exe])
+    assert result.exit_code == 1
+    assert "missing" in result.output
+
+
+def test_main_skips_when_data_is_current(server, fake_exe, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "my-comp").mkdir()
+    (tmp_path / "my-comp" / "signate-config.json").write_text(
+        json.dumps({"task_key": "task1", "file_keys": {"train": "f_train"}})
+    )
+    runner = CliRunner()
+    runner.invoke(main, ["my-comp", "--signate-exe", fake_exe])
+    assert (tmp_path / "my-comp" / "data" / STAMP_FILENAME).exists()
+    server.requests.clear()
+
+    result = runner.invoke(main, ["my-comp", "--signate-exe", fake_exe])
+    assert result.exit_code == 0
+    assert server.requests == []
+
+    # file_keys が変わったら取得し直す
+    (tmp_path / "my-comp" / "signate-config.json").write_text(
+        json.dumps({"task_key": "task1", "file_keys": {"train": "f_train", "test": "f_test"}})
+    )
+    runner.invoke(main, ["my-comp", "--signate-exe", fake_exe])
+    assert sorted(server.requests) == ["/task1/f_test", "/task1/f_train"]
@@ -0,0 +1,120 @@
+"""Tests for discover command."""
+
+import json
+import threading
+import time
+
+import pytest
+from click.testing import CliRunner
+from signate_deploy import listings
+from signate_deploy import backend as backend_mod
+from signate_deploy.backend import InProcessBackend, SubprocessBackend
+from signate_deploy.cli import main
+
+from tests import fake_signate
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """fake_signate を使うバックエンド. file-list の同時実行数を記録する."""
+
+    class SlowBackend(InProcessBackend):
+        active = 0
+        max_active = 0
+        lock = threading.Lock()
+
+        def run(self, args, capture=False):
+            if args[0] == "file-list":
+                with self.lock:
+                    SlowBackend.active += 1
+                    SlowBackend.max_active = max(SlowBackend.max_active, SlowBackend.active)
+                time.sleep(0.05)
+                with self.lock:
+                    SlowBackend.active -= 1
+            return super().run(args, capture=capture)
+
+    instance = SlowBackend(fake_signate.cli)
+    monkeypatch.setattr(listings, "get_backend", lambda use_cache=True, concurrent=False: instance)
+    return SlowBackend
+
+
+def test_discover_prints_tree(backend):
+    runner = CliRunner()
+    result = runner.invoke(main, ["discover", "comp1"])
+    assert result.exit_code == 0
+    assert "task1" in result.output
+    assert "train: f_train" in result.output
+    assert "sample_submit: f_sample" in result.output
+
+
+def test_discover_fetches_files_in_parallel(backend):
+    runner = CliRunner()
+    result = runner.invoke(main, ["discover", "comp1", "--workers", "4"])
+    assert result.exit_code == 0
+    assert backend.max_active > 1
+
+
+def test_discover_fetches_files_in_subprocesses_when_entry_reads_argv(fake_exe, monkeypatch):
+    # 本物の signate.cli:main は sys.argv を読む関数なので、同一プロセス内の呼び出しは直列化される
+    def entry():
+        return fake_signate.cli.main(prog_name="signate")
+
+    used = []
+    original_run = {cls: cls.run for cls in (InProcessBackend, SubprocessBackend)}
+
+    def run(self, args, capture=False):
+        used.append((self.name, args[0]))
+        return original_run[type(self)](self, args, capture=capture)
+
+    for cls in original_run:
+        monkeypatch.setattr(cls, "run", run)
+    monkeypatch.setattr(InProcessBackend, "load", classmethod(lambda cls: cls(entry)))
+    monkeypatch.setattr(backend_mod, "find_signate_exe", lambda use_cache=True: fake_exe)
+
+    result = CliRunner().invoke(main, ["discover", "comp1", "--json", "--workers", "2"])
+    assert result.exit_code == 0
+    assert json.loads(result.output)["tasks"][0]["file_keys"] == {"train": "f_train", "test": "f_test"}
+    assert ("inprocess", "task-list") in used
+    assert sorted(name for name, command in used if command == "file-list") == ["subprocess", "subprocess"]
+
+
+def test_discover_json(backend):
+    runner = CliRunner()
+    result = runner.invoke(main, ["discover", "comp1", "--json"])
+    assert result.exit_code == 0
+    tree = json.loads(result.output)
+    assert tree["tasks"][0]["file_keys"] == {"train": "f_train", "test": "f_test"}
+
+
+def test_discover_write_requires_task_key(backend, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["discover", "comp1", "--write", "my-comp"])
+    assert result.exit_code != 0
+    assert not (tmp_path / "my-comp" / "signate-config.json").exists()
+
+
+def test_discover_write_config(backend, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["discover", "comp1", "--write", "my-comp", "--task-key", "task1"])
+    assert result.exit_code == 0
+    config = json.loads((tmp_path / "my-comp" / "signate-config.json").read_text())
+    assert config == {"task_key": "task1", "file_keys": {"train": "f_train", "test": "f_test"}}
+
+
+def test_discover_write_refuses_overwrite(backend, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "my-comp").mkdir()
+    (tmp_path / "my-comp" / "signate-config.json").write_text("{}")
+    runner = CliRunner()
+    result = runner.invoke(main, ["discover", "comp1", "--write", "my-comp", "--task-key", "task1"])
+    assert result.exit_code != 0
+    result = runner.invoke(main, ["discover", "comp1", "--write", "my-comp", "--task-key", "task1", "--force"])
+    assert result.exit_code == 0
+
+
+def test_discover_unknown_competition(backend):
+    runner = CliRunner()
+    result = runner.invoke(main, ["discover", "missing"])
+    assert result.exit_code != 0
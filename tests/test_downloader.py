@@ -0,0 +1,135 @@
+"""Tests for the resumable, checksum-verified downloader."""
+
+import hashlib
+import json
+
+import pytest
+from click.testing import CliRunner
+from signate_deploy.cli import main
+from signate_deploy.downloader import (
+    MANIFEST_FILENAME,
+    ChecksumError,
+    DownloadError,
+    fetch,
+    load_manifest,
+)
+
+from tests.conftest import FakeServer
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+
+
+def _ranged(payload, interrupt_after=None, ranges_seen=None):
+    """Range 対応のハンドラ. interrupt_after バイト送ったところで1回だけ接続を切る."""
+    state = {"interrupted": False}
+
+    def handler(request):
+        start = 0
+        header = request.headers.get("Range")
+        if ranges_seen is not None:
+            ranges_seen.append(header)
+        if header:
+            start = int(header.split("=")[1].rstrip("-"))
+        if start >= len(payload):
+            return (416, b"", {"Content-Range": f"bytes */{len(payload)}"})
+        body = payload[start:]
+        request.send_response(206 if start else 200)
+        request.send_header("Content-Length", str(len(body)))
+        if start:
+            request.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+        request.end_headers()
+        if interrupt_after is not None and not state["interrupted"]:
+            state["interrupted"] = True
+            request.wfile.write(body[:interrupt_after])
+            request.wfile.flush()
+            request.close_connection = True
+            return FakeServer.HANDLED
+        request.wfile.write(body)
+        return FakeServer.HANDLED
+
+    return handler
+
+
+def test_fetch_complete(fake_server, tmp_path):
+    fake_server.routes["/train.csv"] = _ranged(PAYLOAD)
+    result = fetch(f"{fake_server.url}/train.csv", tmp_path / "train.csv")
+    assert (tmp_path / "train.csv").read_bytes() == PAYLOAD
+    assert result.size == len(PAYLOAD)
+    assert result.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    assert not result.resumed
+    assert not (tmp_path / "train.csv.part").exists()
+
+
+def test_fetch_resumes_after_interruption(fake_server, tmp_path, monkeypatch):
+    monkeypatch.setattr("signate_deploy.downloader.time.sleep", lambda s: None)
+    ranges = []
+    fake_server.routes["/train.csv"] = _ranged(PAYLOAD, interrupt_after=300_000, ranges_seen=ranges)
+    result = fetch(f"{fake_server.url}/train.csv", tmp_path / "train.csv", chunk_size=65536)
+    assert (tmp_path / "train.csv").read_bytes() == PAYLOAD
+    assert result.resumed
+    assert ranges[0] is None
+    assert ranges[1] is not None and int(ranges[1].split("=")[1].rstrip("-")) > 0
+    assert result.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+
+
+def test_fetch_resumes_existing_part_file(fake_server, tmp_path):
+    ranges = []
+    fake_server.routes["/train.csv"] = _ranged(PAYLOAD, ranges_seen=ranges)
+    (tmp_path / "train.csv.part").write_bytes(PAYLOAD[:1000])
+    result = fetch(f"{fake_server.url}/train.csv", tmp_path / "train.csv")
+    assert ranges == ["bytes=1000-"]
+    assert result.resumed
+    assert (tmp_path / "train.csv").read_bytes() == PAYLOAD
+
+
+def test_fetch_server_without_range_support(fake_server, tmp_path):
+    fake_server.routes["/train.csv"] = PAYLOAD
+    (tmp_path / "train.csv.part").write_bytes(b"garbage")
+    result = fetch(f"{fake_server.url}/train.csv", tmp_path / "train.csv")
+    assert (tmp_path / "train.csv").read_bytes() == PAYLOAD
+    assert not result.resumed
+
+
+def test_fetch_checksum_mismatch(fake_server, tmp_path):
+    fake_server.routes["/train.csv"] = PAYLOAD
+    with pytest.raises(ChecksumError):
+        fetch(f"{fake_server.url}/train.csv", tmp_path / "train.csv", expected_sha256="0" * 64)
+    assert not (tmp_path / "train.csv").exists()
+    assert not (tmp_path / "train.csv.part").exists()
+
+
+def test_fetch_http_error(fake_server, tmp_path):
+    with pytest.raises(DownloadError):
+        fetch(f"{fake_server.url}/missing.csv", tmp_path / "missing.csv")
+
+
+def test_download_local_writes_manifest(fake_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fake_server.routes["/train.csv"] = _ranged(PAYLOAD)
+    (tmp_path / "my-comp").mkdir()
+    (tmp_path / "my-comp" / "signate-config.json").write_text(
+        json.dumps({"task_key": "task1", "file_keys": {"train": f"{fake_server.url}/train.csv"}})
+    )
+    monkeypatch.setattr("signate_deploy.commands.download.find_signate_exe", lambda: "signate")
+    result = CliRunner().invoke(main, ["download", "my-comp", "--local"])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "my-comp" / "data" / "train.csv").read_bytes() == PAYLOAD
+    manifest = load_manifest(tmp_path / "my-comp" / MANIFEST_FILENAME)
+    assert manifest["train.csv"]["sha256"] == hashlib.sha256(PAYLOAD).hexdigest()
+    assert manifest["train.csv"]["size"] == len(PAYLOAD)
+    assert manifest["train.csv"]["path"] == "data/train.csv"
+
+    # 配布元のデータが変わったら、記録済みの SHA-256 と照合して失敗する
+    fake_server.routes["/train.csv"] = b"tampered"
+    (tmp_path / "my-comp" / "data" / "signate-config.json").unlink()
+    result = CliRunner().invoke(main, ["download", "my-comp", "--local"])
+    assert result.exit_code == 1
+    assert "sha256 mismatch" in result.output
+
+    # --force なら照合せずに取り直し、記録済みの SHA-256 を更新する
+    result = CliRunner().invoke(main, ["download", "my-comp", "--local", "--force"])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "my-comp" / "data" / "train.csv").read_bytes() == b"tampered"
+    assert "SHA-256 が前回のダウンロードと異なります" in result.output
+    manifest = load_manifest(tmp_path / "my-comp" / MANIFEST_FILENAME)
+    assert manifest["train.csv"]["sha256"] == hashlib.sha256(b"tampered").hexdigest()
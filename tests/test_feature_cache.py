@@ -0,0 +1,112 @@
+"""Tests for signate_deploy.feature_cache."""
+
+import os
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+np = pytest.importorskip("numpy")
+
+from signate_deploy.feature_cache import FeatureCache, data_fingerprint  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    d = tmp_path / "data"
+    d.mkdir()
+    (d / "signate-config.json").write_text('{"task_key": "t1"}')
+    (d / "train.csv").write_text("a\n1\n")
+    return d
+
+
+def test_cached_function_is_called_once(tmp_path, data_dir):
+    cache = FeatureCache(tmp_path / "cache", data_dir, echo=lambda *_: None)
+    calls = []
+
+    @cache
+    def make_features(n):
+        calls.append(n)
+        return pd.DataFrame({"x": range(n), "c": pd.Categorical(["a", "b"] * (n // 2))}), np.arange(n)
+
+    df, arr = make_features(4)
+    df2, arr2 = make_features(4)
+    assert calls == [4]
+    pd.testing.assert_frame_equal(df, df2)
+    np.testing.assert_array_equal(arr, arr2)
+    assert isinstance(df2["c"].dtype, pd.CategoricalDtype)
+
+    # 引数が違えば別エントリ
+    make_features(6)
+    assert calls == [4, 6]
+
+
+def test_data_change_invalidates(tmp_path, data_dir):
+    cache = FeatureCache(tmp_path / "cache", data_dir, echo=lambda *_: None)
+    calls = []
+
+    def make_features():
+        calls.append(1)
+        return pd.DataFrame({"x": [1]})
+
+    cached = cache(make_features)
+    cached()
+    (data_dir / "signate-config.json").write_text('{"task_key": "t2"}')
+    cached2 = FeatureCache(tmp_path / "cache", data_dir, echo=lambda *_: None)(make_features)
+    cached2()
+    assert len(calls) == 2
+
+
+def test_data_fingerprint_ignores_mtime(data_dir):
+    before = data_fingerprint(data_dir)
+    os.utime(data_dir / "train.csv", (0, 0))
+    assert data_fingerprint(data_dir) == before
+    (data_dir / "train.csv").write_text("a\n1\n2\n")
+    assert data_fingerprint(data_dir) != before
+
+
+def test_data_fingerprint_detects_same_size_change(data_dir):
+    before = data_fingerprint(data_dir)
+    # ラベルの修正などでサイズが変わらなくても別のデータとみなす
+    (data_dir / "train.csv").write_text("a\n2\n")
+    assert data_fingerprint(data_dir) != before
+    # 内容のハッシュの控えはキーに含めない
+    assert (data_dir / ".fingerprints.json").exists()
+    assert data_fingerprint(data_dir) == data_fingerprint(data_dir)
+
+
+def test_data_fingerprint_uses_download_manifest(data_dir):
+    from signate_deploy.downloader import MANIFEST_FILENAME, save_manifest
+
+    manifest_path = data_dir.parent / MANIFEST_FILENAME
+    entry = {"name": "train", "path": "data/train.csv", "size": 4, "sha256": "0" * 64}
+    save_manifest(manifest_path, {"train.csv": entry})
+    before = data_fingerprint(data_dir)
+    # ダウンロードしたファイルはマニフェストの SHA-256 で表す（内容は読まない）
+    os.utime(data_dir / "train.csv", (0, 0))
+    assert data_fingerprint(data_dir) == before
+    save_manifest(manifest_path, {"train.csv": dict(entry, sha256="1" * 64)})
+    assert data_fingerprint(data_dir) != before
+
+
+def test_lru_eviction(tmp_path, data_dir):
+    cache = FeatureCache(tmp_path / "cache", data_dir, echo=lambda *_: None)
+    big = np.zeros(10_000, dtype=np.float64)  # 約 80KB
+    cache.put("a", big)
+    cache.put("b", big)
+    os.utime(tmp_path / "cache" / "a" / "meta.json", (1, 1))
+    os.utime(tmp_path / "cache" / "b" / "meta.json", (2, 2))
+    cache.get("a")  # a を最近使ったことにする
+
+    cache.max_bytes = 200_000
+    cache.put("c", big)
+    assert sorted(p.name for p in (tmp_path / "cache").iterdir()) == ["a", "c"]
+    with pytest.raises(KeyError):
+        cache.get("b")
+
+
+def test_unsupported_type(tmp_path, data_dir):
+    cache = FeatureCache(tmp_path / "cache", data_dir, echo=lambda *_: None)
+    with pytest.raises(TypeError):
+        cache.put("k", {"x": 1})
+    assert list((tmp_path / "cache").iterdir()) == []
@@ -0,0 +1,118 @@
+"""Tests for signate_deploy.frame."""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import numpy as np  # noqa: E402
+
+from signate_deploy.frame import (  # noqa: E402
+    category_columns,
+    downcast,
+    peak_rss_mb,
+    predict_in_batches,
+    read_csv_lean,
+    write_csv_blocks,
+)
+
+
+def _frame(n=1000):
+    return pd.DataFrame({
+        "id": range(n),
+        "color": [["red", "green", "blue"][i % 3] for i in range(n)],
+        "x": [i / 7 for i in range(n)],
+        "uid": [f"user{i}" for i in range(n)],
+        "delta": [(i % 50) - 25 for i in range(n)],
+    })
+
+
+def test_category_columns_picks_low_cardinality_strings():
+    assert category_columns(_frame()) == ["color"]
+
+
+def test_downcast_returns_lean_frame():
+    df = downcast(_frame())
+    assert str(df["id"].dtype) == "uint16"
+    assert str(df["delta"].dtype) == "int8"
+    assert str(df["x"].dtype) == "float32"
+    assert isinstance(df["color"].dtype, pd.CategoricalDtype)
+    assert not isinstance(df["uid"].dtype, pd.CategoricalDtype)
+
+
+def test_read_csv_lean_merges_chunks(tmp_path):
+    path = tmp_path / "train.csv"
+    expected = _frame()
+    expected.to_csv(path, index=False)
+    df = read_csv_lean(path, sample_rows=100, chunksize=128)
+
+    assert list(df.columns) == list(expected.columns)
+    assert len(df) == len(expected)
+    assert isinstance(df["color"].dtype, pd.CategoricalDtype)
+    assert set(df["color"].cat.categories) == {"red", "green", "blue"}
+    assert df["color"].astype(str).tolist() == expected["color"].tolist()
+    assert df["id"].tolist() == expected["id"].tolist()
+    assert df.memory_usage(deep=True).sum() < pd.read_csv(path).memory_usage(deep=True).sum()
+
+
+def test_read_csv_lean_int_column_with_missing_values(tmp_path):
+    path = tmp_path / "train.csv"
+    path.write_text("a\n" + "1\n" * 10 + "NA\n" + "2\n")
+    df = read_csv_lean(path, chunksize=4)
+    assert df["a"].isna().sum() == 1
+    assert df["a"].dtype.kind == "f"
+
+
+def test_predict_in_batches_matches_full_prediction():
+    X = _frame(1000)[["id", "x"]]
+    seen = []
+
+    def predict(batch):
+        seen.append(len(batch))
+        return batch["x"].to_numpy() * 2
+
+    preds = predict_in_batches(predict, X, batch_rows=300)
+    assert seen == [300, 300, 300, 100]
+    assert preds.dtype == np.float32
+    np.testing.assert_allclose(preds, X["x"] * 2, rtol=1e-6)
+
+    out = np.ones(1000, dtype=np.float32)
+    predict_in_batches(lambda batch: batch[:, 0], np.zeros((1000, 1)), batch_rows=300, out=out)
+    assert not out.any()
+
+
+def test_predict_in_batches_index():
+    X = _frame(1000)[["id", "x"]]
+    index = np.random.default_rng(0).permutation(1000)[:700]
+    seen = []
+
+    def predict(batch):
+        seen.append(len(batch))
+        return batch["x"].to_numpy() * 2
+
+    preds = predict_in_batches(predict, X, batch_rows=300, index=index)
+    assert seen == [300, 300, 100]
+    np.testing.assert_allclose(preds, X["x"].to_numpy()[index] * 2, rtol=1e-6)
+
+    values = np.arange(10.0)[:, None]
+    preds = predict_in_batches(lambda batch: batch[:, 0], values, batch_rows=2, index=np.array([7, 1, 4]))
+    np.testing.assert_array_equal(preds, [7, 1, 4])
+
+
+def test_write_csv_blocks(tmp_path):
+    path = tmp_path / "submission.csv"
+    ids = np.arange(1000)
+    preds = np.linspace(0, 1, 1000, dtype=np.float32)
+    assert write_csv_blocks(path, {"id": ids, "pred": preds}, batch_rows=300) == 1000
+
+    expected = tmp_path / "expected.csv"
+    pd.DataFrame({"id": ids, "pred": preds}).to_csv(expected, index=False, header=False)
+    assert path.read_bytes() == expected.read_bytes()
+
+    write_csv_blocks(path, {"id": ids[:5], "pred": preds[:5]}, batch_rows=2, header=True)
+    assert path.read_text().splitlines()[0] == "id,pred"
+    assert len(path.read_text().splitlines()) == 6
+
+
+def test_peak_rss_mb():
+    rss = peak_rss_mb()
+    assert rss is None or rss > 0
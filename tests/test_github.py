@@ -0,0 +1,204 @@
+"""Tests for signate_deploy.github against a local mock of the GitHub API."""
+
+import io
+import json
+import re
+import zipfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from signate_deploy.cli import main
+from signate_deploy.github import Backoff, GitHubClient, GitHubError, find_dispatched_run, watch_run
+
+REPO = "owner/repo"
+RUNS_PATH = f"/repos/{REPO}/actions/workflows/signate-submit.yml/runs?event=workflow_dispatch&per_page=30"
+RUN_PATH = f"/repos/{REPO}/actions/runs/7"
+JOBS_PATH = f"/repos/{REPO}/actions/runs/7/jobs?per_page=100"
+LOG_PATH = f"/repos/{REPO}/actions/jobs/70/logs"
+
+
+def _etag_route(states, seen_if_none_match=None):
+    """呼ばれるたびに states を順に返す. 前回と同じ内容なら 304 を返す（ETag は内容から作る）."""
+    state = {"i": 0}
+
+    def route(handler):
+        body = json.dumps(states[min(state["i"], len(states) - 1)]).encode()
+        state["i"] += 1
+        etag = f'"{hash(body)}"'
+        if seen_if_none_match is not None:
+            seen_if_none_match.append(handler.headers.get("If-None-Match"))
+        if handler.headers.get("If-None-Match") == etag:
+            return (304, b"", {"ETag": etag})
+        return (200, body, {"ETag": etag, "Content-Type": "application/json"})
+
+    return route
+
+
+def _client(server, sleeps):
+    return GitHubClient(REPO, token="secret", api_url=server.url, sleep=sleeps.append)
+
+
+def test_backoff_grows_until_change():
+    backoff = Backoff(minimum=2, maximum=10)
+    assert [backoff.next(False) for _ in range(5)] == [3, 4.5, 6.75, 10, 10]
+    assert backoff.next(True) == 2
+
+
+def test_find_dispatched_run_uses_conditional_requests(fake_server):
+    other = {"id": 1, "display_title": "SIGNATE Train & Submit comp someone-else"}
+    ours = {"id": 7, "display_title": "SIGNATE Train & Submit comp abc123", "html_url": "u"}
+    sent = []
+    fake_server.routes[RUNS_PATH] = _etag_route(
+        [{"workflow_runs": [other]}, {"workflow_runs": [other]}, {"workflow_runs": [ours, other]}], sent
+    )
+    sleeps = []
+    run = find_dispatched_run(_client(fake_server, sleeps), "signate-submit.yml", "abc123")
+    assert run["id"] == 7
+    # 2回目は If-None-Match 付きで 304、変化がないので間隔が伸びる
+    assert sent[0] is None and sent[1] is not None
+    assert sleeps == [1.0, 1.5]
+
+
+def test_find_dispatched_run_timeout(fake_server):
+    fake_server.routes[RUNS_PATH] = _etag_route([{"workflow_runs": []}])
+    with pytest.raises(GitHubError, match="init-repo --force"):
+        find_dispatched_run(_client(fake_server, []), "signate-submit.yml", "abc123", timeout=3)
+
+
+def _job(status, steps, conclusion=None):
+    return {"jobs": [{"id": 70, "name": "submit", "status": status, "conclusion": conclusion, "steps": steps}]}
+
+
+def _step(number, name, status, conclusion=None):
+    step = {"number": number, "name": name, "status": status, "conclusion": conclusion}
+    if status == "completed":
+        step.update(started_at="2026-01-01T00:00:00Z", completed_at="2026-01-01T00:01:05Z")
+    return step
+
+
+def test_watch_run_streams_steps_and_logs(fake_server):
+    fake_server.routes[RUN_PATH] = _etag_route([
+        {"status": "queued"},
+        {"status": "in_progress"},
+        {"status": "in_progress"},
+        {"status": "completed", "conclusion": "failure"},
+    ])
+    fake_server.routes[JOBS_PATH] = _etag_route([
+        {"jobs": []},
+        _job("in_progress", [_step(1, "Train", "in_progress")]),
+        _job("in_progress", [_step(1, "Train", "in_progress")]),
+        _job("completed", [_step(1, "Train", "completed", "success"), _step(2, "Submit", "completed", "failure")],
+             conclusion="failure"),
+    ])
+    log_auth = []
+
+    def blob(handler):
+        log_auth.append(handler.headers.get("Authorization"))
+        return b"line 1\nline 2\n"
+
+    fake_server.routes[LOG_PATH] = (302, b"", {"Location": f"{fake_server.url}/blob/70"})
+    fake_server.routes["/blob/70"] = blob
+
+    lines, sleeps = [], []
+    run = watch_run(_client(fake_server, sleeps), 7, echo=lines.append)
+    assert run["conclusion"] == "failure"
+    assert lines == [
+        "  [submit] Train: in_progress",
+        "  [submit] Train: success (1m05s)",
+        "  [submit] Submit: failure (1m05s)",
+        "----- submit (failure) -----",
+        "line 1\nline 2",
+    ]
+    # 変化がなかった3回目の前だけ間隔が伸びる
+    assert sleeps == [2.0, 2.0, 3.0]
+    # ログのリダイレクト先にはトークンを送らない
+    assert log_auth == [None]
+    assert fake_server.requests.count(LOG_PATH) == 1
+
+
+def test_rate_limit_waits_and_retries(fake_server):
+    calls = {"n": 0}
+
+    def route(handler):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return (403, b"{}", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"})
+        return b'{"status": "completed"}'
+
+    fake_server.routes[RUN_PATH] = route
+    sleeps = []
+    assert _client(fake_server, sleeps).get_json("actions/runs/7").data == {"status": "completed"}
+    assert sleeps == [1.0]
+
+
+@pytest.fixture
+def github_env(fake_server, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "comp").mkdir()
+    (tmp_path / "comp" / "signate-config.json").write_text('{"task_key": "t", "file_keys": {}}')
+    monkeypatch.setenv("GITHUB_API_URL", fake_server.url)
+    monkeypatch.setenv("GITHUB_REPOSITORY", REPO)
+    monkeypatch.setenv("GH_TOKEN", "secret")
+    monkeypatch.setattr("signate_deploy.github.time.sleep", lambda _: None)
+    return fake_server
+
+
+def _dispatch_and_serve(server, conclusion, workflow="signate-submit.yml"):
+    """gh workflow run の呼び出しを横取りし、渡された dispatch_id の実行をモック API に載せる."""
+
+    def fake_run(cmd, **kwargs):
+        fields = dict(cmd[i + 1].split("=", 1) for i, a in enumerate(cmd) if a == "-f")
+        runs = {"workflow_runs": [{"id": 7, "display_title": f"x {fields['dispatch_id']}", "html_url": "u"}]}
+        server.routes[RUNS_PATH.replace("signate-submit.yml", workflow)] = json.dumps(runs).encode()
+        server.routes[RUN_PATH] = json.dumps({"id": 7, "status": "completed", "conclusion": conclusion}).encode()
+        server.routes[JOBS_PATH] = b'{"jobs": []}'
+        return MagicMock(returncode=0, stderr="")
+
+    return patch("subprocess.run", side_effect=fake_run)
+
+
+@pytest.mark.parametrize("conclusion, exit_code", [("success", 0), ("failure", 1)])
+def test_submit_wait_exits_with_conclusion(github_env, conclusion, exit_code):
+    with _dispatch_and_serve(github_env, conclusion) as run:
+        result = CliRunner().invoke(main, ["submit", "comp", "--wait"])
+    assert result.exit_code == exit_code, result.output
+    assert "dispatch_id=" in " ".join(run.call_args[0][0])
+    assert f"Conclusion: {conclusion}" in result.output
+
+
+def test_download_wait(github_env):
+    with _dispatch_and_serve(github_env, "success", "signate-download.yml"):
+        result = CliRunner().invoke(main, ["download", "comp", "--wait"])
+    assert result.exit_code == 0, result.output
+    assert "Conclusion: success" in result.output
+
+
+def test_download_fetch_syncs_artifact(github_env, tmp_path):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("train.csv", b"id,y\n1,0\n2,1\n")
+    blob = buf.getvalue()
+
+    def blob_route(handler):
+        start, end = map(int, re.fullmatch(r"bytes=(\d+)-(\d+)", handler.headers["Range"]).groups())
+        return (206, blob[start:end + 1], {"Content-Range": f"bytes {start}-{end}/{len(blob)}"})
+
+    github_env.routes["/blob/artifact.zip"] = blob_route
+    github_env.routes[f"/repos/{REPO}/actions/runs/7/artifacts?name=signate-data-comp"] = json.dumps(
+        {"artifacts": [{"id": 99, "expired": False}]}
+    ).encode()
+    github_env.routes[f"/repos/{REPO}/actions/artifacts/99/zip"] = (
+        302, b"", {"Location": f"{github_env.url}/blob/artifact.zip"}
+    )
+
+    with _dispatch_and_serve(github_env, "success", "signate-download.yml"):
+        result = CliRunner().invoke(main, ["download", "comp", "--fetch"])
+    assert result.exit_code == 0, result.output
+    assert "1 updated, 0 unchanged" in result.output
+    assert (tmp_path / "comp" / "data" / "train.csv").read_bytes() == b"id,y\n1,0\n2,1\n"
+
+    with _dispatch_and_serve(github_env, "success", "signate-download.yml"):
+        result = CliRunner().invoke(main, ["download", "comp", "--fetch"])
+    assert "0 updated, 1 unchanged" in result.output
@@ -1,6 +1,9 @@
 """Tests for init command."""
 
+import ast
 import json
+import subprocess
+import sys
 
 import pytest
 from click.testing import CliRunner
@@ -37,6 +40,9 @@ def test_init_creates_train_py(tmp_path, monkeypatch):
     result = runner.invoke(main, ["init", "my-comp", "--task-key", "abc123"])
     assert result.exit_code == 0
     assert (tmp_path / "my-comp" / "train.py").exists()
+    source = (tmp_path / "my-comp" / "train.py").read_text()
+    assert 'FoldModelCache(\n    f"{DATA_DIR}/../.model-cache"' in source
+    assert "init_model=init_model" in source
 
 
 def test_init_creates_requirements(tmp_path, monkeypatch):
@@ -67,3 +73,198 @@ def test_init_requires_task_key(tmp_path, monkeypatch):
     runner = CliRunner()
     result = runner.invoke(main, ["init", "my-comp"])
     assert result.exit_code != 0
+
+
+def test_init_train_py_prefers_columnar_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init", "my-comp", "--task-key", "abc123"])
+    assert result.exit_code == 0
+    source = (tmp_path / "my-comp" / "train.py").read_text()
+    compile(source, "train.py", "exec")
+    assert 'load_table("train")' in source
+    assert "pd.read_parquet" in source
+    assert "pyarrow" in (tmp_path / "my-comp" / "requirements.txt").read_text()
+
+
+def test_init_fold_workers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init", "my-comp", "--task-key", "abc123", "--fold-workers", "4"])
+    assert result.exit_code == 0
+    source = (tmp_path / "my-comp" / "train.py").read_text()
+    compile(source, "train.py", "exec")
+    assert 'FOLD_WORKERS = int(os.environ.get("FOLD_WORKERS", "4"))' in source
+    assert "ProcessPoolExecutor(workers" in source
+
+
+@pytest.mark.parametrize("template", ["standard", "fast", "mmap"])
+def test_train_template_merges_folds_before_closing_pool(template):
+    from signate_deploy.commands.init import TRAIN_TEMPLATES
+
+    tree = ast.parse(TRAIN_TEMPLATES[template].format(competition_dir="my-comp", fold_workers=2))
+    main_func = next(node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == "main")
+    with_stmt = next(node for node in ast.walk(main_func) if isinstance(node, ast.With))
+    # fold の結果はプールを閉じる前に1つずつ集計する（全 fold 分をため込まない）
+    loops = [node for node in ast.walk(with_stmt) if isinstance(node, ast.For)]
+    assert any(isinstance(loop.iter, ast.Name) and loop.iter.id == "results" for loop in loops)
+
+
+def test_init_fast_template(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init", "my-comp", "--task-key", "abc123", "--template", "fast"])
+    assert result.exit_code == 0
+    source = (tmp_path / "my-comp" / "train.py").read_text()
+    compile(source, "train.py", "exec")
+    assert "free_raw_data=True" in source
+    assert "dataset.save_binary(binary_path)" in source
+    assert "dataset.subset(tr_idx)" in source
+    assert "lgb.train(" in source
+    # ビン化済み Dataset からは続きを学習できない
+    assert "warm_start=False" in source
+
+
+def test_init_mmap_template(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init", "my-comp", "--task-key", "abc123", "--template", "mmap"])
+    assert result.exit_code == 0
+    source = (tmp_path / "my-comp" / "train.py").read_text()
+    compile(source, "train.py", "exec")
+    assert "from signate_deploy.npystore import NpyStore" in source
+    assert "class StoreRows(lgb.Sequence):" in source
+    assert 'f"{DATA_DIR}/{name}.npystore"' in source
+
+
+@pytest.mark.parametrize("template", ["standard", "mmap"])
+def test_train_template_merges_fold_shards(tmp_path, template):
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("sklearn")
+    pytest.importorskip("lightgbm")
+    pytest.importorskip("pandas")
+    from signate_deploy.commands.init import TRAIN_TEMPLATES
+
+    namespace = {"__name__": "train"}
+    exec(TRAIN_TEMPLATES[template].format(competition_dir=str(tmp_path), fold_workers=1), namespace)
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 50)
+    test_ids = np.arange(100, 120)
+    folds = np.array_split(rng.permutation(50), namespace["N_SPLITS"])
+    for seed in [1, 2]:
+        for fold, val_idx in enumerate(folds):
+            val_pred = rng.random(len(val_idx)).astype(np.float32)
+            test_pred = np.full(20, seed, dtype=np.float32)
+            namespace["save_shard"](tmp_path / "shards" / f"s{seed}", fold, seed, val_idx, val_pred, y[val_idx], test_pred, test_ids)
+
+    merged_y, oof_preds, merged_ids, test_preds = namespace["load_shards"](tmp_path / "shards")
+    np.testing.assert_array_equal(merged_y, y)
+    np.testing.assert_array_equal(merged_ids, test_ids)
+    np.testing.assert_allclose(test_preds, 1.5)
+    assert oof_preds.shape == (50,)
+
+    # 提出ファイルと一緒に、台帳に記録する CV スコアを書き出す
+    (tmp_path / "data").mkdir()
+    namespace["write_submission"](merged_y, oof_preds, merged_ids, test_preds)
+    assert len((tmp_path / "submission.csv").read_text().splitlines()) == 20
+    score = json.loads((tmp_path / "cv-score.json").read_text())
+    assert score["metric"] == "auc" and 0 <= score["score"] <= 1
+
+    (tmp_path / "shards" / "s2" / "fold3-seed2.npz").unlink()
+    with pytest.raises(SystemExit, match=r"\(3, 2\)"):
+        namespace["load_shards"](tmp_path / "shards")
+
+
+def test_mmap_template_writes_original_string_ids(tmp_path):
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("sklearn")
+    pytest.importorskip("lightgbm")
+    pd = pytest.importorskip("pandas")
+    from signate_deploy.commands.init import MMAP_TRAIN_TEMPLATE
+    from signate_deploy.convert import convert_csvs
+    from signate_deploy.validate import expected_format, validate_submission
+
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    rng = np.random.default_rng(0)
+    x = rng.random((200, 2))
+    pd.DataFrame(
+        {"id": [f"tr{i:05d}" for i in range(200)], "f0": x[:, 0], "f1": x[:, 1], "target": (x[:, 0] > 0.5).astype(int)}
+    ).to_csv(data_dir / "train.csv", index=False)
+    # 文字列の id は npy ストアではカテゴリ番号で保存される
+    test = pd.DataFrame({"id": [f"te{i:05d}" for i in range(50)], "f0": rng.random(50), "f1": rng.random(50)})
+    test.to_csv(data_dir / "test.csv", index=False)
+    convert_csvs(data_dir, fmt="npy", echo=lambda *_: None)
+
+    train_py = tmp_path / "train.py"
+    train_py.write_text(MMAP_TRAIN_TEMPLATE.format(competition_dir=str(tmp_path), fold_workers=1))
+    subprocess.run([sys.executable, str(train_py)], check=True, capture_output=True)
+
+    submission = pd.read_csv(tmp_path / "submission.csv", header=None)
+    assert submission[0].tolist() == test["id"].tolist()
+    result = validate_submission(tmp_path / "submission.csv", expected_format(tmp_path))
+    assert result.ok, result.errors
+
+
+def test_train_template_retrains_when_columns_change(tmp_path):
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("sklearn")
+    pytest.importorskip("lightgbm")
+    pd = pytest.importorskip("pandas")
+    from signate_deploy.commands.init import TRAIN_TEMPLATE
+
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    rng = np.random.default_rng(0)
+    x = rng.random((200, 2))
+    pd.DataFrame({"id": range(200), "f0": x[:, 0], "f1": x[:, 1], "target": (x[:, 0] > 0.5).astype(int)}).to_csv(
+        data_dir / "train.csv", index=False
+    )
+    pd.DataFrame({"id": range(50), "f0": rng.random(50), "f1": rng.random(50)}).to_csv(
+        data_dir / "test.csv", index=False
+    )
+
+    train_py = tmp_path / "train.py"
+    source = TRAIN_TEMPLATE.format(competition_dir=str(tmp_path), fold_workers=1)
+    train_py.write_text(source)
+    subprocess.run([sys.executable, str(train_py)], check=True, capture_output=True)
+    rerun = subprocess.run([sys.executable, str(train_py)], check=True, capture_output=True, text=True)
+    assert rerun.stdout.count("cached model") == 5
+
+    # make_features の後で列を落としたら、キャッシュ済みのモデルを使わない
+    dropped = source.replace("    X = train\n", '    X = train.drop(columns=["f0"])\n')
+    assert dropped != source
+    train_py.write_text(dropped)
+    changed = subprocess.run([sys.executable, str(train_py)], check=True, capture_output=True, text=True)
+    assert "cached model" not in changed.stdout
+
+
+def test_fast_template_parallel_workers_keep_categories(tmp_path):
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("sklearn")
+    pytest.importorskip("lightgbm")
+    pd = pytest.importorskip("pandas")
+    from signate_deploy.commands.init import FAST_TRAIN_TEMPLATE
+
+    rng = np.random.default_rng(0)
+    cat = rng.choice(["a", "b", "c"], 600)
+    train = pd.DataFrame({"id": range(600), "cat": cat, "f0": rng.random(600), "target": (cat == "c").astype(int)})
+    # テストには "b" が無いので、テスト自身のカテゴリ番号は学習時と食い違う
+    test = pd.DataFrame({"id": range(100), "cat": rng.choice(["a", "c"], 100), "f0": rng.random(100)})
+
+    submissions = {}
+    for workers in [1, 2]:
+        comp = tmp_path / f"workers{workers}"
+        (comp / "data").mkdir(parents=True)
+        train.to_csv(comp / "data" / "train.csv", index=False)
+        test.to_csv(comp / "data" / "test.csv", index=False)
+        train_py = comp / "train.py"
+        train_py.write_text(FAST_TRAIN_TEMPLATE.format(competition_dir=str(comp), fold_workers=workers))
+        subprocess.run([sys.executable, str(train_py)], check=True, capture_output=True)
+        submissions[workers] = pd.read_csv(comp / "submission.csv", header=None)
+
+    np.testing.assert_array_equal(submissions[2][0], submissions[1][0])
+    np.testing.assert_allclose(submissions[2][1], submissions[1][1], atol=1e-6)
+    # "c" の行だけが正例なので、予測で完全に分けられる
+    positive = test["cat"].to_numpy() == "c"
+    assert submissions[2][1][positive].min() > submissions[2][1][~positive].max()
@@ -1,8 +1,13 @@
 """Tests for init-repo command."""
 
+import os
+import subprocess
+
 import pytest
 from click.testing import CliRunner
 from signate_deploy.cli import main
+from signate_deploy import __version__
+from signate_deploy.commands.init_repo import SUBMIT_WORKFLOW, TOOL_PACKAGES, render_workflow
 
 
 def test_init_repo_creates_workflows(tmp_path, monkeypatch):
@@ -51,3 +56,310 @@ def test_init_repo_force_overwrite(tmp_path, monkeypatch):
     result = runner.invoke(main, ["init-repo", "--force"])
     assert result.exit_code == 0
     assert "Skip" not in result.output
+
+
+def test_init_repo_parallel_download_step(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init-repo", "--download-workers", "6"])
+    assert result.exit_code == 0
+    for name in ["signate-submit.yml", "signate-download.yml"]:
+        content = (tmp_path / ".github" / "workflows" / name).read_text()
+        assert "python -m signate_deploy.data_download" in content
+        assert 'default: "6"' in content
+        assert "__DOWNLOAD_WORKERS__" not in content
+
+
+def test_init_repo_data_cache_step(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init-repo"])
+    assert result.exit_code == 0
+    for name in ["signate-submit.yml", "signate-download.yml"]:
+        content = (tmp_path / ".github" / "workflows" / name).read_text()
+        assert "actions/cache@v4" in content
+        assert "hashFiles(format('{0}/signate-config.json', inputs.competition_dir))" in content
+        assert "if: steps.data-cache.outputs.cache-hit != 'true'" in content
+
+
+def test_init_repo_no_data_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init-repo", "--no-data-cache"])
+    assert result.exit_code == 0
+    for name in ["signate-submit.yml", "signate-download.yml"]:
+        content = (tmp_path / ".github" / "workflows" / name).read_text()
+        assert "data-cache" not in content
+        assert "__DATA_CACHE" not in content
+
+
+def test_submit_workflow_dependency_cache_keys():
+    content = render_workflow(SUBMIT_WORKFLOW)
+    for prefix in ["pip-", "venv-"]:
+        key_line = next(l for l in content.splitlines() if l.strip().startswith(f"key: {prefix}"))
+        assert "steps.setup-python.outputs.python-version" in key_line
+        assert "format('{0}/requirements.txt', inputs.competition_dir)" in key_line
+        assert "'.github/workflows/signate-submit*.yml'" in key_line
+    assert "if: steps.venv-cache.outputs.cache-hit != 'true'" in content
+    assert "__" not in content.replace("__main__", "")
+
+
+def test_submit_workflow_uv_installer():
+    content = render_workflow(SUBMIT_WORKFLOW, installer="uv")
+    assert "astral-sh/setup-uv@v5" in content
+    assert "enable-cache: true" in content
+    assert f"uv pip install {TOOL_PACKAGES}" in content
+    assert "~/.cache/pip" not in content
+
+
+def test_submit_workflow_no_dependency_cache():
+    content = render_workflow(SUBMIT_WORKFLOW, dependency_cache=False)
+    assert "venv-cache" not in content
+    assert "~/.cache/pip" not in content
+    assert f"pip install {TOOL_PACKAGES}" in content
+
+
+def test_init_repo_installer_option(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init-repo", "--installer", "uv"])
+    assert result.exit_code == 0
+    content = (tmp_path / ".github" / "workflows" / "signate-submit.yml").read_text()
+    assert "uv pip install" in content
+
+
+def test_submit_workflow_restores_data_artifact():
+    content = render_workflow(SUBMIT_WORKFLOW)
+    assert "actions/download-artifact@v4" in content
+    assert "name: signate-data-${{ inputs.competition_dir }}" in content
+    assert "run-id: ${{ steps.data-artifact.outputs.run_id }}" in content
+    assert "actions: read" in content
+    # アーティファクトの検索 → 復元 → (必要なら) SIGNATE からダウンロード の順
+    assert content.index("Find data artifact") < content.index("Restore data artifact") < content.index("name: Download data")
+
+
+def test_init_repo_creates_matrix_workflow(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init-repo", "--max-parallel", "3"])
+    assert result.exit_code == 0
+    content = (tmp_path / ".github" / "workflows" / "signate-submit-matrix.yml").read_text()
+    assert 'default: "3"' in content
+    assert "max-parallel: ${{ fromJSON(inputs.max_parallel) }}" in content
+    assert "include: ${{ fromJSON(inputs.experiments) }}" in content
+    # 共通ステップは matrix の competition_dir を参照する
+    assert "inputs.competition_dir }}" not in content
+    assert "matrix-data-${{ matrix.competition_dir }}" in content
+
+
+def test_init_repo_token_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    runner.invoke(main, ["init-repo"])
+    content = (tmp_path / ".github" / "workflows" / "signate-submit.yml").read_text()
+    assert "signate-token-" not in content
+
+    result = runner.invoke(main, ["init-repo", "--force", "--token-cache"])
+    assert result.exit_code == 0
+    content = (tmp_path / ".github" / "workflows" / "signate-submit.yml").read_text()
+    assert "path: ~/.signate/signate.json" in content
+    assert content.index("Restore SIGNATE token cache") < content.index("name: Refresh SIGNATE token")
+
+
+def test_init_repo_convert_step(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    runner.invoke(main, ["init-repo"])
+    content = (tmp_path / ".github" / "workflows" / "signate-download.yml").read_text()
+    assert "signate_deploy.convert" not in content
+
+    result = runner.invoke(main, ["init-repo", "--force", "--convert", "feather"])
+    assert result.exit_code == 0
+    for name in ["signate-submit.yml", "signate-download.yml", "signate-submit-matrix.yml"]:
+        content = (tmp_path / ".github" / "workflows" / name).read_text()
+        assert "--format feather" in content
+        assert "__" not in content.replace("__main__", "")
+    content = (tmp_path / ".github" / "workflows" / "signate-download.yml").read_text()
+    assert "key: signate-data-feather-" in content
+    # ダウンロード → 変換 → アーティファクトのアップロード の順
+    assert content.index("name: Download data") < content.index("name: Convert data") < content.index("Upload data")
+    matrix = (tmp_path / ".github" / "workflows" / "signate-submit-matrix.yml").read_text()
+    assert '"${{ matrix.competition_dir }}/data" --format feather' in matrix
+
+
+def test_init_repo_feature_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init-repo"])
+    assert result.exit_code == 0
+    content = (tmp_path / ".github" / "workflows" / "signate-submit.yml").read_text()
+    assert "path: ${{ inputs.competition_dir }}/.feature-cache" in content
+    assert content.index("Restore feature cache") < content.index("name: Train and predict")
+    matrix = (tmp_path / ".github" / "workflows" / "signate-submit-matrix.yml").read_text()
+    assert "path: ${{ matrix.competition_dir }}/.feature-cache" in matrix
+    # 入力が変わらなければキーが一致し、実行ごとに新しいキャッシュを保存しない
+    key = (
+        "key: features-${{ matrix.competition_dir }}-${{ hashFiles(format('{0}/train.py', matrix.competition_dir), "
+        "format('{0}/signate-config.json', matrix.competition_dir)) }}"
+    )
+    assert key in matrix
+    assert "github.run_id" not in content.split("Restore feature cache")[1].split("- name:")[0]
+    assert ".feature-cache/" in (tmp_path / ".gitignore").read_text()
+
+    result = runner.invoke(main, ["init-repo", "--force", "--no-feature-cache"])
+    assert result.exit_code == 0
+    for name in ["signate-submit.yml", "signate-submit-matrix.yml"]:
+        content = (tmp_path / ".github" / "workflows" / name).read_text()
+        assert "feature-cache" not in content
+        assert "__" not in content.replace("__main__", "")
+
+
+def test_render_workflow_npy_convert():
+    from signate_deploy.commands.init_repo import DOWNLOAD_WORKFLOW
+
+    content = render_workflow(DOWNLOAD_WORKFLOW, convert="npy")
+    assert 'python -m signate_deploy.convert "${{ inputs.competition_dir }}/data" --format npy' in content
+    assert content.index("name: Convert data") < content.index("Upload data as artifact")
+
+
+def test_init_repo_sharded_workflow(tmp_path, monkeypatch):
+    yaml = pytest.importorskip("yaml")
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init-repo"])
+    assert result.exit_code == 0
+    assert not (tmp_path / ".github" / "workflows" / "signate-submit-sharded.yml").exists()
+
+    result = runner.invoke(main, ["init-repo", "--force", "--sharded", "--convert", "parquet"])
+    assert result.exit_code == 0
+    content = (tmp_path / ".github" / "workflows" / "signate-submit-sharded.yml").read_text()
+    assert "__" not in content.replace("__main__", "")
+    # competition_dir は matrix ではなく inputs のまま
+    assert "matrix.competition_dir" not in content
+    assert '"${{ inputs.competition_dir }}/data" --format parquet' in content
+
+    jobs = yaml.safe_load(content)["jobs"]
+    assert jobs["train"]["needs"] == "data"
+    assert jobs["merge"]["needs"] == "train"
+    assert jobs["train"]["strategy"]["matrix"] == {
+        "fold": "${{ fromJSON(inputs.folds) }}",
+        "seed": "${{ fromJSON(inputs.seeds) }}",
+    }
+    train_run = next(step["run"] for step in jobs["train"]["steps"] if step.get("name") == "Train fold")
+    assert '--fold "${{ matrix.fold }}" --seed "${{ matrix.seed }}" --out shards' in train_run
+    merge_steps = [step.get("name") for step in jobs["merge"]["steps"]]
+    assert merge_steps.index("Download fold predictions") < merge_steps.index("Merge folds and compute CV")
+    assert merge_steps.index("Merge folds and compute CV") < merge_steps.index("Submit")
+    # 提出前の検証には sample_submit / test が要るので、merge ジョブでもデータを復元する
+    restore = next(step for step in jobs["merge"]["steps"] if step.get("name") == "Restore data")
+    assert restore["with"] == {"name": "shard-data", "path": "${{ inputs.competition_dir }}/data"}
+    assert merge_steps.index("Restore data") < merge_steps.index("Validate submission")
+
+
+def test_init_repo_model_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(main, ["init-repo", "--sharded"])
+    assert result.exit_code == 0
+    content = (tmp_path / ".github" / "workflows" / "signate-submit.yml").read_text()
+    assert "path: ${{ inputs.competition_dir }}/.model-cache" in content
+    assert content.index("Restore model cache") < content.index("name: Train and predict")
+    matrix = (tmp_path / ".github" / "workflows" / "signate-submit-matrix.yml").read_text()
+    assert "path: ${{ matrix.competition_dir }}/.model-cache" in matrix
+    sharded = (tmp_path / ".github" / "workflows" / "signate-submit-sharded.yml").read_text()
+    assert sharded.index("Restore model cache") < sharded.index("name: Train fold")
+    # 入力（train.py・signate-config.json・実験設定）とジョブが同じならキーが一致する
+    assert "github.run_id" not in content.split("Restore model cache")[1].split("- name:")[0]
+    assert "key: models-${{ inputs.competition_dir }}-${{ strategy.job-index }}-${{ hashFiles(" in content
+    assert "matrix.config || format('{0}/signate-config.json', matrix.competition_dir)) }}" in matrix
+    assert "key: models-${{ inputs.competition_dir }}-fold${{ matrix.fold }}-seed${{ matrix.seed }}-" in sharded
+    assert "inputs.config || format('{0}/signate-config.json', inputs.competition_dir)) }}" in sharded
+    assert ".model-cache/" in (tmp_path / ".gitignore").read_text()
+
+    result = runner.invoke(main, ["init-repo", "--force", "--no-model-cache"])
+    assert result.exit_code == 0
+    for name in ["signate-submit.yml", "signate-submit-matrix.yml"]:
+        content = (tmp_path / ".github" / "workflows" / name).read_text()
+        assert "model-cache" not in content
+        assert "__" not in content.replace("__main__", "")
+
+
+def test_submit_workflows_validate_before_submit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner().invoke(main, ["init-repo", "--sharded"])
+    assert result.exit_code == 0
+    for name, competition_dir in [
+        ("signate-submit.yml", "inputs.competition_dir"),
+        ("signate-submit-matrix.yml", "matrix.competition_dir"),
+        ("signate-submit-sharded.yml", "inputs.competition_dir"),
+    ]:
+        content = (tmp_path / ".github" / "workflows" / name).read_text()
+        assert f'run: signate-deploy validate "${{{{ {competition_dir} }}}}"' in content
+        assert content.index("name: Validate submission") < content.index("name: Submit")
+
+
+def test_init_repo_submission_ledger(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner().invoke(main, ["init-repo"])
+    assert result.exit_code == 0
+    assert "submissions.jsonl merge=union" in (tmp_path / ".gitattributes").read_text()
+    assert ".submissions-index.sqlite" in (tmp_path / ".gitignore").read_text()
+    content = (tmp_path / ".github" / "workflows" / "signate-submit.yml").read_text()
+    assert "contents: write" in content
+    assert '--memo "$MEMO" --on-duplicate "${{ inputs.on_duplicate }}"' in content
+    assert "if: steps.submit.outputs.recorded == 'true'" in content
+    matrix = (tmp_path / ".github" / "workflows" / "signate-submit-matrix.yml").read_text()
+    assert "LEDGER: ${{ matrix.competition_dir }}/submissions.jsonl" in matrix
+
+    # 既存の .gitattributes には1回だけ追記する
+    result = CliRunner().invoke(main, ["init-repo", "--force"])
+    assert (tmp_path / ".gitattributes").read_text().count("merge=union") == 1
+
+
+def test_ledger_commit_step_pushes_with_dirty_tree(tmp_path):
+    yaml = pytest.importorskip("yaml")
+    from signate_deploy.commands.init_repo import LEDGER_COMMIT_STEP
+
+    def git(cwd, *args):
+        subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+    remote, work, other = tmp_path / "remote.git", tmp_path / "work", tmp_path / "other"
+    git(tmp_path, "init", "--quiet", "--bare", str(remote))
+    git(tmp_path, "clone", "--quiet", str(remote), str(work))
+    (work / "comp").mkdir()
+    (work / "comp" / "signate-manifest.json").write_text("{}\n")
+    (work / "comp" / "submissions.jsonl").write_text("")
+    git(work, "add", ".")
+    git(work, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "--quiet", "-m", "init")
+    git(work, "push", "--quiet", "origin", "HEAD")
+    # 別のジョブが先にプッシュしていて、こちらは取り込み直しが要る
+    git(tmp_path, "clone", "--quiet", str(remote), str(other))
+    (other / "README").write_text("x\n")
+    git(other, "add", ".")
+    git(other, "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "--quiet", "-m", "other")
+    git(other, "push", "--quiet", "origin", "HEAD")
+    # 前のステップが追跡中のファイルを書き換えている
+    (work / "comp" / "signate-manifest.json").write_text('{"downloaded_at": "now"}\n')
+    (work / "comp" / "submissions.jsonl").write_text('{"sha256": "ab"}\n')
+
+    step = yaml.safe_load(LEDGER_COMMIT_STEP)[0]
+    script = step["run"].replace("${{ github.run_id }}", "1")
+    env = {"LEDGER": "comp/submissions.jsonl", "PATH": os.environ["PATH"], "HOME": str(tmp_path)}
+    result = subprocess.run(["bash", "-e", "-c", script], cwd=work, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+    log = subprocess.run(["git", "log", "--format=%s"], cwd=remote, capture_output=True, text=True).stdout
+    assert log.splitlines() == ["Record submission 1", "other", "init"]
+    assert (work / "comp" / "signate-manifest.json").read_text() == '{"downloaded_at": "now"}\n'
+
+
+def test_workflows_pin_tool_versions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner().invoke(main, ["init-repo", "--sharded"])
+    assert result.exit_code == 0
+    assert f"signate-deploy=={__version__}" in TOOL_PACKAGES
+    for path in (tmp_path / ".github" / "workflows").glob("*.yml"):
+        content = path.read_text()
+        for line in content.splitlines():
+            if "install" in line and "signate" in line:
+                # ワークフローが呼ぶモジュールと CLI の版を揃え、signate / requests も固定する
+                assert line.strip().endswith(TOOL_PACKAGES), (path.name, line)
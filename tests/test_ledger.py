@@ -0,0 +1,133 @@
+"""Tests for the submission ledger and the history command."""
+
+import json
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+import pytest
+from click.testing import CliRunner
+
+from signate_deploy.cli import main
+from signate_deploy.ledger import Ledger
+from signate_deploy.ledger import main as submit_step
+
+
+def _entry(sha256, submitted_at, cv_score=None, memo=""):
+    return {"sha256": sha256, "submitted_at": submitted_at, "cv_score": cv_score, "metric": "auc", "memo": memo,
+            "run_id": "1", "file": "submission.csv"}
+
+
+@pytest.fixture
+def comp(tmp_path):
+    comp = tmp_path / "comp"
+    comp.mkdir()
+    (comp / "signate-config.json").write_text('{"task_key": "t", "file_keys": {}}')
+    (comp / "submission.csv").write_text("1,0.5\n2,0.25\n")
+    return comp
+
+
+def test_history_sort_and_hash_prefix(comp):
+    ledger = Ledger(comp)
+    ledger.append(_entry("aa11", "2026-01-01T00:00:00Z", 0.70, "first"))
+    ledger.append(_entry("bb22", "2026-01-02T00:00:00Z", None, "no cv"))
+    ledger.append(_entry("ab33", "2026-01-03T00:00:00Z", 0.75, "best"))
+    assert [e["memo"] for e in ledger.history()] == ["best", "no cv", "first"]
+    assert [e["memo"] for e in ledger.history(sort="cv")] == ["best", "first"]
+    assert [e["memo"] for e in ledger.history(limit=1)] == ["best"]
+    assert [e["sha256"] for e in ledger.history(sha256_prefix="A")] == ["ab33", "aa11"]
+    assert [e["memo"] for e in ledger.find("bb22")] == ["no cv"]
+
+
+def test_index_reads_only_appended_lines(comp):
+    ledger = Ledger(comp)
+    ledger.append(_entry("aa11", "2026-01-01T00:00:00Z"))
+    assert ledger.count() == 1
+    ledger.append(_entry("bb22", "2026-01-02T00:00:00Z"))
+    # 書きかけの行と壊れた行は取り込まない
+    with open(ledger.path, "a") as f:
+        f.write("<<<<<<< HEAD\n" + '{"sha256": "cc')
+    assert ledger.count() == 2
+    with open(ledger.path, "a") as f:
+        f.write('33", "submitted_at": "2026-01-03T00:00:00Z"}\n')
+    assert [e["sha256"] for e in ledger.history()] == ["cc33", "bb22", "aa11"]
+    with sqlite3.connect(ledger.index_path) as conn:
+        assert conn.execute("SELECT line FROM submissions ORDER BY line").fetchall() == [(1,), (2,), (4,)]
+
+    # 途中が書き換わったら（git のマージなど）作り直す
+    lines = ledger.path.read_text().splitlines(keepends=True)
+    ledger.path.write_text(lines[1] + lines[0].replace("aa11", "dd44"))
+    assert sorted(e["sha256"] for e in ledger.history()) == ["bb22", "dd44"]
+
+
+def test_index_query_plans_use_indexes(comp):
+    ledger = Ledger(comp)
+    ledger.append(_entry("aa11", "2026-01-01T00:00:00Z", 0.7))
+    ledger.count()
+    with sqlite3.connect(ledger.index_path) as conn:
+        for query in [
+            "SELECT entry FROM submissions WHERE sha256 = 'x'",
+            "SELECT entry FROM submissions WHERE sha256 >= 'a' AND sha256 < 'ag'",
+            "SELECT entry FROM submissions WHERE cv_score IS NOT NULL ORDER BY cv_score DESC LIMIT 5",
+        ]:
+            plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}"))
+            assert "USING INDEX" in plan, plan
+
+
+def _run_step(comp, monkeypatch, tmp_path, *args):
+    output = tmp_path / "github-output"
+    output.write_text("")
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+    monkeypatch.setenv("GITHUB_RUN_ID", "42")
+    with patch("signate_deploy.ledger.subprocess.run", return_value=MagicMock(returncode=0)) as run:
+        result = CliRunner().invoke(submit_step, [str(comp), "--memo", "v1", *args])
+    return result, run, output.read_text()
+
+
+def test_submit_step_records_and_skips_duplicates(comp, monkeypatch, tmp_path):
+    (comp / "cv-score.json").write_text('{"metric": "auc", "score": 0.8123}')
+    result, run, output = _run_step(comp, monkeypatch, tmp_path)
+    assert result.exit_code == 0, result.output
+    assert run.call_args[0][0] == ["signate", "submit", str(comp / "submission.csv"), "--task_key", "t", "--memo", "v1"]
+    assert output == "recorded=true\n"
+    entry = json.loads((comp / "submissions.jsonl").read_text())
+    assert (entry["memo"], entry["run_id"], entry["cv_score"], entry["metric"]) == ("v1", "42", 0.8123, "auc")
+
+    result, run, output = _run_step(comp, monkeypatch, tmp_path)
+    assert result.exit_code == 0
+    assert not run.called
+    assert output == "recorded=false\n"
+    assert "::warning::同じ内容の submission.csv を提出済みです" in result.output
+
+    result, run, output = _run_step(comp, monkeypatch, tmp_path, "--on-duplicate", "warn")
+    assert run.called and output == "recorded=true\n"
+    assert len(Ledger(comp).find(entry["sha256"])) == 2
+
+    (comp / "submission.csv").write_text("1,0.5\n2,0.26\n")
+    result, run, output = _run_step(comp, monkeypatch, tmp_path)
+    assert run.called and "::warning::" not in result.output
+
+
+def test_submit_step_does_not_record_failed_submission(comp, monkeypatch, tmp_path):
+    with patch("signate_deploy.ledger.subprocess.run", return_value=MagicMock(returncode=3)):
+        result = CliRunner().invoke(submit_step, [str(comp)])
+    assert result.exit_code == 3
+    assert not (comp / "submissions.jsonl").exists()
+
+
+def test_history_command(comp):
+    runner = CliRunner()
+    result = runner.invoke(main, ["history", str(comp)])
+    assert result.exit_code == 0
+    assert "submissions.jsonl がありません" in result.output
+
+    ledger = Ledger(comp)
+    for i in range(30):
+        ledger.append(_entry(f"{i:02x}" * 32, f"2026-01-01T00:00:{i:02d}Z", i / 100, f"exp{i}"))
+    result = runner.invoke(main, ["history", str(comp), "-n", "2", "--sort", "cv"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[0] == f"2026-01-01T00:00:29Z  {'1d' * 6}  auc=0.29000  run 1  exp29"
+    assert lines[-1] == "(2 / 30 件)"
+
+    result = runner.invoke(main, ["history", str(comp), "--all", "--json"])
+    assert len(result.output.splitlines()) == 30
@@ -0,0 +1,136 @@
+"""Tests for competition/task/file listing cache (--refresh / --offline / --json)."""
+
+import json
+import time
+
+import pytest
+from click.testing import CliRunner
+from signate_deploy import listings
+from signate_deploy.backend import InProcessBackend, SignateResult
+from signate_deploy.cli import main
+from signate_deploy.listings import Listing, MetadataCache, fetch_listing, parse_table
+
+from tests import fake_signate
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """fake_signate を使うバックエンドに差し替え、signate 呼び出し回数を記録する."""
+    recorded = []
+
+    class CountingBackend(InProcessBackend):
+        def run(self, args, capture=False):
+            recorded.append(list(args))
+            return super().run(args, capture=capture)
+
+    monkeypatch.setattr(listings, "get_backend", lambda use_cache=True, concurrent=False: CountingBackend(fake_signate.cli))
+    return recorded
+
+
+def test_parse_table_whitespace():
+    text = "public_key  task_name\ntask1  Task One\ntask2  Task Two\n"
+    assert parse_table(text) == [
+        {"public_key": "task1", "task_name": "Task One"},
+        {"public_key": "task2", "task_name": "Task Two"},
+    ]
+
+
+def test_parse_table_grid():
+    text = (
+        "+------------+-----------+\n"
+        "| public_key | file_name |\n"
+        "+============+===========+\n"
+        "| f_train    | train.csv |\n"
+        "+------------+-----------+\n"
+    )
+    assert parse_table(text) == [{"public_key": "f_train", "file_name": "train.csv"}]
+
+
+def test_parse_table_empty():
+    assert parse_table("") == []
+
+
+def test_fetch_listing_uses_cache(calls):
+    first = fetch_listing("tasks", "comp1")
+    second = fetch_listing("tasks", "comp1")
+    assert len(calls) == 1
+    assert second.rows == first.rows
+    assert [r["public_key"] for r in second.rows] == ["task1", "task2"]
+
+
+def test_fetch_listing_refresh(calls):
+    fetch_listing("tasks", "comp1")
+    fetch_listing("tasks", "comp1", refresh=True)
+    assert len(calls) == 2
+
+
+def test_fetch_listing_expired_entry_refetched(calls):
+    cache = MetadataCache()
+    cache.put(Listing("tasks", "comp1", "old\n", [], fetched_at=time.time() - 10, ttl=1))
+    listing = fetch_listing("tasks", "comp1")
+    assert len(calls) == 1
+    assert "task1" in listing.stdout
+
+
+def test_fetch_listing_offline_serves_stale(calls):
+    cache = MetadataCache()
+    cache.put(Listing("tasks", "comp1", "stale\n", [{"public_key": "x"}], fetched_at=0, ttl=1))
+    listing = fetch_listing("tasks", "comp1", offline=True)
+    assert calls == []
+    assert listing.stdout == "stale\n"
+
+
+def test_fetch_listing_offline_miss(calls):
+    assert fetch_listing("files", "task1", offline=True) is None
+    assert calls == []
+
+
+def test_fetch_listing_failure_not_cached(calls):
+    assert fetch_listing("files", "missing") is None
+    assert MetadataCache().get("files", "missing") is None
+
+
+@pytest.mark.parametrize("stdout", ["", "Error: 500 Internal Server Error\n", "HTTP Error\nplease retry later\n"])
+def test_fetch_listing_unparsable_output_not_cached(monkeypatch, stdout):
+    class ErrorBackend:
+        def run(self, args, capture=False):
+            return SignateResult(0, stdout)
+
+    monkeypatch.setattr(listings, "get_backend", lambda use_cache=True, concurrent=False: ErrorBackend())
+    listing = fetch_listing("tasks", "comp1")
+    assert listing.stdout == stdout
+    assert MetadataCache().get("tasks", "comp1") is None
+
+
+def test_fetch_listing_unwritable_cache_dir(calls, tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setenv("SIGNATE_DEPLOY_CACHE_DIR", str(blocker / "cache"))
+    listing = fetch_listing("tasks", "comp1")
+    assert [r["public_key"] for r in listing.rows] == ["task1", "task2"]
+    fetch_listing("tasks", "comp1")
+    assert len(calls) == 2
+
+
+def test_file_list_json(calls):
+    runner = CliRunner()
+    result = runner.invoke(main, ["file-list", "task1", "--json"])
+    assert result.exit_code == 0
+    data = json.loads(result.output)
+    assert data["kind"] == "files"
+    assert [r["public_key"] for r in data["rows"]] == ["f_train", "f_test"]
+
+
+def test_competition_list_offline_after_fetch(calls):
+    runner = CliRunner()
+    runner.invoke(main, ["competition-list"])
+    result = runner.invoke(main, ["competition-list", "--offline"])
+    assert result.exit_code == 0
+    assert "comp1" in result.output
+    assert len(calls) == 1
+
+
+def test_task_list_offline_miss_fails(calls):
+    runner = CliRunner()
+    result = runner.invoke(main, ["task-list", "comp1", "--offline"])
+    assert result.exit_code != 0
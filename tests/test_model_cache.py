@@ -0,0 +1,83 @@
+"""Tests for signate_deploy.model_cache."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from signate_deploy.model_cache import FoldModel, FoldModelCache  # noqa: E402
+
+
+@pytest.fixture
+def cache(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "train.csv").write_text("a\n1\n")
+    return FoldModelCache(tmp_path / "cache", data_dir)
+
+
+def test_key_ignores_volatile_params(cache):
+    y = np.array([0, 0, 1, 1])
+    idx = np.arange(2)
+    base = cache.key(0, {"learning_rate": 0.05, "n_estimators": 100, "n_jobs": 4}, "features", y, idx)
+    assert base == cache.key(0, {"learning_rate": 0.05, "n_estimators": 500, "n_jobs": 1}, "features", y, idx)
+    assert base != cache.key(1, {"learning_rate": 0.05}, "features", y, idx)
+    assert base != cache.key(0, {"learning_rate": 0.1}, "features", y, idx)
+    assert base != cache.key(0, {"learning_rate": 0.05}, "features2", y, idx)
+    assert base != cache.key(0, {"learning_rate": 0.05}, "features", y[::-1], idx)
+
+
+def test_key_changes_with_dataframe_columns(cache):
+    pd = pytest.importorskip("pandas")
+    X = pd.DataFrame({"f0": [1.0, 2.0], "f1": [3, 4]})
+    key = cache.key(0, {}, X)
+    assert key == cache.key(0, {}, X.copy())
+    assert key != cache.key(0, {}, X.drop(columns=["f0"]))
+    assert key != cache.key(0, {}, X.astype({"f1": "float32"}))
+    assert key != cache.key(0, {}, X.rename(columns={"f1": "f2"}))
+
+
+def test_key_changes_with_data(cache):
+    key = cache.key(0, {})
+    (cache.data_dir / "test.csv").write_text("a\n1\n")
+    assert FoldModelCache(cache.cache_dir, cache.data_dir).key(0, {}) != key
+
+
+def test_fold_model_reuse_rules(tmp_path):
+    finished = FoldModel(tmp_path, {"num_boost_round": 100, "trained_rounds": 100, "best_iteration": 90})
+    assert finished.reusable(100)
+    assert not finished.reusable(200)
+    assert finished.continuable(200)
+    assert not finished.continuable(50)
+
+    stopped = FoldModel(tmp_path, {"num_boost_round": 1000, "trained_rounds": 140, "best_iteration": 90})
+    assert stopped.reusable(1000)
+    assert stopped.reusable(2000)
+    assert stopped.reusable(140)
+    assert not stopped.reusable(120)
+    assert not stopped.continuable(2000)
+
+
+def test_put_get_and_continue(cache):
+    lgb = pytest.importorskip("lightgbm")
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 3))
+    y = (X[:, 0] > 0).astype(int)
+    params = {"objective": "binary", "verbosity": -1}
+
+    def dataset():
+        # init_model は Dataset に init_score を設定するので、学習ごとに作り直す
+        return lgb.Dataset(X, y, free_raw_data=False)
+
+    assert cache.get("k") is None
+    booster = lgb.train(params, dataset(), num_boost_round=5)
+    cache.put("k", booster, np.zeros(3, dtype=np.float32), np.ones(4, dtype=np.float32), 5)
+
+    cached = cache.get("k")
+    assert (cached.num_boost_round, cached.trained_rounds) == (5, 5)
+    np.testing.assert_array_equal(cached.test_pred(), np.ones(4))
+    assert cached.continuable(8)
+
+    continued = lgb.train(params, dataset(), num_boost_round=3, init_model=str(cached.model_path))
+    fresh = lgb.train(params, dataset(), num_boost_round=8)
+    assert continued.current_iteration() == 8
+    np.testing.assert_allclose(continued.predict(X), fresh.predict(X))
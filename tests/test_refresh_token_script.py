@@ -0,0 +1,101 @@
+"""Tests for the generated scripts/refresh_signate_token.py (against a local stub server)."""
+
+import base64
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from signate_deploy.commands.init_repo import REFRESH_TOKEN_SCRIPT
+
+pytest.importorskip("requests")
+
+
+def _jwt(exp: float) -> str:
+    def b64(obj):
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b"=").decode()
+
+    return f"{b64({'alg': 'HS256'})}.{b64({'exp': int(exp)})}.signature"
+
+
+@pytest.fixture
+def signate_api(fake_server):
+    """CSRF → sign_in → organizations/sign_in を模したスタブ."""
+    new_jwt = _jwt(time.time() + 3600)
+    fake_server.new_jwt = new_jwt
+    fake_server.routes["/v1/token"] = (200, b"{}", {"Set-Cookie": "_user_csrf_cloud=csrf123; Path=/"})
+    fake_server.routes["POST /v1/sign_in"] = (200, b"{}")
+    fake_server.routes["POST /v1/organizations/sign_in"] = (
+        200, b"{}", {"Set-Cookie": f"cloud_user={new_jwt}; Path=/"},
+    )
+    return fake_server
+
+
+def _run(tmp_path, server, *args):
+    script = tmp_path / "refresh_signate_token.py"
+    script.write_text(REFRESH_TOKEN_SCRIPT)
+    env = dict(
+        os.environ,
+        HOME=str(tmp_path),
+        SIGNATE_CLOUD_URL=server.url,
+        SIGNATE_EMAIL="user@example.com",
+        SIGNATE_PASSWORD="secret",
+    )
+    return subprocess.run([sys.executable, str(script), *args], env=env, capture_output=True, text=True)
+
+
+def _token_path(tmp_path):
+    return tmp_path / ".signate" / "signate.json"
+
+
+def test_refreshes_when_no_cached_token(tmp_path, signate_api):
+    result = _run(tmp_path, signate_api)
+    assert result.returncode == 0, result.stderr
+    assert _token_path(tmp_path).read_text() == signate_api.new_jwt
+    assert signate_api.requests == ["/v1/token", "POST /v1/sign_in", "POST /v1/organizations/sign_in"]
+
+
+def test_skips_when_cached_token_valid(tmp_path, signate_api):
+    _token_path(tmp_path).parent.mkdir()
+    valid = _jwt(time.time() + 3600)
+    _token_path(tmp_path).write_text(valid)
+    result = _run(tmp_path, signate_api)
+    assert result.returncode == 0, result.stderr
+    assert "still valid" in result.stdout
+    assert signate_api.requests == []
+    assert _token_path(tmp_path).read_text() == valid
+
+
+def test_refreshes_when_cached_token_expired(tmp_path, signate_api):
+    _token_path(tmp_path).parent.mkdir()
+    _token_path(tmp_path).write_text(_jwt(time.time() - 10))
+    result = _run(tmp_path, signate_api)
+    assert result.returncode == 0, result.stderr
+    assert _token_path(tmp_path).read_text() == signate_api.new_jwt
+
+
+def test_refreshes_when_cached_token_near_expiry(tmp_path, signate_api):
+    _token_path(tmp_path).parent.mkdir()
+    _token_path(tmp_path).write_text(_jwt(time.time() + 60))
+    result = _run(tmp_path, signate_api)
+    assert result.returncode == 0, result.stderr
+    assert len(signate_api.requests) == 3
+
+
+def test_force_refreshes_valid_token(tmp_path, signate_api):
+    _token_path(tmp_path).parent.mkdir()
+    _token_path(tmp_path).write_text(_jwt(time.time() + 3600))
+    result = _run(tmp_path, signate_api, "--force")
+    assert result.returncode == 0, result.stderr
+    assert _token_path(tmp_path).read_text() == signate_api.new_jwt
+
+
+def test_retries_transient_5xx(tmp_path, signate_api):
+    failures = iter([(503, b"unavailable")])
+    signate_api.routes["POST /v1/sign_in"] = lambda handler: next(failures, (200, b"{}"))
+    result = _run(tmp_path, signate_api)
+    assert result.returncode == 0, result.stderr
+    assert signate_api.requests.count("POST /v1/sign_in") == 2
+    assert _token_path(tmp_path).read_text() == signate_api.new_jwt
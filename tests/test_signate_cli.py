@@ -0,0 +1,121 @@
+"""Tests for signate CLI executable discovery cache."""
+
+import json
+import os
+import sys
+
+import pytest
+from signate_deploy import signate_cli
+from signate_deploy.signate_cli import find_signate_exe
+
+
+@pytest.fixture
+def fake_env(tmp_path, monkeypatch):
+    """偽の signate 実行ファイルを PATH に置き、キャッシュ先を tmp_path に向ける."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    exe = bin_dir / "signate"
+    exe.write_text("#!/bin/sh\n")
+    exe.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+    monkeypatch.setenv("SIGNATE_DEPLOY_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(signate_cli, "_memo", {})
+    return exe
+
+
+def _count_searches(monkeypatch):
+    calls = []
+    original = signate_cli._search_signate_exe
+
+    def counting():
+        calls.append(1)
+        return original()
+
+    monkeypatch.setattr(signate_cli, "_search_signate_exe", counting)
+    return calls
+
+
+def test_find_signate_exe_on_path(fake_env):
+    assert find_signate_exe() == str(fake_env)
+
+
+def test_memoized_in_process(fake_env, monkeypatch):
+    calls = _count_searches(monkeypatch)
+    find_signate_exe()
+    find_signate_exe()
+    assert len(calls) == 1
+
+
+def test_persisted_to_disk(fake_env, tmp_path, monkeypatch):
+    find_signate_exe()
+    entry = json.loads((tmp_path / "cache" / signate_cli.CACHE_FILENAME).read_text())
+    assert entry["signate_exe"] == str(fake_env)
+    assert entry["executable"] == sys.executable
+
+    # 新しいプロセスを模してメモをクリアしてもディスクから読める
+    monkeypatch.setattr(signate_cli, "_memo", {})
+    calls = _count_searches(monkeypatch)
+    assert find_signate_exe() == str(fake_env)
+    assert calls == []
+
+
+def test_invalidated_when_path_changes(fake_env, tmp_path, monkeypatch):
+    find_signate_exe()
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    other_exe = other_dir / "signate"
+    other_exe.write_text("#!/bin/sh\n")
+    other_exe.chmod(0o755)
+    monkeypatch.setenv("PATH", str(other_dir))
+    assert find_signate_exe() == str(other_exe)
+
+
+def test_invalidated_when_executable_changes(fake_env, monkeypatch):
+    find_signate_exe()
+    monkeypatch.setattr(signate_cli, "_memo", {})
+    monkeypatch.setattr(sys, "executable", "/nonexistent/python")
+    calls = _count_searches(monkeypatch)
+    find_signate_exe()
+    assert len(calls) == 1
+
+
+def test_invalidated_when_mtime_changes(fake_env, monkeypatch):
+    find_signate_exe()
+    st = fake_env.stat()
+    os.utime(fake_env, (st.st_atime, st.st_mtime + 10))
+    calls = _count_searches(monkeypatch)
+    find_signate_exe()
+    assert len(calls) == 1
+
+    # ディスク側のキャッシュも更新されている
+    monkeypatch.setattr(signate_cli, "_memo", {})
+    find_signate_exe()
+    assert len(calls) == 1
+
+
+def test_invalidated_when_binary_removed(fake_env, monkeypatch):
+    find_signate_exe()
+    fake_env.unlink()
+    monkeypatch.setattr(signate_cli, "_search_signate_exe", lambda: None)
+    assert find_signate_exe() is None
+
+
+def test_no_cache_forces_search(fake_env, monkeypatch):
+    find_signate_exe()
+    calls = _count_searches(monkeypatch)
+    assert find_signate_exe(use_cache=False) == str(fake_env)
+    assert len(calls) == 1
+
+
+def test_corrupt_cache_file_ignored(fake_env, tmp_path):
+    cache_file = tmp_path / "cache" / signate_cli.CACHE_FILENAME
+    cache_file.parent.mkdir()
+    cache_file.write_text("not json")
+    assert find_signate_exe() == str(fake_env)
+
+
+def test_unwritable_cache_dir_ignored(fake_env, tmp_path, monkeypatch):
+    # キャッシュ先がファイルで塞がれていて書けなくても探索結果は返す
+    (tmp_path / "blocked").write_text("")
+    monkeypatch.setenv("SIGNATE_DEPLOY_CACHE_DIR", str(tmp_path / "blocked" / "cache"))
+    assert find_signate_exe() == str(fake_env)
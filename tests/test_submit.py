@@ -0,0 +1,117 @@
+"""Tests for submit command."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from click.testing import CliRunner
+from signate_deploy.cli import main
+
+
+@pytest.fixture
+def comp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ["comp-a", "comp-b"]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "signate-config.json").write_text('{"task_key": "t", "file_keys": {}}')
+    (tmp_path / "exp1.json").write_text('{"learning_rate": 0.1}')
+    return tmp_path
+
+
+def _invoke(args):
+    with patch("signate_deploy.commands.submit.subprocess.run",
+               return_value=MagicMock(returncode=0, stderr="")) as run:
+        result = CliRunner().invoke(main, ["submit", *args])
+    return result, run
+
+
+def _fields(cmd):
+    return dict(cmd[i + 1].split("=", 1) for i, a in enumerate(cmd) if a == "-f")
+
+
+def test_submit_single_dir(comp):
+    result, run = _invoke(["comp-a", "--memo", "v1"])
+    assert result.exit_code == 0
+    cmd = run.call_args[0][0]
+    assert cmd[:4] == ["gh", "workflow", "run", "signate-submit.yml"]
+    assert _fields(cmd) == {"competition_dir": "comp-a", "memo": "v1"}
+
+
+def test_submit_matrix(comp):
+    result, run = _invoke(["comp-a", "comp-b", "comp-a:exp1.json", "--memo", "sweep", "--max-parallel", "1"])
+    assert result.exit_code == 0
+    assert run.call_count == 1
+    cmd = run.call_args[0][0]
+    assert cmd[3] == "signate-submit-matrix.yml"
+    fields = _fields(cmd)
+    experiments = json.loads(fields["experiments"])
+    assert [(e["competition_dir"], e["config"]) for e in experiments] == [
+        ("comp-a", ""), ("comp-b", ""), ("comp-a", "exp1.json"),
+    ]
+    assert experiments[2]["memo"] == "sweep (comp-a:exp1.json)"
+    assert json.loads(fields["competition_dirs"]) == ["comp-a", "comp-b"]
+    assert fields["max_parallel"] == "1"
+
+
+def test_submit_daily_limit(comp):
+    (comp / "exp2.json").write_text('{"learning_rate": 0.05}')
+    result, run = _invoke(["comp-a", "comp-a:exp1.json", "comp-a:exp2.json", "comp-b", "--daily-limit", "2"])
+    assert result.exit_code == 1
+    assert "--daily-limit 2" in result.output
+    run.assert_not_called()
+
+    result, run = _invoke(["comp-a", "comp-a:exp1.json", "comp-b", "--daily-limit", "2"])
+    assert result.exit_code == 0
+    assert run.call_count == 1
+
+
+def test_submit_single_dir_with_config_uses_matrix(comp):
+    result, run = _invoke(["comp-a:exp1.json"])
+    assert result.exit_code == 0
+    assert run.call_args[0][0][3] == "signate-submit-matrix.yml"
+
+
+def test_submit_sharded(comp):
+    result, run = _invoke(["comp-a:exp1.json", "--sharded", "--seed", "0", "--seed", "1", "--max-parallel", "4"])
+    assert result.exit_code == 0
+    cmd = run.call_args[0][0]
+    assert cmd[3] == "signate-submit-sharded.yml"
+    fields = _fields(cmd)
+    assert fields["competition_dir"] == "comp-a"
+    assert fields["config"] == "exp1.json"
+    assert json.loads(fields["seeds"]) == [0, 1]
+    assert fields["max_parallel"] == "4"
+
+
+def test_submit_sharded_requires_single_experiment(comp):
+    result, run = _invoke(["comp-a", "comp-b", "--sharded"])
+    assert result.exit_code == 1
+    run.assert_not_called()
+    result, run = _invoke(["comp-a", "--seed", "1"])
+    assert result.exit_code == 1
+    run.assert_not_called()
+
+
+def test_submit_missing_config_file(comp):
+    result, run = _invoke(["comp-a:missing.json"])
+    assert result.exit_code != 0
+    run.assert_not_called()
+
+
+def test_submit_missing_competition_dir(comp):
+    result, run = _invoke(["comp-a", "nope"])
+    assert result.exit_code != 0
+    run.assert_not_called()
+
+
+def test_submit_gh_failure(comp):
+    with patch("signate_deploy.commands.submit.subprocess.run",
+               return_value=MagicMock(returncode=1, stderr="boom")):
+        result = CliRunner().invoke(main, ["submit", "comp-a"])
+    assert result.exit_code != 0
+
+
+def test_submit_allow_duplicate(comp):
+    result, run = _invoke(["comp-a", "--allow-duplicate"])
+    assert result.exit_code == 0
+    assert _fields(run.call_args[0][0])["on_duplicate"] == "warn"
@@ -0,0 +1,90 @@
+"""Tests for signate_deploy.validate and the validate command."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from signate_deploy.cli import main
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from signate_deploy.validate import Expected, expected_format, validate_submission  # noqa: E402
+
+
+def _write(path, text):
+    path.write_text(text)
+    return path
+
+
+@pytest.fixture
+def comp(tmp_path):
+    comp = tmp_path / "comp"
+    (comp / "data").mkdir(parents=True)
+    (comp / "signate-config.json").write_text('{"task_key": "t", "file_keys": {}}')
+    _write(comp / "data" / "test.csv", "id,x\n10,1\n11,2\n12,3\n")
+    return comp
+
+
+def test_valid_submission(tmp_path):
+    path = _write(tmp_path / "sub.csv", "12,0.5\n10,0.1\n11,1e-3\n")
+    result = validate_submission(path, Expected(np.array([10, 11, 12]), reference="test.csv"), chunksize=2)
+    assert result.ok, result.errors
+    assert result.rows == 3
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("id,pred\n10,0.1\n11,0.2\n12,0.3\n", "ヘッダ行があります"),
+        ("10,0.1,1\n11,0.2,1\n12,0.3,1\n", "列数が 3 です"),
+        ("10,0.1\n11,0.2\n", "行数が 2 です"),
+        ("10,0.1\n11,0.2\n11,0.3\n", "重複した id が 1 個あります: 11"),
+        ("10,0.1\n11,0.2\n13,0.3\n", "test.csv にない id が 1 個あります: 13"),
+        ("10,0.1\n11,0.2\n13,0.3\n", "test.csv の id が 1 個足りません: 12"),
+        ("10,0.1\n11,nan\n12,inf\n", "NaN・inf の予測が 2 件あります（行: 2, 3）"),
+        ("10,0.1\n11,abc\n12,0.3\n", "数値でない・NaN・inf の予測が 1 件あります（行: 2）"),
+        ("10,0.1\nx,0.2\n12,0.3\n", "整数でない id が 1 行あります（行: 2）"),
+        ("10,0.1\n11,0.2,9\n12,0.3\n", "CSV として読めません"),
+        ("", "がないか空です"),
+    ],
+)
+def test_invalid_submission(tmp_path, text, message):
+    path = _write(tmp_path / "sub.csv", text)
+    result = validate_submission(path, Expected(np.array([10, 11, 12]), reference="test.csv"), chunksize=2)
+    assert not result.ok
+    assert any(message in error for error in result.errors), result.errors
+
+
+def test_expected_format_prefers_sample_submit(comp):
+    # sample_submit は signate-manifest.json の name から探す. 先頭ゼロの id は文字列のまま比べる
+    _write(comp / "data" / "sample.csv", "id,pred\n010,0\n011,0\n")
+    (comp / "signate-manifest.json").write_text(
+        json.dumps({"files": {"sample.csv": {"name": "sample_submit", "path": "data/sample.csv"}}})
+    )
+    expected = expected_format(comp)
+    assert (expected.n_columns, expected.header, expected.reference) == (2, True, "sample.csv")
+    assert list(expected.ids) == ["010", "011"]
+    assert validate_submission(_write(comp / "s.csv", "id,pred\n011,0.2\n010,0.1\n"), expected).ok
+    result = validate_submission(_write(comp / "s.csv", "id,pred\n11,0.2\n10,0.1\n"), expected)
+    assert "sample.csv にない id が 2 個あります: '11', '10'" in result.errors
+
+
+def test_expected_format_from_test(comp):
+    expected = expected_format(comp)
+    assert (expected.n_columns, expected.header, expected.reference) == (2, False, "test.csv")
+    assert list(expected.ids) == [10, 11, 12]
+
+
+def test_validate_command(comp):
+    runner = CliRunner()
+    _write(comp / "submission.csv", "10,0.1\n11,0.2\n12,0.3\n")
+    result = runner.invoke(main, ["validate", str(comp)])
+    assert result.exit_code == 0, result.output
+    assert "3 rows, test.csv と一致" in result.output
+
+    _write(comp / "submission.csv", "10,0.1\n11,nan\n")
+    result = runner.invoke(main, ["validate", str(comp)])
+    assert result.exit_code == 1
+    assert "Error: 行数が 2 です（期待: 3、test.csv）" in result.output